@@ -0,0 +1 @@
+# Benchmarks for the scanning and fetching hot paths
@@ -0,0 +1,58 @@
+"""Cold and warm conda-meta scan times on a synthetic prefix
+
+Run from the repository root:
+
+    python -m benchmarks.bench_conda_meta [--packages 2000] [--files 200]
+"""
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+from src.utils.conda_meta import CondaMetaScanner
+from .synthetic import make_conda_prefix
+
+def full_parse(env_path):
+    """Reference implementation: json.load every record"""
+    packages = {}
+    for json_file in glob.glob(os.path.join(env_path, "conda-meta", "*.json")):
+        with open(json_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            packages[data["name"]] = {"version": data.get("version", "Unknown")}
+    return packages
+
+def timed(func, *args):
+    """Return (seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=200, help="files per package record")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = make_conda_prefix(os.path.join(tmp, "env"), args.packages, args.files)
+        total = sum(os.path.getsize(path) for path in glob.glob(os.path.join(prefix, "conda-meta", "*.json")))
+        print(f"{args.packages} records, {total / 1e6:.1f} MB of conda-meta")
+
+        baseline, expected = timed(full_parse, prefix)
+        scanner = CondaMetaScanner()
+        cold, headers = timed(scanner.scan, prefix)
+        warm, _ = timed(scanner.scan, prefix)
+
+        # Touch one record to exercise the incremental path
+        os.utime(glob.glob(os.path.join(prefix, "conda-meta", "*.json"))[0])
+        incremental, _ = timed(scanner.scan, prefix)
+
+        assert {h["name"]: h["version"] for h in headers} == {k: v["version"] for k, v in expected.items()}
+        print(f"json.load baseline: {baseline * 1000:8.1f} ms")
+        print(f"scanner cold:       {cold * 1000:8.1f} ms")
+        print(f"scanner warm:       {warm * 1000:8.1f} ms")
+        print(f"scanner 1 changed:  {incremental * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Dependency graph build and query times on a synthetic prefix
+
+Run from the repository root:
+
+    python -m benchmarks.bench_dependency_graph [--packages 1000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from src.utils.package_manager import PackageManager
+from .synthetic import make_conda_prefix
+
+def timed(func, *args):
+    """Return (seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=1000)
+    parser.add_argument("--files", type=int, default=50, help="files per package record")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = make_conda_prefix(os.path.join(tmp, "env"), args.packages, args.files)
+        manager = PackageManager(cache=False)
+        manager.conda_meta_scanner.scan(prefix)
+
+        build, graph = timed(manager.dependency_graph, prefix)
+        cached, _ = timed(manager.dependency_graph, prefix)
+        names = graph.names
+
+        def queries():
+            for name in names:
+                graph.dependents(name)
+                graph.why(name)
+                graph.closure_size(name)
+            graph.orphans()
+        cold, _ = timed(queries)
+        warm, _ = timed(queries)
+
+        print(f"{len(graph)} packages, {len(graph.orphans())} orphans")
+        print(f"graph build:          {build * 1000:8.2f} ms")
+        print(f"unchanged env lookup: {cached * 1000:8.2f} ms")
+        print(f"per package, cold:    {cold / len(names) * 1000:8.3f} ms (dependents, why, closure)")
+        print(f"per package, memo:    {warm / len(names) * 1000:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Longest main-loop stall while showing a huge package description
+
+Compares inserting a description into a tk.Text in one call with the
+chunked insertion PackageInfoDialog uses, and times the details lookup
+after a summary fetch already pulled the same document. The Tk part
+needs a display and is skipped without one.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_description [--kb 500]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tkinter as tk
+from threading import Event
+from src.gui.widgets import DESCRIPTION_CHUNK_SIZE, DESCRIPTION_PREVIEW_SIZE, break_at
+from src.utils.metadata_cache import MetadataCache
+from src.utils.package_manager import PackageManager
+from .fake_index import FakeIndex
+
+def make_description(size):
+    """Return README-like text of about size characters"""
+    paragraph = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+                 "tempor incididunt ut labore et dolore magna aliqua. ") * 6
+    lines = []
+    total = 0
+    while total < size:
+        line = f"## Section {len(lines)}\n\n{paragraph}\n\n    code_example({len(lines)})\n\n"
+        lines.append(line)
+        total += len(line)
+    return "".join(lines)
+
+def tk_stalls(description):
+    """Return (one-shot seconds, longest chunk seconds, first chunk seconds), or None without a display"""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    text = tk.Text(root, wrap=tk.WORD, width=70, height=20)
+    text.pack()
+    root.update()
+
+    start = time.perf_counter()
+    text.insert(tk.END, description)
+    root.update()
+    one_shot = time.perf_counter() - start
+
+    text.delete(1.0, tk.END)
+    root.update()
+    shown = 0
+    end = len(description)
+    chunks = []
+    while shown < end:
+        stop = break_at(description, shown, min(end, shown + DESCRIPTION_CHUNK_SIZE))
+        start = time.perf_counter()
+        text.insert(tk.END, description[shown:stop])
+        root.update()
+        chunks.append(time.perf_counter() - start)
+        shown = stop
+    root.destroy()
+    return one_shot, max(chunks), chunks[0]
+
+def info_latency(manager, name):
+    """Return seconds until load_package_info_async delivers"""
+    done = Event()
+    start = time.perf_counter()
+    manager.load_package_info_async(name, lambda summary, description: done.set())
+    done.wait()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kb", type=int, default=500, help="description size in KB")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per index request")
+    args = parser.parse_args()
+    description = make_description(args.kb * 1024)
+
+    print(f"{len(description):,} character description, {DESCRIPTION_CHUNK_SIZE // 1024} KB chunks, "
+          f"{DESCRIPTION_PREVIEW_SIZE // 1024} KB preview")
+    stalls = tk_stalls(description)
+    if stalls is None:
+        print("Tk insertion:               skipped (no display)")
+    else:
+        one_shot, longest, first = stalls
+        print(f"one insert:                 {one_shot * 1000:8.1f} ms")
+        print(f"longest chunk:              {longest * 1000:8.1f} ms")
+        print(f"first chunk visible:        {first * 1000:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp, FakeIndex({"bigpkg": "1.0"}, args.latency) as index:
+        manager = PackageManager(index_url=index.url, cache=MetadataCache(os.path.join(tmp, "cache.sqlite3")),
+                                 local_summaries=False)
+        cold = info_latency(manager, "bigpkg")
+        warm = info_latency(manager, "bigpkg")
+        manager.shutdown()
+    print(f"details, not fetched yet:   {cold * 1000:8.1f} ms ({args.latency * 1000:.0f} ms index latency)")
+    print(f"details after summary:      {warm * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
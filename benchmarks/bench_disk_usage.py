@@ -0,0 +1,51 @@
+"""Disk usage of hardlinked environments: naive walk versus DiskUsageScanner
+
+Run from the repository root:
+
+    python -m benchmarks.bench_disk_usage [--envs 100] [--packages 50]
+"""
+import argparse
+import os
+import tempfile
+import time
+from src.utils.disk_usage import DiskUsageScanner, format_size
+from .synthetic import make_linked_envs
+
+def walk_usage(prefix):
+    """Reference implementation: du-style walk that counts every link"""
+    total = 0
+    for root, _, files in os.walk(prefix):
+        for name in files:
+            total += os.lstat(os.path.join(root, name)).st_size
+    return total
+
+def timed(func, *args):
+    """Return (seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=100)
+    parser.add_argument("--packages", type=int, default=50)
+    parser.add_argument("--files", type=int, default=20, help="files per package")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prefixes = make_linked_envs(tmp, args.envs, args.packages, args.files)
+
+        walk_time, walk_total = timed(lambda: sum(walk_usage(prefix) for prefix in prefixes))
+        scanner = DiskUsageScanner()
+        cold, _ = timed(lambda: [scanner.scan(prefix) for prefix in prefixes])
+        warm, _ = timed(lambda: [scanner.scan(prefix) for prefix in prefixes])
+        combined = scanner.combined_bytes()
+        scanner.shutdown()
+
+        print(f"{args.envs} environments x {args.packages} packages x {args.files} files")
+        print(f"walk, every link counted: {walk_time * 1000:8.1f} ms  {format_size(walk_total)}")
+        print(f"scanner cold:             {cold * 1000:8.1f} ms  {format_size(combined)} combined")
+        print(f"scanner unchanged:        {warm * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Outdated-package report over a fleet of environments against a local index
+
+Run from the repository root:
+
+    python -m benchmarks.bench_outdated [--envs 100] [--packages 200] [--latency 0.005]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from src.utils.metadata_cache import MetadataCache
+from src.utils.package_manager import PackageManager
+from .fake_index import FakeIndex
+from .synthetic import make_site_packages
+
+def timed(func):
+    """Return (seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=100)
+    parser.add_argument("--packages", type=int, default=200, help="pip packages per environment")
+    parser.add_argument("--pool", type=int, default=1000, help="distinct package names")
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds per index request")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    latest = {f"package-{i}": f"1.{rng.randrange(5, 20)}.0" for i in range(args.pool)}
+    with tempfile.TemporaryDirectory() as tmp:
+        prefixes = []
+        for e in range(args.envs):
+            prefix = os.path.join(tmp, f"env-{e}")
+            make_site_packages(prefix, [(name, f"1.{rng.randrange(0, 20)}.0")
+                                        for name in rng.sample(sorted(latest), args.packages)])
+            prefixes.append(prefix)
+
+        with FakeIndex(latest, args.latency) as index:
+            manager = PackageManager(index_url=index.url, cache=MetadataCache(os.path.join(tmp, "cache.sqlite3")),
+                                     local_summaries=False)
+            cold, report = timed(lambda: manager.outdated(prefixes))
+            warm, _ = timed(lambda: manager.outdated(prefixes))
+            manager.shutdown()
+            served = index.requests
+
+        print(f"{args.envs} environments x {args.packages} packages, {args.pool} distinct names, "
+              f"{args.latency * 1000:.0f} ms index latency")
+        print(f"{len(report)} outdated installations, {served} index requests")
+        print(f"cold (index):   {cold * 1000:8.1f} ms")
+        print(f"warm (cache):   {warm * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Memory of per-environment package dicts versus the shared PackageStore
+
+Run from the repository root:
+
+    python -m benchmarks.bench_package_store [--envs 300] [--packages 400]
+"""
+import argparse
+import random
+import tracemalloc
+from src.utils.package_store import PackageStore
+
+def make_envs(env_count, package_count, seed=0):
+    """Build get_all_packages-style dicts for envs drawing on a shared pool
+
+    Every value is a fresh string, as it would be after parsing each
+    environment's metadata separately.
+    """
+    rng = random.Random(seed)
+    pool = [(f"package-{i}", [f"{i % 7}.{minor}.{rng.randrange(10)}" for minor in range(4)])
+            for i in range(package_count * 3)]
+    envs = {}
+    for e in range(env_count):
+        packages = {}
+        for name, versions in rng.sample(pool, package_count):
+            version = rng.choice(versions)
+            packages["".join(name)] = {
+                "version": "".join(version),
+                "build": "".join(f"py311h{version.replace('.', '')}_0"),
+                "channel": "".join("conda-forge"),
+                "source": "".join("conda"),
+            }
+        envs[f"/opt/conda/envs/env-{e}"] = packages
+    return envs
+
+def measure(build):
+    """Return (result, bytes still allocated) for building a structure"""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=300)
+    parser.add_argument("--packages", type=int, default=400, help="packages per environment")
+    args = parser.parse_args()
+
+    dicts, dict_bytes = measure(lambda: make_envs(args.envs, args.packages))
+
+    def build_store():
+        store = PackageStore()
+        for env_path, packages in make_envs(args.envs, args.packages).items():
+            store.set_env(env_path, packages)
+        return store
+    store, store_bytes = measure(build_store)
+
+    rows = sum(len(packages) for packages in dicts.values())
+    print(f"{args.envs} environments, {rows} package rows, {store.stats()['records']} distinct records")
+    print(f"dict of dicts: {dict_bytes / 1e6:8.1f} MB ({dict_bytes / rows:6.0f} B/row)")
+    print(f"PackageStore:  {store_bytes / 1e6:8.1f} MB ({store_bytes / rows:6.0f} B/row)")
+
+if __name__ == "__main__":
+    main()
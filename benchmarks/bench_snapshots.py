@@ -0,0 +1,75 @@
+"""Snapshot recording and diffing of many environments against their history
+
+Run from the repository root:
+
+    python -m benchmarks.bench_snapshots [--envs 100] [--packages 400]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from src.utils.package_diff import diff_snapshots
+from src.utils.snapshots import Snapshot, SnapshotStore
+
+def make_envs(env_count, package_count, seed=0):
+    """Build get_all_packages-style dicts for synthetic environments"""
+    rng = random.Random(seed)
+    return {f"/opt/conda/envs/env-{e}": {f"package-{i}": {"version": f"1.{rng.randrange(20)}.0", "source": "conda"}
+                                         for i in rng.sample(range(package_count * 2), package_count)}
+            for e in range(env_count)}
+
+def mutate(packages, rng):
+    """Upgrade, downgrade, add and remove a few packages"""
+    names = sorted(packages)
+    for name in rng.sample(names, 5):
+        major, minor, patch = packages[name]["version"].split(".")
+        packages[name] = {"version": f"{major}.{int(minor) + rng.choice((-1, 1))}.{patch}", "source": "conda"}
+    for name in rng.sample(names, 2):
+        del packages[name]
+    packages[f"new-package-{rng.randrange(10 ** 6)}"] = {"version": "0.1", "source": "pip"}
+
+def timed(func):
+    """Return (seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=100)
+    parser.add_argument("--packages", type=int, default=400)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    envs = make_envs(args.envs, args.packages)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshots.sqlite3")
+        store = SnapshotStore(path)
+        first, _ = timed(lambda: [store.record(env, packages, taken_at=0) for env, packages in envs.items()])
+        unchanged, _ = timed(lambda: [store.record(env, packages, taken_at=1) for env, packages in envs.items()])
+        store.close()
+
+        for env in list(envs)[::10]:
+            mutate(envs[env], rng)
+
+        def diff_all(store):
+            changes = 0
+            for env, packages in envs.items():
+                changes += bool(diff_snapshots(store.latest(env), Snapshot.from_packages(env, packages)))
+            return changes
+
+        store = SnapshotStore(path)
+        cold, changes = timed(lambda: diff_all(store))
+        warm, _ = timed(lambda: diff_all(store))
+        store.close()
+
+        print(f"{args.envs} environments x {args.packages} packages, {changes} changed, "
+              f"{os.path.getsize(path) / 1e3:.0f} KB on disk")
+        print(f"first record:            {first * 1000:8.1f} ms")
+        print(f"record, unchanged:       {unchanged * 1000:8.1f} ms")
+        print(f"diff vs latest, cold:    {cold * 1000:8.1f} ms")
+        print(f"diff vs latest, cached:  {warm * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
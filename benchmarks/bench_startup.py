@@ -0,0 +1,106 @@
+"""Startup regression check: GUI import time and time to first paint
+
+Each measurement runs in a fresh interpreter with a temporary cache
+directory holding a synthetic saved session. Exits with status 1 if the
+median of either measurement exceeds the budget. Time to first paint
+needs a display and is skipped without one.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup [--budget-ms 300] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from src.utils.package_store import PackageStore
+from src.utils.session_state import save_session
+from .bench_package_store import make_envs
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import src.gui.main_window
+print(time.perf_counter() - start)
+"""
+
+PAINT_SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+import tkinter as tk
+from src.gui.main_window import CondaEnvViewer
+try:
+    app = CondaEnvViewer(fast_start=True)
+except tk.TclError:
+    print("nodisplay")
+    sys.exit(0)
+
+def painted():
+    print(time.perf_counter() - start)
+    app.on_close()
+
+app.tree.bind("<Expose>", lambda event: app.after_idle(painted), add="+")
+app.mainloop()
+"""
+
+def run_script(script, env):
+    """Run a snippet in a fresh interpreter and return its last output line"""
+    result = subprocess.run([sys.executable, "-c", script], env=env, cwd=os.getcwd(),
+                            capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed")
+    return result.stdout.strip().splitlines()[-1]
+
+def write_session(cache_dir, env_count, package_count):
+    """Save a synthetic session of env_count environments"""
+    store = PackageStore()
+    envs = make_envs(env_count, package_count)
+    for env_path, packages in envs.items():
+        store.set_env(env_path, packages)
+    save_session([(env_path, os.path.basename(env_path)) for env_path in envs], store,
+                 os.path.join(cache_dir, "session_state.json.z"))
+
+def measure(script, env, repeat):
+    """Return the median seconds reported by script, or None if it was skipped"""
+    samples = []
+    for _ in range(repeat):
+        output = run_script(script, env)
+        if output == "nodisplay":
+            return None
+        samples.append(float(output))
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--envs", type=int, default=100, help="environments in the saved session")
+    parser.add_argument("--packages", type=int, default=400)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        write_session(cache_dir, args.envs, args.packages)
+        env = dict(os.environ, CONDA_ENV_DETECTOR_CACHE_DIR=cache_dir,
+                   PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+
+        failed = False
+        import_time = measure(IMPORT_SCRIPT, env, args.repeat)
+        print(f"import src.gui.main_window: {import_time * 1000:8.1f} ms")
+        failed |= import_time * 1000 > args.budget_ms
+
+        paint_time = measure(PAINT_SCRIPT, env, args.repeat)
+        if paint_time is None:
+            print("time to first paint:        skipped (no display)")
+        else:
+            print(f"time to first paint:        {paint_time * 1000:8.1f} ms "
+                  f"({args.envs} saved environments)")
+            failed |= paint_time * 1000 > args.budget_ms
+
+    print(f"budget {args.budget_ms:.0f} ms: {'FAILED' if failed else 'ok'}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
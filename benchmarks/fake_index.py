@@ -0,0 +1,123 @@
+"""Local stand-in for the PyPI JSON API"""
+import json
+import math
+import multiprocessing
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+
+def _serve(versions, latency, rate_limit, description_size, ready):
+    """Run the index server in a child process, reporting its port through ready"""
+    stats = {"requests": 0, "throttled": 0}
+    lock = Lock()
+    tokens = float(rate_limit or 0)
+    refilled = time.monotonic()
+
+    def take_token():
+        """Return 0 if a request may proceed, else the seconds until one may"""
+        nonlocal tokens, refilled
+        with lock:
+            now = time.monotonic()
+            tokens = min(float(rate_limit), tokens + (now - refilled) * rate_limit)
+            refilled = now
+            if tokens >= 1:
+                tokens -= 1
+                return 0
+            return (1 - tokens) / rate_limit
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, as a real index allows
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            parts = self.path.strip("/").split("/")
+            if parts == ["_stats"]:
+                with lock:
+                    self._send(200, dict(stats))
+                return
+            wait = take_token() if rate_limit else 0
+            with lock:
+                stats["throttled" if wait else "requests"] += 1
+            if wait:
+                # Retry-After takes whole seconds
+                self._send(429, None, {"Retry-After": str(math.ceil(wait))})
+                return
+            if latency:
+                time.sleep(latency)
+            version = versions.get(parts[1]) if len(parts) == 3 else None
+            if version is None:
+                self._send(404, None)
+            else:
+                description = f"Description of {parts[1]}\n"
+                description += "x" * max(description_size - len(description), 0)
+                self._send(200, {"info": {"name": parts[1], "version": version,
+                                          "summary": f"Summary of {parts[1]}",
+                                          "description": description}})
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode() if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    ready.send(server.server_port)
+    server.serve_forever()
+
+class FakeIndex:
+    """Serves /pypi/<name>/json for a fixed set of packages from a child process
+
+    Running in its own process keeps the server from competing with the
+    client for the GIL. Use as a context manager; url is the index_url to
+    pass to PackageManager.
+    """
+
+    def __init__(self, versions, latency=0.0, rate_limit=None, description_size=0):
+        """Create the server (started by __enter__)
+
+        Args:
+            versions (dict): Normalized package name -> latest version
+            latency (float): Seconds to sleep before answering each request
+            rate_limit (float): Requests per second allowed (with bursts of
+                the same size) before answering 429 with Retry-After; None
+                for no limit
+            description_size (int): Length of each served description
+        """
+        self.versions = versions
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.description_size = description_size
+        self.url = None
+        self._process = None
+
+    def __enter__(self):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.versions, self.latency, self.rate_limit, self.description_size, sender),
+            daemon=True)
+        self._process.start()
+        self.url = f"http://127.0.0.1:{receiver.recv()}/pypi"
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join()
+
+    def stats(self):
+        """Return {"requests": answered, "throttled": refused with 429} so far"""
+        with urllib.request.urlopen(self.url.rsplit("/", 1)[0] + "/_stats") as response:
+            return json.load(response)
+
+    @property
+    def requests(self):
+        """Number of package requests answered so far"""
+        return self.stats()["requests"]
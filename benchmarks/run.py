@@ -0,0 +1,254 @@
+"""Benchmark suite over a synthetic conda installation and a local fake index
+
+Times environment discovery, package scanning, summary fill-in and
+Treeview population, and writes the results as JSON so runs can be
+compared over time. Treeview population needs a display and is skipped
+without one.
+
+Run from the repository root:
+
+    python -m benchmarks.run [--envs 20] [--packages 300] [--pip 50] [--files 50]
+                             [--latency 0.02] [--rate-limit 0] [--repeat 3]
+                             [-o results.json] [--compare baseline.json]
+
+Exits with status 1 if --compare finds a median slower than the baseline
+by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from threading import Event, Lock
+from src.utils.conda_manager import CondaManager
+from src.utils.metadata_cache import MetadataCache
+from src.utils.package_manager import PackageManager
+from .fake_index import FakeIndex
+from .synthetic import make_installation
+
+RESULTS_VERSION = 1
+
+@contextmanager
+def patched_environ(changes):
+    """Apply environment variable changes (None unsets) for the duration of a block"""
+    saved = {name: os.environ.get(name) for name in changes}
+    try:
+        for name, value in changes.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def timed(func):
+    """Return (seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def summarize(samples, **extra):
+    """Build a result entry from samples in seconds"""
+    entry = {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "samples_ms": [round(sample * 1000, 3) for sample in samples],
+    }
+    entry.update(extra)
+    return entry
+
+def bench_discovery(installation, repeat):
+    """Time CondaManager.get_environments with conda's files only"""
+    samples = []
+    for _ in range(repeat):
+        seconds, envs_data = timed(lambda: CondaManager(use_cli=False).get_environments())
+        samples.append(seconds)
+    found = len(envs_data["envs"]) + (1 if envs_data["base_prefix"] else 0)
+    assert found == len(installation["envs"]) + 1, f"discovered {found} environments"
+    return {"get_environments": summarize(samples, environments=found)}
+
+def bench_scanning(env_paths, repeat):
+    """Time PackageManager.get_all_packages over every environment, cold and warm"""
+    cold, warm = [], []
+    for _ in range(repeat):
+        manager = PackageManager(cache=False)
+        seconds, rows = timed(lambda: sum(len(manager.get_all_packages(path)) for path in env_paths))
+        cold.append(seconds)
+        warm.append(timed(lambda: [manager.get_all_packages(path) for path in env_paths])[0])
+    return {
+        "get_all_packages.cold": summarize(cold, environments=len(env_paths), packages=rows),
+        "get_all_packages.warm": summarize(warm, environments=len(env_paths), packages=rows),
+    }
+
+def fill_summaries(manager, pkg_names):
+    """Fetch summaries the way an opened environment does and wait for all of them"""
+    finished = Event()
+    lock = Lock()
+    remaining = len(pkg_names)
+
+    def callback(item_id, summary, failed):
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            if not remaining:
+                finished.set()
+
+    for pkg_name in pkg_names:
+        manager.load_package_summary_async(pkg_name, pkg_name, callback, group="bench")
+    finished.wait()
+
+def bench_summaries(env_path, tmp, args):
+    """Time summary fill-in for one environment against the fake index, cold and warm"""
+    pkg_names = sorted(PackageManager(cache=False, local_summaries=False).get_all_packages(env_path))
+    versions = {name: "1.0.0" for name in pkg_names}
+    cold, warm = [], []
+    with FakeIndex(versions, args.latency, args.rate_limit or None, args.description_kb * 1024) as index:
+        for sample in range(args.repeat):
+            cache = MetadataCache(os.path.join(tmp, f"summaries-{sample}.sqlite3"))
+            manager = PackageManager(index_url=index.url, cache=cache, local_summaries=False)
+            cold.append(timed(lambda: fill_summaries(manager, pkg_names))[0])
+            # A new manager, as after a restart: answered by the on-disk cache
+            manager.shutdown()
+            manager = PackageManager(index_url=index.url, cache=cache, local_summaries=False)
+            warm.append(timed(lambda: fill_summaries(manager, pkg_names))[0])
+            manager.shutdown()
+            cache.close()
+        stats = index.stats()
+    return {
+        "summaries.cold": summarize(cold, packages=len(pkg_names), index_requests_total=stats["requests"],
+                                    throttled_total=stats["throttled"]),
+        "summaries.warm": summarize(warm, packages=len(pkg_names)),
+    }
+
+def bench_treeview(env_paths, repeat):
+    """Time VirtualRows populating and paging a Treeview, or return {} without a display"""
+    import tkinter as tk
+    from tkinter import ttk
+    from src.gui.virtual_rows import VirtualRows
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return {}
+    manager = PackageManager(cache=False, local_summaries=False)
+    envs = [manager.load_env(path) for path in env_paths]
+    show, page = [], []
+    for _ in range(repeat):
+        tree = ttk.Treeview(root, columns=("Version", "Latest", "Size", "Unique", "Summary"))
+        tree.pack()
+        rows = []
+        start = time.perf_counter()
+        for env_path, packages in zip(env_paths, envs):
+            tree.insert("", "end", iid=env_path, text=env_path, open=True)
+            rows.append(VirtualRows(tree, env_path, packages))
+            rows[-1].show(0)
+        root.update_idletasks()
+        show.append(time.perf_counter() - start)
+        page.append(timed(lambda: ([r.page_forward() for r in rows], root.update_idletasks()))[0])
+        tree.destroy()
+    root.destroy()
+    return {
+        "treeview.show": summarize(show, environments=len(env_paths)),
+        "treeview.page": summarize(page, environments=len(env_paths)),
+    }
+
+def git_commit():
+    """Return the checked-out commit, or None outside a git work tree"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, threshold):
+    """Print the change of every median against a baseline run
+
+    Returns:
+        list: Names of benchmarks slower than the baseline by more than threshold
+    """
+    regressions = []
+    for name, entry in results["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old or not old["median_ms"]:
+            continue
+        change = entry["median_ms"] / old["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:24} {old['median_ms']:10.1f} -> {entry['median_ms']:10.1f} ms {change:+7.1%}{flag}",
+              file=sys.stderr)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=20, help="named environments besides base")
+    parser.add_argument("--packages", type=int, default=300, help="conda packages per environment")
+    parser.add_argument("--pip", type=int, default=50, help="pip packages per environment")
+    parser.add_argument("--files", type=int, default=50,
+                        help="files per conda-meta record (about 300 bytes each)")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per index request")
+    parser.add_argument("--rate-limit", type=float, default=0, help="index requests per second, 0 for none")
+    parser.add_argument("--description-kb", type=int, default=4, help="size of served descriptions")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown counted as a regression (default 0.2)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        installation = make_installation(os.path.join(tmp, "conda"), args.envs, args.packages,
+                                         args.files, args.pip)
+        env_paths = [installation["base_prefix"]] + installation["envs"]
+        results = {}
+        with patched_environ(installation["environ"]):
+            results.update(bench_discovery(installation, args.repeat))
+            results.update(bench_scanning(env_paths, args.repeat))
+            results.update(bench_summaries(installation["envs"][0] if installation["envs"] else env_paths[0],
+                                           tmp, args))
+            treeview = bench_treeview(env_paths, args.repeat)
+            if not treeview:
+                print("treeview: skipped (no display)", file=sys.stderr)
+            results.update(treeview)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {name: value for name, value in vars(args).items()
+                       if name not in ("output", "compare", "threshold")},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for name, entry in results.items():
+        print(f"{name:24} {entry['median_ms']:10.1f} ms", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        workload = {name: value for name, value in report["parameters"].items() if name != "repeat"}
+        if {name: value for name, value in baseline.get("parameters", {}).items() if name != "repeat"} != workload:
+            print("warning: baseline was run with different parameters", file=sys.stderr)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
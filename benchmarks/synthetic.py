@@ -0,0 +1,189 @@
+import json
+import os
+import random
+
+def make_conda_meta_record(name, version, build, files_per_package=200, depends=None):
+    """Build a conda-meta record shaped like the ones conda writes
+
+    Args:
+        name (str): Package name
+        version (str): Package version
+        build (str): Build string
+        files_per_package (int): Length of the "files" / "paths_data" lists
+        depends (list): Match specs for "depends", defaults to python and libgcc-ng
+
+    Returns:
+        dict: The record
+    """
+    files = [f"lib/python3.11/site-packages/{name}/module_{i}.py" for i in range(files_per_package)]
+    return {
+        "build": build,
+        "build_number": 0,
+        "channel": "https://conda.anaconda.org/conda-forge/linux-64",
+        "constrains": [],
+        "depends": depends if depends is not None else ["python >=3.11,<3.12.0a0", "libgcc-ng >=12"],
+        "files": files,
+        "fn": f"{name}-{version}-{build}.conda",
+        "license": "BSD-3-Clause",
+        "link": {"source": f"/opt/conda/pkgs/{name}-{version}-{build}", "type": 1},
+        "md5": "0" * 32,
+        "name": name,
+        "paths_data": {
+            "paths": [
+                {"_path": path, "path_type": "hardlink", "sha256": "0" * 64, "size_in_bytes": 1024}
+                for path in files
+            ],
+            "paths_version": 1,
+        },
+        "requested_spec": "",
+        "sha256": "0" * 64,
+        "size": 1024 * files_per_package,
+        "subdir": "linux-64",
+        "timestamp": 1700000000000,
+        "url": f"https://conda.anaconda.org/conda-forge/linux-64/{name}-{version}-{build}.conda",
+        "version": version,
+    }
+
+def make_conda_prefix(prefix, package_count, files_per_package=200, seed=0):
+    """Create a synthetic conda environment containing only conda-meta records
+
+    Each package depends on up to four lower-numbered packages, and the
+    last tenth of them are recorded as requested in conda-meta/history.
+
+    Args:
+        prefix (str): Directory to create the environment in
+        package_count (int): Number of package records to write
+        files_per_package (int): Length of each record's file lists
+        seed (int): Seed for the dependency edges
+
+    Returns:
+        str: The prefix
+    """
+    rng = random.Random(seed)
+    meta_dir = os.path.join(prefix, "conda-meta")
+    os.makedirs(meta_dir, exist_ok=True)
+    requested = [f"package-{i}" for i in range(package_count - package_count // 10, package_count)]
+    with open(os.path.join(meta_dir, "history"), "w", encoding="utf-8") as f:
+        f.write("==> 2024-01-01 00:00:00 <==\n")
+        f.write(f"# update specs: {requested!r}\n")
+    for i in range(package_count):
+        name, version, build = f"package-{i}", f"1.{i % 50}.0", "py311_0"
+        depends = [f"package-{j} >=1.0" for j in sorted(rng.sample(range(i), min(i, rng.randint(0, 4))))]
+        record = make_conda_meta_record(name, version, build, files_per_package, depends + ["__glibc >=2.17"])
+        with open(os.path.join(meta_dir, f"{name}-{version}-{build}.json"), "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, sort_keys=True)
+    return prefix
+
+def make_linked_envs(root, env_count, package_count, files_per_package=20, file_size=4096):
+    """Create a pkgs cache and environments that hardlink their files from it
+
+    Every environment installs the same packages, as conda does when
+    several environments share one package cache.
+
+    Args:
+        root (str): Directory to create pkgs/ and envs/ in
+        env_count (int): Number of environments
+        package_count (int): Packages per environment
+        files_per_package (int): Files installed by each package
+        file_size (int): Size of each file in bytes
+
+    Returns:
+        list: The environment prefixes
+    """
+    payload = b"\0" * file_size
+    packages = []
+    for i in range(package_count):
+        name, version, build = f"package-{i}", "1.0.0", "py311_0"
+        extracted = os.path.join(root, "pkgs", f"{name}-{version}-{build}")
+        files = [f"lib/{name}/file_{j}.bin" for j in range(files_per_package)]
+        for path in files:
+            os.makedirs(os.path.dirname(os.path.join(extracted, path)), exist_ok=True)
+            with open(os.path.join(extracted, path), "wb") as f:
+                f.write(payload)
+        record = make_conda_meta_record(name, version, build, 0)
+        record["files"] = files
+        packages.append((f"{name}-{version}-{build}.json", extracted, record))
+
+    prefixes = []
+    for e in range(env_count):
+        prefix = os.path.join(root, "envs", f"env-{e}")
+        os.makedirs(os.path.join(prefix, "conda-meta"))
+        for filename, extracted, record in packages:
+            for path in record["files"]:
+                target = os.path.join(prefix, path)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.link(os.path.join(extracted, path), target)
+            with open(os.path.join(prefix, "conda-meta", filename), "w", encoding="utf-8") as f:
+                json.dump(record, f)
+        prefixes.append(prefix)
+    return prefixes
+
+def make_site_packages(prefix, distributions, python="python3.11"):
+    """Create dist-info metadata for pip-installed distributions
+
+    Args:
+        prefix (str): Environment prefix
+        distributions: (name, version) pairs
+        python (str): Name of the lib/<python> directory
+
+    Returns:
+        str: The site-packages directory
+    """
+    site_dir = os.path.join(prefix, "lib", python, "site-packages")
+    for name, version in distributions:
+        dist_info = os.path.join(site_dir, f"{name.replace('-', '_')}-{version}.dist-info")
+        os.makedirs(dist_info, exist_ok=True)
+        with open(os.path.join(dist_info, "METADATA"), "w", encoding="utf-8") as f:
+            f.write(f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+                    f"Summary: Synthetic distribution {name}\n\nLong description of {name}.\n")
+    return site_dir
+
+def make_installation(root, env_count, package_count, files_per_package=50, pip_count=0, seed=0):
+    """Create a conda installation: a base prefix plus named environments
+
+    Each environment gets package_count conda-meta records (see
+    make_conda_prefix) and pip_count dist-info distributions, and is listed
+    in a private environments.txt. Discovery can be pointed at the
+    installation by applying the returned environment variables.
+
+    Args:
+        root (str): Directory to create the installation in
+        env_count (int): Number of named environments besides base
+        package_count (int): Conda packages per environment
+        files_per_package (int): Length of each conda-meta record's file
+            lists, which sets the record size (about 300 bytes per file)
+        pip_count (int): Pip distributions per environment
+        seed (int): Seed for dependencies and versions
+
+    Returns:
+        dict: "base_prefix", "envs" (prefixes, base excluded) and "environ"
+        (variables for CondaManager.get_environments and PackageManager)
+    """
+    rng = random.Random(seed)
+    home = os.path.join(root, "home")
+    base_prefix = make_conda_prefix(os.path.join(root, "base"), package_count, files_per_package, seed)
+    os.makedirs(os.path.join(base_prefix, "condabin"))
+    os.makedirs(os.path.join(base_prefix, "pkgs"))
+    envs = []
+    for e in range(env_count):
+        prefix = make_conda_prefix(os.path.join(base_prefix, "envs", f"env-{e}"), package_count,
+                                   files_per_package, seed + e + 1)
+        if pip_count:
+            make_site_packages(prefix, [(f"pip-package-{i}", f"{rng.randrange(3)}.{rng.randrange(20)}.0")
+                                        for i in rng.sample(range(pip_count * 4), pip_count)])
+        envs.append(prefix)
+    os.makedirs(os.path.join(home, ".conda"))
+    with open(os.path.join(home, ".conda", "environments.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join([base_prefix] + envs) + "\n")
+    environ = {
+        "HOME": home,
+        "USERPROFILE": home,
+        "XDG_CONFIG_HOME": os.path.join(home, ".config"),
+        "CONDA_EXE": os.path.join(base_prefix, "condabin", "conda"),
+        "CONDA_ROOT": None,
+        "CONDA_PREFIX": None,
+        "CONDARC": None,
+        "CONDA_ENVS_PATH": None,
+        "CONDA_PKGS_DIRS": None,
+    }
+    return {"base_prefix": base_prefix, "envs": envs, "environ": environ}
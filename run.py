@@ -1,9 +1,20 @@
+import os
 from src.gui.main_window import CondaEnvViewer
+from src.utils.tracing import TRACE_ENV, configure_logging, tracer
 
 def main():
     """Main entry point of the application"""
+    configure_logging()
+    trace_path = os.environ.get(TRACE_ENV)
+    if trace_path:
+        tracer.enable()
     app = CondaEnvViewer()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        if trace_path:
+            tracer.disable()
+            tracer.export_chrome_trace(trace_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
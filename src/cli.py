@@ -0,0 +1,208 @@
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from .utils.conda_manager import CondaManager
+from .utils.outdated import OUTDATED_FIELDS, report_outdated
+from .utils.package_manager import PackageManager
+from .utils.records import RecordWriter
+from .utils.tracing import configure_logging, tracer
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("env", "env_path", "name", "version", "source")
+
+_worker_package_manager = None
+
+def _scan_env(env_path):
+    """Scan one environment in a worker process
+
+    Args:
+        env_path (str): Path to Conda environment
+
+    Returns:
+        tuple: (env_path, list of (name, version, source, local summary) tuples)
+    """
+    global _worker_package_manager
+    if _worker_package_manager is None:
+        _worker_package_manager = PackageManager(cache=False)
+    packages = _worker_package_manager.get_all_packages(env_path)
+    return env_path, [(name, info["version"], info.get("source", ""), info.get("summary"))
+                      for name, info in packages.items()]
+
+def select_environments(conda_manager, selected=None):
+    """List environments to scan as (name, path) pairs
+
+    Args:
+        conda_manager (CondaManager): Manager used for discovery
+        selected (list): Environment names or paths to keep, or None for all
+
+    Returns:
+        list: (name, path) tuples
+    """
+    envs_data = conda_manager.get_environments()
+    envs = []
+    if envs_data.get("base_prefix"):
+        envs.append(("base", envs_data["base_prefix"]))
+    for env_path in envs_data.get("envs", []):
+        if env_path != envs_data.get("base_prefix"):
+            envs.append((conda_manager.get_env_name(env_path), env_path))
+    if selected:
+        wanted = set(selected)
+        wanted_paths = {os.path.normcase(os.path.abspath(value)) for value in selected}
+        envs = [(name, path) for name, path in envs
+                if name in wanted or os.path.normcase(os.path.abspath(path)) in wanted_paths]
+    return envs
+
+class SummaryResolver:
+    """Resolves PyPI summaries for the CLI, memoized across environments"""
+
+    def __init__(self, package_manager):
+        """Create the resolver
+
+        Args:
+            package_manager (PackageManager): Manager used to fetch summaries;
+                shut down by close()
+        """
+        self.package_manager = package_manager
+        self._summaries = {}
+
+    def resolve(self, names):
+        """Return a mapping of name to summary ("" if unavailable), fetching unknown ones concurrently"""
+        missing = [name for name in dict.fromkeys(names) if name not in self._summaries]
+        if missing:
+            for name, summary in self.package_manager.fetch_summaries(missing).items():
+                self._summaries[name] = summary or ""
+        return {name: self._summaries[name] for name in names}
+
+    def close(self):
+        """Cancel pending fetches and close the package manager's connections"""
+        self.package_manager.shutdown()
+
+def scan(envs, writer, processes=None, summaries=None):
+    """Scan environments in a process pool, writing records as each finishes
+
+    At most two environments per worker are in flight at any time, so memory
+    use does not depend on how many environments there are.
+
+    Args:
+        envs (list): (name, path) tuples from select_environments
+        writer (RecordWriter): Destination for records
+        processes (int): Number of worker processes, None for the CPU count
+        summaries (SummaryResolver): Adds a summary field to every record if given
+
+    Returns:
+        int: Number of records written
+    """
+    names = {path: name for name, path in envs}
+    count = 0
+
+    def emit(env_path, packages):
+        nonlocal count
+        summary_map = None
+        if summaries:
+            # Only packages without a locally installed summary go to PyPI
+            summary_map = summaries.resolve([pkg[0] for pkg in packages if not pkg[3]])
+        for pkg_name, version, source, local_summary in packages:
+            record = (names[env_path], env_path, pkg_name, version, source)
+            if summary_map is not None:
+                record += (local_summary or summary_map[pkg_name],)
+            writer.write(record)
+            count += 1
+        writer.flush()
+
+    if processes == 1:
+        for _, env_path in envs:
+            emit(*_scan_env(env_path))
+        return count
+
+    processes = processes or os.cpu_count() or 1
+    window = processes * 2
+    pending = iter(path for _, path in envs)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        in_flight = set()
+        futures = {}
+        while True:
+            for env_path in pending:
+                future = executor.submit(_scan_env, env_path)
+                futures[future] = env_path
+                in_flight.add(future)
+                if len(in_flight) >= window:
+                    break
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                env_path = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning("Failed to scan environment: %s", e, extra={"env_path": env_path})
+                    continue
+                emit(*result)
+    return count
+
+def main(argv=None):
+    """Command-line entry point for headless environment inventories"""
+    parser = argparse.ArgumentParser(prog="python -m src",
+                                     description="List packages of all Conda environments without a GUI")
+    parser.add_argument("-e", "--env", action="append", dest="envs", metavar="NAME_OR_PATH",
+                        help="environment to scan (repeatable); default: all")
+    parser.add_argument("-f", "--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--summaries", action="store_true",
+                        help="include package summaries (from installed metadata, else PyPI)")
+    parser.add_argument("--outdated", action="store_true",
+                        help="only list packages behind their latest release on PyPI")
+    parser.add_argument("--use-conda-cli", action="store_true",
+                        help="discover environments with `conda env list`")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a Chrome trace of this process (not of scan workers) to FILE")
+    args = parser.parse_args(argv)
+    if args.summaries and args.outdated:
+        parser.error("--summaries cannot be combined with --outdated")
+    configure_logging()
+    if args.trace:
+        tracer.enable()
+
+    try:
+        envs = select_environments(CondaManager(use_cli=args.use_conda_cli or None), args.envs)
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    if not envs:
+        print("No matching Conda environments found", file=sys.stderr)
+        return 1
+
+    stream = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    resolver = None
+    try:
+        if args.outdated:
+            package_manager = PackageManager()
+            try:
+                report = package_manager.outdated([path for _, path in envs])
+            finally:
+                package_manager.shutdown()
+            report_outdated(report, {path: name for name, path in envs},
+                            RecordWriter(stream, args.format, ("env",) + OUTDATED_FIELDS))
+        else:
+            fields = FIELDS + (("summary",) if args.summaries else ())
+            resolver = SummaryResolver(PackageManager()) if args.summaries else None
+            scan(envs, RecordWriter(stream, args.format, fields), args.processes, resolver)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); point stdout at devnull so the
+        # interpreter's final flush does not fail again
+        if stream is sys.stdout:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if resolver is not None:
+            resolver.close()
+        if stream is not sys.stdout:
+            stream.close()
+        if args.trace:
+            tracer.disable()
+            tracer.export_chrome_trace(args.trace)
+    return 0
@@ -1,14 +1,41 @@
+import logging
+import os
+import time
 import tkinter as tk
-from tkinter import ttk, font as tkfont
+from threading import Thread
+from tkinter import filedialog, ttk, font as tkfont
 from ..utils.conda_manager import CondaManager
+from ..utils.disk_usage import DiskUsageScanner, format_size
+from ..utils.env_watcher import EnvWatcher
+from ..utils.outdated import OUTDATED_FIELDS, OutdatedPackage, report_outdated
+from ..utils.package_index import PackageIndex
+from ..utils.package_diff import diff_records, diff_snapshots
 from ..utils.package_manager import PackageManager
+from ..utils.records import RecordWriter
+from ..utils.session_state import load_session, save_session
+from ..utils.site_packages import env_signature
+from ..utils.snapshots import SnapshotStore
+from ..utils.tracing import tracer
+from ..utils.versions import is_older
 from .styles import setup_styles
-from .widgets import ErrorDialog, PackageInfoDialog
+from .update_pump import UpdatePump
+from .virtual_rows import VirtualRows
+from .widgets import DiffDialog, ErrorDialog, PackageInfoDialog
+
+logger = logging.getLogger(__name__)
 
 class CondaEnvViewer(tk.Tk):
     """Main window class for Conda Environment Detector"""
     
-    def __init__(self):
+    def __init__(self, fast_start=None):
+        """Create the main window
+
+        Args:
+            fast_start (bool): Show the environments and package tables saved
+                by the last session at once and reconcile them with a live
+                scan in the background. Defaults to on unless the
+                CONDA_ENV_DETECTOR_FAST_START environment variable is "0".
+        """
         super().__init__()  # Initialize parent class
         self.title("Conda Environment Detector")
         self.geometry("800x600")
@@ -16,7 +43,15 @@ class CondaEnvViewer(tk.Tk):
 
         # Initialize managers
         self.conda_manager = CondaManager()
-        self.package_manager = PackageManager()
+        self.package_index = PackageIndex()
+        try:
+            self.snapshot_store = SnapshotStore()
+        except Exception as e:
+            logger.warning("Failed to open snapshot store: %s", e)
+            self.snapshot_store = None
+        self.package_manager = PackageManager(package_index=self.package_index,
+                                              snapshot_store=self.snapshot_store)
+        self.disk_usage = DiskUsageScanner()
         
         # Set custom styles
         setup_styles(self)
@@ -27,10 +62,34 @@ class CondaEnvViewer(tk.Tk):
         # Create UI components
         self._create_main_frame()
         self._create_title_bar()
+        self._create_status_bar()
         self._create_content_area()
         
+        # Worker threads hand their results to the main thread through the pump
+        self.update_pump = UpdatePump(self)
+        self._env_rows = {}
+        self._env_names = {}
+        self._outdated_by_env = None
+        self._search_job = None
+
+        # Keep loaded environments current after installs and removals
+        self.env_watcher = EnvWatcher(self._on_env_changed, self._on_envs_changed)
+        self.env_watcher.start()
+
+        # Cancel pending fetches when the window is closed
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._prioritize_job = None
+        self._status_job = self.after(1000, self._update_status)
+
         # Load environment list
-        self.load_environments()
+        if fast_start is None:
+            fast_start = os.environ.get("CONDA_ENV_DETECTOR_FAST_START", "") != "0"
+        self._restored_session = False
+        if fast_start:
+            self._restored_session = self._restore_session()
+            Thread(target=self._reconcile_environments, daemon=True).start()
+        else:
+            self.load_environments()
 
     def _create_main_frame(self):
         """Create main frame with rounded corners and shadow effect"""
@@ -46,23 +105,49 @@ class CondaEnvViewer(tk.Tk):
                             bg="#4a86e8", fg="white")
         title_label.pack(pady=8)
 
+    def _create_status_bar(self):
+        """Create the status bar showing live fetch and UI statistics"""
+        status_frame = tk.Frame(self.main_frame, height=25, bg="#e7e7e7")
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_label = tk.Label(status_frame, text="", anchor=tk.W, bg="#e7e7e7", fg="#666666",
+                                     font=("Microsoft YaHei UI", 9))
+        self.status_label.pack(side=tk.LEFT, padx=10, pady=3)
+        self.trace_button = tk.Button(status_frame, command=self.toggle_trace,
+                                      text="Save trace..." if tracer.enabled else "Record trace",
+                                      bg="#e7e7e7", fg="#4a86e8", font=("Microsoft YaHei UI", 9),
+                                      relief=tk.FLAT, bd=0, cursor="hand2")
+        self.trace_button.pack(side=tk.RIGHT, padx=10)
+
     def _create_content_area(self):
-        """Create content area with tree view"""
+        """Create content area with search bar and tree view"""
         content_frame = tk.Frame(self.main_frame, bg="#ffffff")
         content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
+        self._create_search_bar(content_frame)
+
+        self.tree_frame = tk.Frame(content_frame, bg="#ffffff")
+        self.tree_frame.pack(fill=tk.BOTH, expand=True)
+        self._create_results_view(content_frame)
+
         # Create tree view widget
-        self.tree = ttk.Treeview(content_frame, columns=("Version", "Summary"), style="Custom.Treeview")
+        self.tree = ttk.Treeview(self.tree_frame, columns=("Version", "Latest", "Size", "Unique", "Summary"),
+                                 style="Custom.Treeview")
         self.tree.heading("#0", text="Environment/Package")
         self.tree.heading("Version", text="Version")
+        self.tree.heading("Latest", text="Latest")
+        self.tree.heading("Size", text="Size")
+        self.tree.heading("Unique", text="Unique")
         self.tree.heading("Summary", text="Summary")
         self.tree.column("#0", width=200)
         self.tree.column("Version", width=100)
+        self.tree.column("Latest", width=90)
+        self.tree.column("Size", width=80, anchor=tk.E)
+        self.tree.column("Unique", width=80, anchor=tk.E)
         self.tree.column("Summary", width=400)
 
         # Add scrollbar
-        scrollbar = ttk.Scrollbar(content_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=lambda first, last: self._on_tree_scrolled(scrollbar, first, last))
 
         # Layout
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -70,9 +155,63 @@ class CondaEnvViewer(tk.Tk):
 
         # Add click event binding
         self.tree.bind("<Button-1>", self.on_item_clicked)
+        self.tree.bind("<Button-3>", self.on_item_right_clicked)
 
         # Set different fonts for different types of nodes
         self.tree.tag_configure("env", font=self.tree_env_font)
+        self.tree.tag_configure("marker", foreground="#888888")
+        self.tree.tag_configure("outdated", foreground="#c0392b")
+
+    def _create_search_bar(self, parent):
+        """Create the package search bar above the tree"""
+        search_frame = tk.Frame(parent, bg="#ffffff")
+        search_frame.pack(fill=tk.X, pady=(0, 8))
+        tk.Label(search_frame, text="Search:", bg="#ffffff", fg="#333333",
+                 font=("Microsoft YaHei UI", 10)).pack(side=tk.LEFT)
+
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self._schedule_search())
+        search_entry = tk.Entry(search_frame, textvariable=self.search_var, bd=1, relief=tk.SOLID,
+                                font=("Microsoft YaHei UI", 10))
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(8, 8))
+        search_entry.bind("<Escape>", lambda event: self.search_var.set(""))
+
+        self.export_button = tk.Button(search_frame, text="Export...", command=self.export_outdated,
+                                       state=tk.DISABLED, bg="#ffffff", fg="#333333",
+                                       font=("Microsoft YaHei UI", 9), relief=tk.FLAT)
+        self.export_button.pack(side=tk.RIGHT, padx=(4, 0))
+        self.check_button = tk.Button(search_frame, text="Check updates", command=self.check_updates,
+                                      bg="#4a86e8", fg="white", font=("Microsoft YaHei UI", 9),
+                                      relief=tk.FLAT, activebackground="#3a76d8", activeforeground="white")
+        self.check_button.pack(side=tk.RIGHT, padx=(8, 0))
+        self.usage_button = tk.Button(search_frame, text="Disk usage", command=self.measure_disk_usage,
+                                      bg="#ffffff", fg="#333333", font=("Microsoft YaHei UI", 9),
+                                      relief=tk.FLAT)
+        self.usage_button.pack(side=tk.RIGHT, padx=(8, 0))
+
+        self.search_status = tk.Label(search_frame, text="e.g. numpy<1.24", bg="#ffffff",
+                                      fg="#888888", font=("Microsoft YaHei UI", 9))
+        self.search_status.pack(side=tk.RIGHT)
+
+    def _create_results_view(self, parent):
+        """Create the search results list, shown in place of the tree while searching"""
+        self.results_frame = tk.Frame(parent, bg="#ffffff")
+        self.results = ttk.Treeview(self.results_frame, columns=("Environment", "Version", "Source"),
+                                    style="Custom.Treeview")
+        self.results.heading("#0", text="Package")
+        self.results.heading("Environment", text="Environment")
+        self.results.heading("Version", text="Version")
+        self.results.heading("Source", text="Source")
+        self.results.column("#0", width=200)
+        self.results.column("Environment", width=250)
+        self.results.column("Version", width=100)
+        self.results.column("Source", width=80)
+
+        scrollbar = ttk.Scrollbar(self.results_frame, orient="vertical", command=self.results.yview)
+        self.results.configure(yscrollcommand=scrollbar.set)
+        self.results.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.results.bind("<Double-1>", self.on_result_activated)
 
     def load_environments(self):
         """Load all Conda environments"""
@@ -84,69 +223,575 @@ class CondaEnvViewer(tk.Tk):
                 self._add_environment_to_tree("base", envs_data["base_prefix"])
                 
             for env_path in envs_data.get("envs", []):
+                if env_path == envs_data.get("base_prefix"):
+                    continue  # Already added as "base"
                 env_name = self.conda_manager.get_env_name(env_path)
                 self._add_environment_to_tree(env_name, env_path)
 
-            if not envs_data.get("envs") and "base_prefix" not in envs_data:
+            if not envs_data.get("envs") and not envs_data.get("base_prefix"):
                 ErrorDialog(self, "No Conda Environments Found",
                            "No Conda environments detected. Please ensure Conda is properly installed and environment variables are set.")
+            else:
+                self._start_background_scans()
 
         except Exception as e:
             ErrorDialog(self, "Failed to Load Environments",
                        f"Unable to load Conda environment list: {str(e)}\n\nPlease ensure Conda is properly installed and accessible from command line.")
 
+    def _restore_session(self):
+        """Show the environments and package tables saved by the last session
+
+        Returns:
+            bool: True if a saved session was shown
+        """
+        session = load_session()
+        if not session or not session["environments"]:
+            return False
+        store = self.package_manager.store
+        for env_path, packages in session["packages"].items():
+            store.set_env(env_path, packages, session["signatures"].get(env_path))
+        for pkg_name, summary in session["summaries"].items():
+            store.set_summary(pkg_name, summary)
+        for env_path, env_name in session["environments"]:
+            self._add_environment_to_tree(env_name, env_path)
+        return True
+
+    def _reconcile_environments(self):
+        """Discover the live environment list; runs on a background thread"""
+        try:
+            envs_data = self.conda_manager.get_environments()
+        except Exception as e:
+            self.update_pump.post(self._report_discovery_error, e)
+            return
+        self.update_pump.post(self._apply_live_environments, envs_data)
+
+    def _apply_live_environments(self, envs_data):
+        """Replace the restored environment list with the discovered one and rescan"""
+        self._apply_environment_list(envs_data, scan_new=False)
+        if not self._env_names:
+            ErrorDialog(self, "No Conda Environments Found",
+                       "No Conda environments detected. Please ensure Conda is properly installed and environment variables are set.")
+        else:
+            self._start_background_scans()
+
+    def _report_discovery_error(self, error):
+        """Report a failed live discovery unless a restored list is on screen"""
+        if self._restored_session:
+            logger.warning("Failed to reload environments: %s", error)
+        else:
+            ErrorDialog(self, "Failed to Load Environments",
+                       f"Unable to load Conda environment list: {str(error)}\n\nPlease ensure Conda is properly installed and accessible from command line.")
+
+    def _start_background_scans(self):
+        """Build the search index in the background
+
+        Disk usage is measured on demand (see measure_disk_usage), as it
+        stats every file of an environment.
+        """
+        Thread(target=self._index_environments, args=(list(self._env_names),),
+               daemon=True).start()
+
+    def _save_session(self):
+        """Save the environment list and package tables for a fast next start"""
+        try:
+            save_session(list(self._env_names.items()), self.package_manager.store)
+        except Exception as e:
+            logger.warning("Failed to save session: %s", e)
+
     def _add_environment_to_tree(self, env_name, env_path):
         """Add environment node to tree view"""
         env_item = self.tree.insert("", "end", text=env_name, values=("",), iid=env_path, open=False)
         self.tree.item(env_item, tags=("env",))
+        self._env_names[env_path] = env_name
 
     def on_item_clicked(self, event):
         """Handle tree node click event"""
         item = self.tree.identify('item', event.x, event.y)
+        if not item:
+            return
         parent = self.tree.parent(item)
 
         if not parent:  # Click on environment node
             is_open = self.tree.item(item, "open")
             
-            # Load package list if node hasn't been loaded
-            if not self.tree.get_children(item):
+            if is_open:
+                # Stop fetching summaries nobody can see any more
+                self.package_manager.cancel_pending(item)
+            elif item not in self._env_rows:
+                # Load package list if node hasn't been loaded
                 self.load_packages(item)
+            else:
+                self._resume_summaries(item)
 
             # Toggle node's expand/collapse state
             self.tree.item(item, open=not is_open)
+            self._schedule_prioritize()
+        elif self._env_rows[parent].is_marker(item):  # Click on paging row
+            self._page(parent, item)
         else:  # Click on package node
             self.show_package_info(item)
 
-    def load_packages(self, env_item):
-        """Load package list for specified environment"""
+    def on_item_right_clicked(self, event):
+        """Offer comparisons for the environment under the pointer"""
+        item = self.tree.identify_row(event.y)
+        if not item or self.tree.parent(item):
+            return
+        menu = tk.Menu(self, tearoff=0)
+
+        history_menu = tk.Menu(menu, tearoff=0)
+        history = self.snapshot_store.history(item) if self.snapshot_store is not None else []
+        for snapshot_id, taken_at, _ in history:
+            label = time.strftime("%Y-%m-%d %H:%M", time.localtime(taken_at))
+            history_menu.add_command(label=label, command=lambda snapshot_id=snapshot_id, label=label:
+                                     self.compare_environments(item, snapshot_id=snapshot_id, label=label))
+        menu.add_cascade(label="Changes since", menu=history_menu,
+                         state=tk.NORMAL if history else tk.DISABLED)
+
+        compare_menu = tk.Menu(menu, tearoff=0)
+        for env_path, env_name in self._env_names.items():
+            if env_path != item:
+                compare_menu.add_command(label=env_name, command=lambda env_path=env_path:
+                                         self.compare_environments(item, other_env=env_path))
+        menu.add_cascade(label="Compare with", menu=compare_menu,
+                         state=tk.NORMAL if len(self._env_names) > 1 else tk.DISABLED)
+        menu.tk_popup(event.x_root, event.y_root)
+
+    def compare_environments(self, env_path, other_env=None, snapshot_id=None, label=None):
+        """Show how an environment differs from another one or from a snapshot
+
+        Args:
+            env_path (str): Environment whose live packages are compared
+            other_env (str): Environment compared against
+            snapshot_id (int): Snapshot of env_path compared against
+            label (str): Display name of the snapshot
+        """
+        env_name = self._env_names.get(env_path, env_path)
+        if other_env is not None:
+            title = f"{self._env_names.get(other_env, other_env)} \u2192 {env_name}"
+        else:
+            title = f"{env_name}: changes since {label}"
+        dialog = DiffDialog(self, title)
+
+        def compare():
+            try:
+                if other_env is not None:
+                    old = self.package_manager.snapshot(other_env)
+                else:
+                    old = self.snapshot_store.load(snapshot_id)
+                diff = diff_snapshots(old, self.package_manager.snapshot(env_path))
+            except Exception as e:
+                self.update_pump.post(dialog.update_diff, None, str(e))
+                return
+            self.update_pump.post(dialog.update_diff, diff)
+
+        Thread(target=compare, daemon=True).start()
+
+    def load_packages(self, env_item, window_size=300):
+        """Load package list for specified environment
+
+        Only a window of rows around the viewport is kept in the tree (see
+        VirtualRows), so opening a very large environment costs the same as
+        opening a small one.
+        """
         env_path = env_item
         try:
-            # Get conda and pip packages
-            packages = self.package_manager.get_all_packages(env_path)
+            # Show the last scan (possibly from the saved session) and rescan
+            # in the background; fall back to scanning now
+            packages = self.package_manager.store.env(env_path)
+            if packages is None:
+                packages = self.package_manager.load_env(env_path)
+            elif not self._is_current(env_path):
+                Thread(target=self._on_env_changed, args=(env_path,), daemon=True).start()
             
-            # Add packages to tree view
-            for pkg_name, pkg_info in packages.items():
-                self.tree.insert(env_item, "end", text=pkg_name,
-                               values=(pkg_info["version"], "Loading..."),
-                               tags=(pkg_name,))
-                # Asynchronously load summary information
-                self.package_manager.load_package_summary_async(pkg_name,
-                    self.tree.get_children(env_item)[-1], self._update_summary_in_tree)
+            rows = VirtualRows(self.tree, env_item, packages, window_size,
+                               on_rows_added=lambda added: self._fetch_row_summaries(env_item, added),
+                               on_rows_removed=self.package_manager.cancel_items)
+            usage = self.disk_usage.cached(env_path)
+            rows.set_usage(usage)
+            if usage is None:
+                Thread(target=self._measure_environments, args=([env_path],), daemon=True).start()
+            rows.set_latest(self._latest_map(env_path))
+            self._env_rows[env_item] = rows
+            self.env_watcher.watch(env_path)
+
+            # Add packages to tree view once the node has been opened
+            self.update_pump.post(rows.show, 0)
                     
         except Exception as e:
-            print(f"Failed to load packages: {str(e)}")
+            logger.warning("Failed to load packages: %s", e, extra={"env_path": env_path})
+
+    def _fetch_row_summaries(self, env_item, rows):
+        """Queue summary fetches for newly materialized rows of an open environment"""
+        if not self.tree.item(env_item, "open"):
+            return
+        for item_id, pkg_name in rows:
+            # Asynchronously load summary information
+            self.package_manager.load_package_summary_async(pkg_name,
+                item_id, self._update_summary_in_tree, group=env_item)
+        self._schedule_prioritize()
+
+    def _page(self, env_item, marker):
+        """Slide an environment's row window towards the clicked or visible marker"""
+        rows = self._env_rows[env_item]
+        visible = [item for item in self._visible_rows() if self.tree.parent(item) == env_item]
+        if marker == rows.bottom_marker:
+            anchor = visible[0] if visible else None
+            rows.page_forward()
+        else:
+            anchor = visible[-1] if visible else None
+            rows.page_backward()
+        # Keep the rows the user was looking at in view
+        if anchor and self.tree.exists(anchor) and not rows.is_marker(anchor):
+            self.tree.see(anchor)
+
+    def _resume_summaries(self, env_item):
+        """Re-queue summary fetches cancelled when the environment was collapsed"""
+        for item_id in self.tree.get_children(env_item):
+            if self.tree.set(item_id, "Summary") == "Loading...":
+                self.package_manager.load_package_summary_async(self.tree.item(item_id, "text"),
+                    item_id, self._update_summary_in_tree, group=env_item)
+
+    def _on_tree_scrolled(self, scrollbar, first, last):
+        """Update the scrollbar and reprioritize fetches for the new viewport"""
+        scrollbar.set(first, last)
+        self._schedule_prioritize()
+
+    def _schedule_prioritize(self):
+        """Reprioritize visible rows once scrolling settles"""
+        if self._prioritize_job is not None:
+            self.after_cancel(self._prioritize_job)
+        self._prioritize_job = self.after(100, self._prioritize_visible_rows)
+
+    def _prioritize_visible_rows(self):
+        """Move summary fetches for rows in the viewport to the front of the queue"""
+        self._prioritize_job = None
+        visible = self._visible_rows()
+        self.package_manager.prioritize_items(visible)
+
+        # Scrolling a paging marker into view slides that environment's window
+        for item in visible:
+            rows = self._env_rows.get(self.tree.parent(item))
+            if rows is not None and rows.is_marker(item):
+                self._page(rows.env_item, item)
+                break
+
+    def _visible_rows(self):
+        """Return the IDs of package rows currently inside the viewport"""
+        rows = []
+        row_height = int(ttk.Style().lookup("Custom.Treeview", "rowheight") or 20)
+        for y in range(0, self.tree.winfo_height(), max(row_height // 2, 1)):
+            item = self.tree.identify_row(y)
+            if item and self.tree.parent(item) and (not rows or rows[-1] != item):
+                rows.append(item)
+        return rows
+
+    def _on_env_changed(self, env_path):
+        """Rescan a changed environment; called on the watcher thread"""
+        try:
+            packages = self.package_manager.load_env(env_path)
+        except Exception as e:
+            logger.warning("Failed to rescan environment: %s", e, extra={"env_path": env_path})
+            return
+        self.update_pump.post(self._apply_env_update, env_path, packages)
+        if self.disk_usage.cached(env_path) is not None:
+            self._measure_environments([env_path])
+
+    def _apply_env_update(self, env_path, packages):
+        """Apply only the added, removed and changed rows of a rescanned environment"""
+        rows = self._env_rows.get(env_path)
+        if rows is None or not self.tree.exists(env_path):
+            return
+        added, removed, changed = diff_records(rows.packages, packages)
+        if added or removed or changed:
+            rows.refresh(packages, changed)
+            if self._outdated_by_env is not None and (removed or changed):
+                self._recheck_outdated(env_path, packages)
+            self._schedule_search()
+
+    def _on_envs_changed(self):
+        """Re-read the environment list; called on the watcher thread"""
+        try:
+            envs_data = self.conda_manager.get_environments()
+        except Exception as e:
+            logger.warning("Failed to reload environments: %s", e)
+            return
+        self.update_pump.post(self._apply_environment_list, envs_data)
+
+    def _apply_environment_list(self, envs_data, scan_new=True):
+        """Add environments that appeared and remove ones that disappeared
+
+        Args:
+            envs_data (dict): Result of CondaManager.get_environments
+            scan_new (bool): Scan added environments right away
+        """
+        env_paths = [envs_data["base_prefix"]] if envs_data.get("base_prefix") else []
+        env_paths += [path for path in envs_data.get("envs", []) if path != envs_data.get("base_prefix")]
+
+        for env_path in list(self._env_names):
+            if env_path not in env_paths:
+                self.package_manager.cancel_pending(env_path)
+                self.env_watcher.unwatch(env_path)
+                self.package_index.remove_env(env_path)
+                self._env_rows.pop(env_path, None)
+                self.package_manager.store.remove_env(env_path)
+                self.disk_usage.invalidate(env_path)
+                del self._env_names[env_path]
+                if self._outdated_by_env is not None:
+                    self._outdated_by_env.pop(env_path, None)
+                self.tree.delete(env_path)
+
+        for env_path in env_paths:
+            if env_path not in self._env_names:
+                env_name = "base" if env_path == envs_data.get("base_prefix") else self.conda_manager.get_env_name(env_path)
+                self._add_environment_to_tree(env_name, env_path)
+                if scan_new:
+                    Thread(target=self.package_manager.load_env, args=(env_path,), daemon=True).start()
+        self._schedule_search()
+
+    def measure_disk_usage(self):
+        """Measure the disk usage of every environment"""
+        self.usage_button.config(state=tk.DISABLED, text="Measuring...")
+        Thread(target=self._measure_environments, args=(list(self._env_names), True),
+               daemon=True).start()
+
+    def _measure_environments(self, env_paths, from_button=False):
+        """Measure the disk usage of environments; runs on a background thread
+
+        Which bytes are shared depends on every environment measured so far,
+        so the figures of the others are refreshed afterwards too.
+        """
+        for env_path in env_paths:
+            try:
+                usage = self.disk_usage.scan(env_path)
+            except Exception as e:
+                logger.warning("Failed to measure disk usage: %s", e, extra={"env_path": env_path})
+                continue
+            self.update_pump.post(self._apply_env_usage, env_path, usage)
+        for env_path in self.disk_usage.environments():
+            if env_path not in env_paths:
+                usage = self.disk_usage.cached(env_path)
+                if usage is not None:
+                    self.update_pump.post(self._apply_env_usage, env_path, usage)
+        if from_button:
+            self.update_pump.post(self._usage_measured)
+
+    def _usage_measured(self):
+        """Re-enable the disk usage button after measuring every environment"""
+        self.usage_button.config(state=tk.NORMAL, text="Disk usage")
+
+    def _apply_env_usage(self, env_path, usage):
+        """Show an environment's disk usage on its node and package rows"""
+        if not self.tree.exists(env_path):
+            return
+        self.tree.set(env_path, "Size", format_size(usage.total_bytes))
+        self.tree.set(env_path, "Unique", format_size(usage.unique_bytes))
+        rows = self._env_rows.get(env_path)
+        if rows is not None:
+            rows.set_usage(usage)
+
+    def _is_current(self, env_path):
+        """Return True if the stored scan of an environment is still up to date"""
+        signature = self.package_manager.store.signature(env_path)
+        return signature is not None and signature == env_signature(env_path)
+
+    def _index_environments(self, env_paths):
+        """Restore the saved search index, then rescan changed environments
+
+        Runs on a background thread; load_env updates the index and the
+        package store as each environment is scanned. Environments whose
+        conda-meta and site-packages mtimes match the saved session are
+        indexed from their restored tables instead of being rescanned.
+        """
+        try:
+            self.package_index.restore()
+            self.update_pump.post(self._run_search)
+            indexed = set(self.package_index.environments())
+            for env_path in indexed:
+                if env_path not in env_paths:
+                    self.package_index.remove_env(env_path)
+            store = self.package_manager.store
+            for env_path in env_paths:
+                packages = store.env(env_path)
+                if packages is not None and self._is_current(env_path):
+                    if env_path not in indexed:
+                        self.package_index.update_env(env_path, {
+                            record.name: {"version": record.version, "source": record.source}
+                            for record in packages})
+                    continue
+                packages = self.package_manager.load_env(env_path)
+                self.update_pump.post(self._apply_env_update, env_path, packages)
+            self.package_index.save()
+            self.update_pump.post(self._run_search)
+            self.update_pump.post(self._save_session)
+        except Exception as e:
+            logger.warning("Failed to index environments: %s", e)
+
+    def check_updates(self):
+        """Look up the latest release of every package in every environment"""
+        self.check_button.config(state=tk.DISABLED, text="Checking...")
+        Thread(target=self._find_outdated, args=(list(self._env_names),), daemon=True).start()
+
+    def _find_outdated(self, env_paths):
+        """Build the outdated-package report; runs on a background thread"""
+        try:
+            report = self.package_manager.outdated(env_paths)
+        except Exception as e:
+            logger.warning("Failed to check for updates: %s", e)
+            report = None
+        self.update_pump.post(self._apply_outdated, report)
+
+    def _apply_outdated(self, report):
+        """Show an outdated-package report on the environment nodes and package rows"""
+        self.check_button.config(state=tk.NORMAL, text="Check updates")
+        if report is None:
+            return
+        self._outdated_by_env = {env_path: {} for env_path in self._env_names}
+        for outdated in report:
+            if outdated.env_path in self._outdated_by_env:
+                self._outdated_by_env[outdated.env_path][outdated.name] = outdated
+        for env_path in self._env_names:
+            self._show_outdated(env_path)
+        self.export_button.config(state=tk.NORMAL)
+
+    def _recheck_outdated(self, env_path, packages):
+        """Drop packages that were removed or upgraded from an environment's report"""
+        outdated = self._outdated_by_env.get(env_path, {})
+        for pkg_name, entry in list(outdated.items()):
+            record = packages.find(pkg_name)
+            if record is None or not is_older(record.version, entry.latest):
+                del outdated[pkg_name]
+            elif record.version != entry.version:
+                # Entries are shared with the report; replace rather than modify them
+                outdated[pkg_name] = OutdatedPackage(entry.env_path, entry.name, record.version,
+                                                     entry.latest, entry.source)
+        self._show_outdated(env_path)
+
+    def _show_outdated(self, env_path):
+        """Show an environment's outdated count on its node and highlight its rows"""
+        count = len(self._outdated_by_env.get(env_path, ()))
+        self.tree.set(env_path, "Latest", f"{count} outdated" if count else "")
+        rows = self._env_rows.get(env_path)
+        if rows is not None:
+            rows.set_latest(self._latest_map(env_path))
+
+    def _latest_map(self, env_path):
+        """Return package name -> latest version for an environment's outdated packages"""
+        if self._outdated_by_env is None:
+            return {}
+        return {pkg_name: entry.latest for pkg_name, entry in self._outdated_by_env.get(env_path, {}).items()}
+
+    def export_outdated(self):
+        """Save the last outdated-package report as CSV or NDJSON"""
+        path = filedialog.asksaveasfilename(parent=self, title="Export outdated packages",
+                                            defaultextension=".csv",
+                                            filetypes=(("CSV", "*.csv"), ("NDJSON", "*.ndjson")))
+        if not path:
+            return
+        fmt = "ndjson" if path.endswith((".ndjson", ".jsonl", ".json")) else "csv"
+        report = [outdated[pkg_name] for outdated in self._outdated_by_env.values() for pkg_name in sorted(outdated)]
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as stream:
+                report_outdated(report, self._env_names, RecordWriter(stream, fmt, ("env",) + OUTDATED_FIELDS))
+        except Exception as e:
+            ErrorDialog(self, "Export Failed", f"Unable to write {path}: {str(e)}")
+
+    def _schedule_search(self):
+        """Run the search once typing pauses"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(120, self._run_search)
+
+    def _run_search(self):
+        """Show index matches for the search bar text, or the tree if it is empty"""
+        self._search_job = None
+        query = self.search_var.get().strip()
+        if not query:
+            self.results_frame.pack_forget()
+            self.tree_frame.pack(fill=tk.BOTH, expand=True)
+            self.search_status.config(text="e.g. numpy<1.24")
+            return
+
+        matches = self.package_index.search(query)
+        self.results.delete(*self.results.get_children())
+        for match in matches:
+            self.results.insert("", "end", text=match.name,
+                                values=(self._env_names.get(match.env_path, match.env_path),
+                                        match.version, match.source),
+                                tags=(match.env_path,))
+        env_count = len({match.env_path for match in matches})
+        self.search_status.config(text=f"{len(matches)} matches in {env_count} environments")
+        self.tree_frame.pack_forget()
+        self.results_frame.pack(fill=tk.BOTH, expand=True)
+
+    def on_result_activated(self, event):
+        """Show details for a double-clicked search result"""
+        item = self.results.identify_row(event.y)
+        if item:
+            pkg_name = self.results.item(item, "text")
+            env_path = self.results.item(item, "tags")[0]
+            PackageInfoDialog(self, pkg_name, env_path, self.package_manager, self.update_pump)
+
+    def _update_status(self):
+        """Refresh the status bar once a second"""
+        lookups = sum(tracer.counter(name) for name in
+                      ("pypi.cache_hits", "pypi.revalidated", "pypi.downloads", "pypi.errors"))
+        parts = [f"Fetches: {tracer.gauge('http.in_flight')} in flight, "
+                 f"{self.package_manager.scheduler.pending_count()} pending"]
+        if lookups:
+            parts.append(f"Cache hits: {tracer.counter('pypi.cache_hits') / lookups:.0%}")
+        p95 = tracer.percentile("http.request")
+        if p95 is not None:
+            parts.append(f"PyPI p95: {p95 * 1000:.0f} ms")
+        if tracer.counter("http.throttled"):
+            parts.append(f"Throttled: {tracer.counter('http.throttled')}")
+        parts.append(f"UI queue: {self.update_pump.pending()}")
+        if tracer.enabled:
+            parts.append(f"Tracing: {tracer.stats()['spans']} spans")
+        self.status_label.config(text="  \u00b7  ".join(parts))
+        self._status_job = self.after(1000, self._update_status)
+
+    def toggle_trace(self):
+        """Start recording a trace, or stop and save it as Chrome trace JSON"""
+        if not tracer.enabled:
+            tracer.enable()
+            self.trace_button.config(text="Save trace...")
+            return
+        tracer.disable()
+        self.trace_button.config(text="Record trace")
+        path = filedialog.asksaveasfilename(parent=self, title="Save trace", defaultextension=".json",
+                                            filetypes=(("Chrome trace", "*.json"),))
+        if not path:
+            return
+        try:
+            tracer.export_chrome_trace(path)
+        except Exception as e:
+            ErrorDialog(self, "Saving Trace Failed", f"Unable to write {path}: {str(e)}")
+
+    def on_close(self):
+        """Cancel background work and close the window"""
+        self.after_cancel(self._status_job)
+        self._save_session()
+        self.env_watcher.stop()
+        self.package_manager.shutdown()
+        self.disk_usage.shutdown()
+        self.update_pump.stop()
+        self.destroy()
 
     def show_package_info(self, item):
         """Show package details popup"""
         pkg_name = self.tree.item(item)["text"]
         env_path = self.tree.parent(item)
-        PackageInfoDialog(self, pkg_name, env_path, self.package_manager)
+        PackageInfoDialog(self, pkg_name, env_path, self.package_manager, self.update_pump)
+
+    def _update_summary_in_tree(self, item_id, summary, failed):
+        """Queue a summary update; called from fetch worker threads"""
+        self.update_pump.post(self._apply_summary, item_id, summary, failed)
 
-    def _update_summary_in_tree(self, item_id, summary):
+    def _apply_summary(self, item_id, summary, failed):
         """Update summary information in tree view"""
         try:
-            current_values = self.tree.item(item_id, "values")
-            if len(current_values) >= 1:
-                self.tree.item(item_id, values=(current_values[0], summary))
+            # The row may have left the window since the fetch was queued
+            if self.tree.exists(item_id):
+                self._env_rows[self.tree.parent(item_id)].set_summary(item_id, summary, failed)
         except Exception as e:
-            print(f"Failed to update summary: {str(e)}")
\ No newline at end of file
+            logger.warning("Failed to update summary: %s", e, extra={"item_id": item_id})
\ No newline at end of file
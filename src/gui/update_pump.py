@@ -0,0 +1,69 @@
+import logging
+import time
+from collections import deque
+from ..utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+class UpdatePump:
+    """Main-thread queue for applying UI updates produced by worker threads
+
+    Tk widgets may only be touched from the thread running the main loop.
+    Worker threads post callables here instead, and an after()-driven tick
+    on the main thread runs them in batches limited by a per-tick time
+    budget so the window keeps processing input while large updates land.
+    While tracing is on, every update is recorded as a span named after
+    the callable.
+    """
+
+    def __init__(self, root, interval_ms=15, idle_interval_ms=50, budget_ms=8):
+        """Create the pump and start ticking
+
+        Must be called from the main thread.
+
+        Args:
+            root: Tk widget used to schedule after() callbacks
+            interval_ms (int): Delay between ticks while work is queued
+            idle_interval_ms (int): Delay between ticks while the queue is empty
+            budget_ms (float): Time budget for running callables in one tick
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.budget = budget_ms / 1000.0
+        self._queue = deque()
+        self._job = self.root.after(self.idle_interval_ms, self._tick)
+
+    def post(self, func, *args):
+        """Queue func(*args) to run on the main thread; safe from any thread"""
+        self._queue.append((func, args))
+
+    def pending(self):
+        """Return the number of queued updates"""
+        return len(self._queue)
+
+    def stop(self):
+        """Stop ticking and drop queued updates"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self._queue.clear()
+
+    def _tick(self):
+        """Run queued updates until the queue is empty or the budget is spent"""
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            try:
+                func, args = self._queue.popleft()
+            except IndexError:
+                break
+            try:
+                if tracer.enabled:
+                    with tracer.span(getattr(func, "__qualname__", "update")):
+                        func(*args)
+                else:
+                    func(*args)
+            except Exception as e:
+                logger.exception("Failed to apply UI update: %s", e, extra={"callback": getattr(func, "__qualname__", repr(func))})
+        delay = self.interval_ms if self._queue else self.idle_interval_ms
+        self._job = self.root.after(delay, self._tick)
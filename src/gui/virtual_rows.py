@@ -0,0 +1,213 @@
+from ..utils.disk_usage import format_size
+from ..utils.package_manager import shorten_summary
+from ..utils.tracing import traced
+from .widgets import NO_DESCRIPTION
+
+ROW_ID_SEPARATOR = "::"
+
+class VirtualRows:
+    """Fixed-size window of package rows under one environment node
+
+    Rows are backed by a name-sorted EnvPackages view of the PackageStore;
+    only window_size of them exist as Treeview items at any time. Marker
+    rows at the top and bottom of the window stand in for the packages
+    outside it, and paging slides the window by half its size, inserting
+    and deleting rows only at its edges.
+    """
+
+    def __init__(self, tree, env_item, packages, window_size=300,
+                 on_rows_added=None, on_rows_removed=None):
+        """Create the window (no rows are inserted until show() is called)
+
+        Args:
+            tree (ttk.Treeview): Tree holding the environment node
+            env_item (str): Environment item ID (the environment path)
+            packages (EnvPackages): Name-sorted records from PackageManager.load_env
+            window_size (int): Maximum number of package rows materialized at once
+            on_rows_added: Called with a list of (item_id, pkg_name) for new rows
+            on_rows_removed: Called with a list of item IDs that left the window
+        """
+        self.tree = tree
+        self.env_item = env_item
+        self.packages = packages
+        self.store = packages.store
+        self.window_size = window_size
+        self.on_rows_added = on_rows_added
+        self.on_rows_removed = on_rows_removed
+        self.usage = None
+        self.latest = {}
+        self.start = 0
+        self.end = 0
+        self.top_marker = f"{env_item}{ROW_ID_SEPARATOR}<previous>"
+        self.bottom_marker = f"{env_item}{ROW_ID_SEPARATOR}<next>"
+
+    def row_id(self, pkg_name):
+        """Return the stable item ID used for a package row"""
+        return f"{self.env_item}{ROW_ID_SEPARATOR}{pkg_name}"
+
+    def is_marker(self, item_id):
+        """Return True if item_id is one of this window's paging markers"""
+        return item_id in (self.top_marker, self.bottom_marker)
+
+    def set_summary(self, item_id, summary, failed=False):
+        """Show a fetched summary if the row is materialized
+
+        Args:
+            item_id (str): Row item ID
+            summary (str): Summary, or an error message if failed
+            failed (bool): Show the error without remembering it, so the
+                summary is fetched again when the row is next materialized
+        """
+        if not failed:
+            self.store.set_summary(item_id.rsplit(ROW_ID_SEPARATOR, 1)[1], summary)
+        if self.tree.exists(item_id):
+            self.tree.set(item_id, "Summary", summary or NO_DESCRIPTION)
+
+    def set_usage(self, usage):
+        """Show per-package disk usage from a DiskUsageScanner result
+
+        Args:
+            usage (EnvUsage): Usage of this environment, or None if not measured yet
+        """
+        self.usage = usage
+        for index in range(self.start, self.end):
+            item_id = self.row_id(self.packages[index].name)
+            if self.tree.exists(item_id):
+                size, unique = self._size_values(self.packages[index].name)
+                self.tree.set(item_id, "Size", size)
+                self.tree.set(item_id, "Unique", unique)
+
+    def set_latest(self, latest):
+        """Show the latest release of outdated packages and highlight their rows
+
+        Args:
+            latest (dict): Package name -> latest version, for outdated packages only
+        """
+        self.latest = latest
+        for index in range(self.start, self.end):
+            pkg_name = self.packages[index].name
+            item_id = self.row_id(pkg_name)
+            if self.tree.exists(item_id):
+                self.tree.set(item_id, "Latest", latest.get(pkg_name, ""))
+                self.tree.item(item_id, tags=self._row_tags(pkg_name))
+
+    def page_forward(self):
+        """Slide the window half a window towards the end of the list"""
+        self.show(self.start + self.window_size // 2)
+
+    def page_backward(self):
+        """Slide the window half a window towards the start of the list"""
+        self.show(self.start - self.window_size // 2)
+
+    @traced("VirtualRows.show")
+    def show(self, start):
+        """Materialize the rows from start, reusing rows already in the tree
+
+        Args:
+            start (int): Index into the sorted package list of the first row
+        """
+        start = max(0, min(start, len(self.packages) - self.window_size))
+        end = min(len(self.packages), start + self.window_size)
+        if (start, end) == (self.start, self.end) and self.end:
+            return
+
+        for marker in (self.top_marker, self.bottom_marker):
+            if self.tree.exists(marker):
+                self.tree.delete(marker)
+
+        keep_start, keep_end = max(start, self.start), min(end, self.end)
+        if keep_start >= keep_end:
+            keep_start = keep_end = start
+        removed = [self.row_id(self.packages[i].name)
+                   for i in range(self.start, self.end) if not keep_start <= i < keep_end]
+        if removed:
+            self.tree.delete(*removed)
+            if self.on_rows_removed:
+                self.on_rows_removed(removed)
+
+        added = []
+        for position, index in enumerate(range(start, keep_start)):
+            added.append(self._insert_row(position, index))
+        for index in range(max(keep_end, start), end):
+            added.append(self._insert_row("end", index))
+        self.start, self.end = start, end
+        self._insert_markers()
+
+        if added and self.on_rows_added:
+            self.on_rows_added([(item_id, pkg_name) for item_id, pkg_name in added
+                                if self.store.summary(pkg_name) is None])
+
+    @traced("VirtualRows.refresh")
+    def refresh(self, packages, changed=()):
+        """Replace the package list, touching only rows that differ
+
+        Rows that left the list are deleted, rows in changed get their new
+        version, and rows that entered the window are inserted in place. The
+        window keeps its position as far as the new list allows.
+
+        Args:
+            packages (EnvPackages): New records from PackageManager.load_env
+            changed: Names of packages whose version or source changed
+        """
+        self.packages = packages
+        start = max(0, min(self.start, len(self.packages) - self.window_size))
+        end = min(len(self.packages), start + self.window_size)
+
+        for marker in (self.top_marker, self.bottom_marker):
+            if self.tree.exists(marker):
+                self.tree.delete(marker)
+
+        wanted = {self.row_id(record.name) for record in self.packages[start:end]}
+        removed = [item_id for item_id in self.tree.get_children(self.env_item) if item_id not in wanted]
+        if removed:
+            self.tree.delete(*removed)
+            if self.on_rows_removed:
+                self.on_rows_removed(removed)
+
+        added = []
+        for position, index in enumerate(range(start, end)):
+            record = self.packages[index]
+            item_id = self.row_id(record.name)
+            if not self.tree.exists(item_id):
+                added.append(self._insert_row(position, index))
+            elif record.name in changed:
+                self.tree.set(item_id, "Version", record.version)
+        self.start, self.end = start, end
+        self._insert_markers()
+
+        if added and self.on_rows_added:
+            self.on_rows_added([(item_id, pkg_name) for item_id, pkg_name in added
+                                if self.store.summary(pkg_name) is None])
+
+    def _insert_markers(self):
+        """Insert the paging rows for packages outside the window"""
+        if self.start > 0:
+            self.tree.insert(self.env_item, 0, iid=self.top_marker,
+                             text=f"▲ {self.start} earlier packages", values=("", ""), tags=("marker",))
+        if self.end < len(self.packages):
+            self.tree.insert(self.env_item, "end", iid=self.bottom_marker,
+                             text=f"▼ {len(self.packages) - self.end} more packages", values=("", ""),
+                             tags=("marker",))
+
+    def _insert_row(self, position, index):
+        """Insert the package at index of the sorted list as a tree row"""
+        record = self.packages[index]
+        item_id = self.row_id(record.name)
+        summary = self.store.summary(record.name)
+        summary = "Loading..." if summary is None else shorten_summary(summary) or NO_DESCRIPTION
+        self.tree.insert(self.env_item, position, iid=item_id, text=record.name,
+                         values=(record.version, self.latest.get(record.name, ""),
+                                 *self._size_values(record.name), summary),
+                         tags=self._row_tags(record.name))
+        return item_id, record.name
+
+    def _row_tags(self, pkg_name):
+        """Return the tags of a package row"""
+        return (pkg_name, "outdated") if pkg_name in self.latest else (pkg_name,)
+
+    def _size_values(self, pkg_name):
+        """Return the Size and Unique column values of a package"""
+        usage = self.usage.packages.get(pkg_name) if self.usage is not None else None
+        if usage is None:
+            return "", ""
+        return format_size(usage.total_bytes), format_size(usage.unique_bytes)
@@ -1,6 +1,41 @@
+import logging
 import tkinter as tk
+from threading import Thread
 from tkinter import ttk
 
+logger = logging.getLogger(__name__)
+
+# Descriptions are inserted this many characters at a time, yielding to the
+# event loop in between so the dialog stays responsive while Tk lays them out
+DESCRIPTION_CHUNK_SIZE = 8 * 1024
+# Longer descriptions are cut here until "Show more" is clicked
+DESCRIPTION_PREVIEW_SIZE = 64 * 1024
+# Shown for packages the index does not know
+NO_DESCRIPTION = "No description available"
+
+def break_at(text, start, limit):
+    """Return where to end a chunk of text that starts at start
+
+    The chunk ends after the last line break before limit, else after the
+    last space or tab, else at limit itself (e.g. in CJK text without
+    spaces), so it is never empty and never runs past limit.
+
+    Args:
+        text (str): Text being chunked
+        start (int): Index of the first character of the chunk
+        limit (int): Largest end index allowed, greater than start
+
+    Returns:
+        int: End index of the chunk
+    """
+    if limit >= len(text):
+        return len(text)
+    for separators in (("\n",), (" ", "\t")):
+        end = max(text.rfind(separator, start, limit) for separator in separators)
+        if end > start:
+            return end + 1
+    return limit
+
 class ErrorDialog:
     """Dialog for displaying error messages"""
     
@@ -37,7 +72,7 @@ class ErrorDialog:
 class PackageInfoDialog:
     """Dialog for displaying package details"""
     
-    def __init__(self, parent, pkg_name, env_path, package_manager):
+    def __init__(self, parent, pkg_name, env_path, package_manager, update_pump):
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(f"Package Details - {pkg_name}")
         self.dialog.geometry("600x400")
@@ -55,6 +90,14 @@ class PackageInfoDialog:
                                bg="#4a86e8", fg="white")
         title_label.pack(pady=8)
         
+        # Dependency information, filled in once the graph is available
+        deps_frame = tk.Frame(main_frame, bg="#ffffff", padx=15)
+        deps_frame.pack(fill=tk.X, pady=(10, 0))
+        self.deps_label = tk.Label(deps_frame, text="Loading dependencies...", anchor=tk.W,
+                                   justify=tk.LEFT, wraplength=540, bg="#ffffff", fg="#333333",
+                                   font=("Microsoft YaHei UI", 9))
+        self.deps_label.pack(fill=tk.X)
+
         # Create content area
         content_frame = tk.Frame(main_frame, bg="#ffffff", padx=15, pady=15)
         content_frame.pack(fill=tk.BOTH, expand=True)
@@ -81,18 +124,159 @@ class PackageInfoDialog:
         self.status_label = tk.Label(status_frame, text="", anchor=tk.W, bg="#e7e7e7", fg="#666666",
                                 font=("Microsoft YaHei UI", 9))
         self.status_label.pack(side=tk.LEFT, padx=10, pady=3)
+        self.more_button = tk.Button(status_frame, text="Show more", command=self.show_more,
+                                     bg="#e7e7e7", fg="#4a86e8", font=("Microsoft YaHei UI", 9),
+                                     relief=tk.FLAT, bd=0, cursor="hand2")
+        self.description = ""
+        self._shown = 0
+        self._insert_job = None
         
-        # Start loading package information
-        package_manager.load_package_info_async(pkg_name, self.update_info)
+        # Start loading package information; results arrive on a worker thread
+        self.update_pump = update_pump
+        package_manager.load_package_info_async(pkg_name, self._queue_update_info)
+        Thread(target=self._load_dependencies, args=(package_manager, env_path, pkg_name),
+               daemon=True).start()
+
+    def _load_dependencies(self, package_manager, env_path, pkg_name):
+        """Query the environment's dependency graph; runs on a worker thread"""
+        try:
+            graph = package_manager.dependency_graph(env_path)
+            if pkg_name not in graph:
+                text = "Not a conda package; no dependency information."
+            else:
+                dependents = graph.dependents(pkg_name)
+                lines = [
+                    f"Depends on: {', '.join(graph.dependencies(pkg_name)) or 'nothing'}",
+                    f"Required by: {', '.join(dependents) or 'nothing'}",
+                    f"Pulls in {graph.closure_size(pkg_name)} packages; "
+                    f"{len(graph.all_dependents(pkg_name))} packages depend on it",
+                ]
+                if graph.is_requested(pkg_name):
+                    lines.append("Installed because: explicitly requested")
+                elif not dependents:
+                    lines.append("Installed because: nothing requires it (orphan)")
+                else:
+                    chains = [" \u2192 ".join(chain) for chain in graph.why(pkg_name, limit=3)]
+                    lines.append("Installed because: " + "; ".join(chains))
+                constrains = graph.constrains(pkg_name)
+                if constrains:
+                    lines.append(f"Constrains: {', '.join(constrains)}")
+                text = "\n".join(lines)
+        except Exception as e:
+            logger.warning("Failed to load dependencies: %s", e)
+            text = "Failed to load dependencies"
+        self.update_pump.post(self.update_dependencies, text)
+
+    def update_dependencies(self, text):
+        """Show dependency information in the dialog"""
+        try:
+            if self.dialog.winfo_exists():
+                self.deps_label.config(text=text)
+        except Exception as e:
+            logger.warning("Failed to update dependencies: %s", e)
+
+    def _queue_update_info(self, summary, description):
+        """Hand fetched information to the main thread"""
+        self.update_pump.post(self.update_info, summary, description)
     
     def update_info(self, summary, description):
-        """Update package information in the dialog"""
+        """Update package information in the dialog
+
+        The first chunk of the description appears at once and the rest is
+        streamed in; descriptions over DESCRIPTION_PREVIEW_SIZE stop there
+        until "Show more" is clicked.
+        """
         try:
-            # Update description text
+            # The dialog may have been closed while the fetch was running
+            if not self.dialog.winfo_exists():
+                return
+            if self._insert_job is not None:
+                self.dialog.after_cancel(self._insert_job)
+                self._insert_job = None
+
+            self.description = description or NO_DESCRIPTION
+            self._shown = 0
+            self.more_button.pack_forget()
             self.desc_text.delete(1.0, tk.END)
-            self.desc_text.insert(tk.END, description)
-            
-            # Update status label
-            self.status_label.config(text="Information updated from PyPI")
+            self._stream_description(break_at(self.description, 0, DESCRIPTION_PREVIEW_SIZE))
+        except Exception as e:
+            logger.warning("Failed to update package info: %s", e)
+
+    def show_more(self):
+        """Stream in the rest of a truncated description"""
+        self.more_button.pack_forget()
+        self._stream_description(len(self.description))
+
+    def _stream_description(self, end):
+        """Insert the description up to end, one chunk per event loop turn"""
+        self._insert_job = None
+        try:
+            if not self.dialog.winfo_exists():
+                return
+            stop = break_at(self.description, self._shown, min(end, self._shown + DESCRIPTION_CHUNK_SIZE))
+            self.desc_text.insert(tk.END, self.description[self._shown:stop])
+            self._shown = stop
+            if stop < end:
+                self.status_label.config(text=f"Loading description... {stop * 100 // len(self.description)}%")
+                self._insert_job = self.dialog.after(1, self._stream_description, end)
+            elif stop < len(self.description):
+                self.status_label.config(
+                    text=f"Showing the first {stop:,} of {len(self.description):,} characters")
+                self.more_button.pack(side=tk.RIGHT, padx=10)
+            else:
+                self.status_label.config(text="Information updated from PyPI")
+        except Exception as e:
+            logger.warning("Failed to update package info: %s", e)
+
+class DiffDialog:
+    """Dialog listing the package differences between two snapshots"""
+
+    def __init__(self, parent, title):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("600x400")
+        self.dialog.configure(bg="#f0f0f0")
+
+        main_frame = tk.Frame(self.dialog, bg="#ffffff", bd=1, relief=tk.SOLID)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+
+        title_frame = tk.Frame(main_frame, bg="#4a86e8", height=40)
+        title_frame.pack(fill=tk.X)
+        tk.Label(title_frame, text=title, font=("Microsoft YaHei UI", 12, "bold"),
+                 bg="#4a86e8", fg="white").pack(pady=8)
+
+        content_frame = tk.Frame(main_frame, bg="#ffffff", padx=15, pady=15)
+        content_frame.pack(fill=tk.BOTH, expand=True)
+        scrollbar = tk.Scrollbar(content_frame)
+        self.diff_text = tk.Text(content_frame, wrap=tk.NONE, yscrollcommand=scrollbar.set,
+                                 bg="#ffffff", fg="#333333", font=("Consolas", 10),
+                                 bd=1, relief=tk.SOLID)
+        self.diff_text.insert(tk.END, "Comparing...")
+        scrollbar.config(command=self.diff_text.yview)
+        self.diff_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def update_diff(self, diff, error=None):
+        """Show a SnapshotDiff, or the error that prevented computing it"""
+        try:
+            if not self.dialog.winfo_exists():
+                return
+            self.diff_text.delete(1.0, tk.END)
+            if error is not None:
+                self.diff_text.insert(tk.END, f"Failed to compare: {error}")
+                return
+            if not diff:
+                self.diff_text.insert(tk.END, "No differences.")
+                return
+            sections = [
+                ("Added", [f"+ {name} {version} ({source})" for name, version, source in diff.added]),
+                ("Removed", [f"- {name} {version} ({source})" for name, version, source in diff.removed]),
+                ("Upgraded", [f"^ {name} {old} -> {new}" for name, old, new in diff.upgraded]),
+                ("Downgraded", [f"v {name} {old} -> {new}" for name, old, new in diff.downgraded]),
+                ("Changed", [f"~ {name} {old} -> {new}" for name, old, new in diff.changed]),
+            ]
+            for heading, lines in sections:
+                if lines:
+                    self.diff_text.insert(tk.END, f"{heading} ({len(lines)})\n" + "\n".join(lines) + "\n\n")
         except Exception as e:
-            print(f"Failed to update package info: {str(e)}")
\ No newline at end of file
+            logger.warning("Failed to update diff: %s", e)
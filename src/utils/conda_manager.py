@@ -1,13 +1,41 @@
 import subprocess
 import json
 import os
+from .env_discovery import discover_environments
+from .tracing import traced
 
 class CondaManager:
     """Manager class for Conda environment operations"""
+
+    def __init__(self, use_cli=None):
+        """Create the manager
+
+        Args:
+            use_cli (bool): Discover environments with `conda env list` instead
+                of reading conda's files; defaults to the
+                CONDA_ENV_DETECTOR_USE_CLI environment variable
+        """
+        if use_cli is None:
+            use_cli = os.environ.get("CONDA_ENV_DETECTOR_USE_CLI", "") not in ("", "0")
+        self.use_cli = use_cli
     
+    @traced("CondaManager.get_environments")
     def get_environments(self):
         """Get list of all Conda environments
         
+        Returns:
+            dict: Dictionary containing environment information
+        """
+        if self.use_cli:
+            return self._get_environments_cli()
+        try:
+            return discover_environments()
+        except Exception as e:
+            raise Exception(f"Failed to get Conda environments: {str(e)}")
+
+    def _get_environments_cli(self):
+        """Get list of all Conda environments from `conda env list --json`
+        
         Returns:
             dict: Dictionary containing environment information
         """
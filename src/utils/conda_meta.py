@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# Top-level string fields read from each conda-meta record
+HEADER_FIELDS = ("name", "version", "build", "channel", "extracted_package_dir")
+
+# Top-level lists of match specs read from each conda-meta record
+LIST_FIELDS = ("depends", "constrains")
+
+_FIELD_RES = {
+    field: re.compile(rb'"' + field.encode() + rb'"\s*:\s*"((?:[^"\\]|\\.)*)"')
+    for field in HEADER_FIELDS
+}
+
+_LIST_RES = {
+    field: re.compile(rb'"' + field.encode() + rb'"\s*:\s*(\[(?:[^\]"]|"(?:[^"\\]|\\.)*")*\])')
+    for field in LIST_FIELDS
+}
+
+def parse_header(data, filename=None):
+    """Extract the header fields of a conda-meta record without a full parse
+
+    conda-meta records are dominated by their "files" and "paths_data"
+    lists. The header fields are located with byte-level regular expressions
+    and only their values are decoded. If filename is given, the result is
+    checked against conda's "<name>-<version>-<build>.json" naming and the
+    record is fully parsed if they disagree.
+
+    Args:
+        data (bytes): Raw contents of a conda-meta JSON file
+        filename (str): Base name of the file, used for validation
+
+    Returns:
+        dict: Mapping of HEADER_FIELDS to their values (missing fields are
+            None) and of LIST_FIELDS to lists (missing fields are empty)
+    """
+    header = {}
+    for field, pattern in _FIELD_RES.items():
+        match = pattern.search(data)
+        header[field] = json.loads(b'"' + match.group(1) + b'"') if match else None
+    for field, pattern in _LIST_RES.items():
+        match = pattern.search(data)
+        header[field] = json.loads(match.group(1)) if match else []
+
+    if filename is not None and filename != f"{header['name']}-{header['version']}-{header['build']}.json":
+        record = json.loads(data)
+        header = {field: record.get(field) for field in HEADER_FIELDS}
+        header.update((field, record.get(field) or []) for field in LIST_FIELDS)
+    return header
+
+class CondaMetaScanner:
+    """Scanner for conda-meta directories with a per-environment index
+
+    The index remembers each record's header together with the file's
+    mtime and size, so a rescan only stats the directory and re-reads the
+    files that were added or changed since the previous scan. Each
+    environment also has a generation number that grows whenever a scan
+    finds its records changed.
+    """
+
+    def __init__(self, max_workers=8):
+        """Create the scanner
+
+        Args:
+            max_workers (int): Number of threads used to read changed files
+        """
+        self.max_workers = max_workers
+        self._lock = Lock()
+        self._indexes = {}
+        self._generations = {}
+
+    def scan(self, env_path):
+        """Return the header of every package record in an environment
+
+        Args:
+            env_path (str): Path to Conda environment
+
+        Returns:
+            list: Header dicts (see parse_header), one per conda-meta record
+        """
+        meta_dir = os.path.join(env_path, "conda-meta")
+        try:
+            entries = [entry for entry in os.scandir(meta_dir)
+                       if entry.name.endswith(".json") and entry.is_file()]
+        except OSError:
+            return []
+
+        with self._lock:
+            old_index = self._indexes.get(meta_dir, {})
+
+        index = {}
+        changed = []
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = old_index.get(entry.name)
+            if cached is not None and cached[0] == key:
+                index[entry.name] = cached
+            else:
+                changed.append((entry.name, entry.path, key))
+
+        if changed:
+            if len(changed) == 1 or self.max_workers <= 1:
+                results = map(self._read_header, changed)
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    results = list(executor.map(self._read_header, changed))
+            for name, key, header in results:
+                if header is not None:
+                    index[name] = (key, header)
+
+        with self._lock:
+            self._indexes[meta_dir] = index
+            if changed or len(index) != len(old_index) or meta_dir not in self._generations:
+                self._generations[meta_dir] = self._generations.get(meta_dir, 0) + 1
+        return [header for _, header in index.values()]
+
+    def generation(self, env_path):
+        """Return the generation of an environment's last scan, or 0 if never scanned
+
+        Args:
+            env_path (str): Path to Conda environment
+
+        Returns:
+            int: Number that changes whenever a scan sees different records
+        """
+        with self._lock:
+            return self._generations.get(os.path.join(env_path, "conda-meta"), 0)
+
+    def invalidate(self, env_path=None):
+        """Forget the index for one environment, or for all of them
+
+        Args:
+            env_path (str): Path to Conda environment, or None for all
+        """
+        with self._lock:
+            if env_path is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(os.path.join(env_path, "conda-meta"), None)
+
+    def _read_header(self, item):
+        """Read and parse one conda-meta file on a worker thread"""
+        name, path, key = item
+        try:
+            with open(path, "rb") as f:
+                return name, key, parse_header(f.read(), name)
+        except Exception as e:
+            logger.warning("Failed to load conda package: %s", e, extra={"path": path})
+            return name, key, None
@@ -0,0 +1,209 @@
+import ast
+import os
+import re
+from array import array
+from collections import deque
+from threading import Lock
+
+_SPEC_NAME_RE = re.compile(r"[\s=<>!~\[(;,]")
+
+def spec_name(spec):
+    """Return the package name of a conda match spec
+
+    Handles the forms found in conda-meta "depends" lists and in
+    conda-meta/history, e.g. "numpy >=1.21,<2", "python_abi 3.11.* *_cp311",
+    "conda-forge::scipy" or "pandas[version='>=2']".
+
+    Args:
+        spec (str): Match spec
+
+    Returns:
+        str: Package name, or "" if the spec has none
+    """
+    spec = spec.strip()
+    if "::" in spec:
+        spec = spec.split("::", 1)[1]
+    return _SPEC_NAME_RE.split(spec, 1)[0]
+
+def read_requested_specs(env_path):
+    """Return the names of the packages explicitly requested in an environment
+
+    Replays the "# update specs", "# install specs" and "# remove specs"
+    lines of conda-meta/history, as conda does. "# neutered specs" lines
+    only rewrite the spec of a package that stays requested, so they are
+    ignored.
+
+    Args:
+        env_path (str): Path to Conda environment
+
+    Returns:
+        set: Requested package names (empty if the history is missing)
+    """
+    requested = set()
+    try:
+        with open(os.path.join(env_path, "conda-meta", "history"), "r",
+                  encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.startswith("# ") or " specs: " not in line:
+                    continue
+                action, _, specs = line[2:].partition(" specs: ")
+                try:
+                    names = {spec_name(spec) for spec in ast.literal_eval(specs.strip())}
+                except (ValueError, SyntaxError):
+                    continue
+                if action in ("update", "install"):
+                    requested |= names
+                elif action == "remove":
+                    requested -= names
+    except OSError:
+        pass
+    requested.discard("")
+    return requested
+
+class DependencyGraph:
+    """Dependency graph of the conda packages of one environment
+
+    Packages are numbered in name order, and forward and reverse edges are
+    kept as arrays of those numbers. The graph is immutable; query results
+    are memoized for its lifetime, and an environment that changes gets a
+    new graph.
+    """
+
+    def __init__(self, headers, requested=()):
+        """Build the graph
+
+        Args:
+            headers: conda-meta headers from CondaMetaScanner.scan
+            requested: Names of explicitly requested packages (see read_requested_specs)
+        """
+        headers = sorted((header for header in headers if header["name"]), key=lambda h: h["name"])
+        self.names = [header["name"] for header in headers]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._constrains = [tuple(header.get("constrains") or ()) for header in headers]
+        self._requested = {self._index[name] for name in requested if name in self._index}
+
+        forward = [set() for _ in self.names]
+        reverse = [set() for _ in self.names]
+        for i, header in enumerate(headers):
+            for spec in header.get("depends") or ():
+                # Virtual packages such as __glibc have no record and are skipped
+                j = self._index.get(spec_name(spec))
+                if j is not None and j != i:
+                    forward[i].add(j)
+                    reverse[j].add(i)
+        self._forward = [array("I", sorted(edges)) for edges in forward]
+        self._reverse = [array("I", sorted(edges)) for edges in reverse]
+
+        self._lock = Lock()
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def dependencies(self, name):
+        """Return the packages a package depends on directly"""
+        return [self.names[j] for j in self._forward[self._index[name]]]
+
+    def dependents(self, name):
+        """Return the packages that depend on a package directly"""
+        return [self.names[j] for j in self._reverse[self._index[name]]]
+
+    def constrains(self, name):
+        """Return the constrains specs of a package"""
+        return list(self._constrains[self._index[name]])
+
+    def is_requested(self, name):
+        """Return whether a package was explicitly requested"""
+        return self._index[name] in self._requested
+
+    def requirements(self, name):
+        """Return every package a package pulls in, directly or transitively"""
+        return [self.names[j] for j in sorted(self._closure(self._index[name], self._forward))]
+
+    def closure_size(self, name):
+        """Return the number of packages a package pulls in"""
+        return len(self._closure(self._index[name], self._forward))
+
+    def all_dependents(self, name):
+        """Return every package that depends on a package, directly or transitively"""
+        return [self.names[j] for j in sorted(self._closure(self._index[name], self._reverse))]
+
+    def orphans(self):
+        """Return packages that nothing depends on and that were never requested
+
+        Only meaningful when the requested names were supplied.
+        """
+        return self._memoized(("orphans",), lambda: [
+            name for i, name in enumerate(self.names)
+            if not self._reverse[i] and i not in self._requested])
+
+    def why(self, name, limit=10):
+        """Explain why a package is installed
+
+        Walks the reverse edges breadth-first, stopping at requested
+        packages and at packages nothing depends on, and returns the
+        shortest chain from each such root to this package.
+
+        Args:
+            name (str): Package name
+            limit (int): Maximum number of chains
+
+        Returns:
+            list: Chains of package names, each starting at a root and
+                ending with name; [[name]] if the package is itself a root
+        """
+        target = self._index[name]
+
+        def compute():
+            parents = {target: None}
+            queue = deque([target])
+            roots = []
+            while queue and len(roots) < limit:
+                i = queue.popleft()
+                if i in self._requested or not self._reverse[i]:
+                    roots.append(i)
+                    if i == target:
+                        break
+                    continue
+                for j in self._reverse[i]:
+                    if j not in parents:
+                        parents[j] = i
+                        queue.append(j)
+            chains = []
+            for root in roots:
+                chain = []
+                node = root
+                while node is not None:
+                    chain.append(self.names[node])
+                    node = parents[node]
+                chains.append(chain)
+            return chains
+
+        return self._memoized(("why", target, limit), compute)
+
+    def _closure(self, start, edges):
+        """Return the set of nodes reachable from start, excluding start"""
+        def compute():
+            seen = {start}
+            stack = [start]
+            while stack:
+                for j in edges[stack.pop()]:
+                    if j not in seen:
+                        seen.add(j)
+                        stack.append(j)
+            seen.discard(start)
+            return frozenset(seen)
+
+        return self._memoized(("closure", start, edges is self._forward), compute)
+
+    def _memoized(self, key, compute):
+        """Return a cached query result, computing it on first use"""
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+        result = compute()
+        with self._lock:
+            return self._memo.setdefault(key, result)
@@ -0,0 +1,281 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+def format_size(size):
+    """Format a byte count for display, e.g. "12.3 MB"
+
+    Args:
+        size (int): Number of bytes
+
+    Returns:
+        str: Human-readable size
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = "TB"
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+def _disk_bytes(st):
+    """Return the space a file occupies on disk (its size where blocks are not reported)"""
+    blocks = getattr(st, "st_blocks", None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+def record_files(data):
+    """Return the prefix-relative paths listed in a conda-meta record
+
+    Args:
+        data (bytes): Raw contents of a conda-meta JSON file
+
+    Returns:
+        tuple: (package name, list of paths)
+    """
+    record = json.loads(data)
+    files = record.get("files")
+    if files is None:
+        files = [path["_path"] for path in record.get("paths_data", {}).get("paths", [])]
+    return record.get("name"), files
+
+class PackageUsage:
+    """Disk usage of the files of one conda package in one environment
+
+    unique_bytes counts files no other scanned environment holds;
+    shared_bytes counts files whose inode was also seen in another scanned
+    environment.
+    """
+
+    __slots__ = ("name", "files", "total_bytes", "unique_bytes", "shared_bytes")
+
+    def __init__(self, name, files, total_bytes, unique_bytes):
+        self.name = name
+        self.files = files
+        self.total_bytes = total_bytes
+        self.unique_bytes = unique_bytes
+        self.shared_bytes = total_bytes - unique_bytes
+
+def _unique_bytes(inodes, owners):
+    """Sum the sizes of the inodes held by a single scanned environment"""
+    return sum(size for inode, size in inodes.items() if owners.get(inode, 0) <= 1)
+
+class EnvUsage:
+    """Disk usage of one environment, aggregated over its conda packages"""
+
+    __slots__ = ("env_path", "packages", "total_bytes", "unique_bytes", "shared_bytes")
+
+    def __init__(self, env_path, records, inodes, owners):
+        """Split an environment's bytes into unique and shared ones
+
+        Args:
+            env_path (str): Path to Conda environment
+            records: (package name, file count, inode -> bytes) per conda-meta record
+            inodes (dict): (st_dev, st_ino) -> bytes of every file in the environment
+            owners (dict): (st_dev, st_ino) -> number of scanned environments holding it
+        """
+        self.env_path = env_path
+        self.packages = {
+            name: PackageUsage(name, files, sum(pkg_inodes.values()), _unique_bytes(pkg_inodes, owners))
+            for name, files, pkg_inodes in records
+        }
+        self.total_bytes = sum(inodes.values())
+        self.unique_bytes = _unique_bytes(inodes, owners)
+        self.shared_bytes = self.total_bytes - self.unique_bytes
+
+class DiskUsageScanner:
+    """Hardlink-aware disk usage of conda environments
+
+    Each conda-meta record lists the files its package installed; those
+    paths are stat'ed on a thread pool and counted once per (st_dev,
+    st_ino). A file is shared when its inode was also seen in another
+    scanned environment, so files hardlinked between environments are not
+    counted again for each of them. Results are cached per record and keyed
+    on the record's mtime and size, so rescanning an unchanged environment
+    only lists its conda-meta directory.
+
+    Nothing is measured until scan() is called; the inode sets needed to
+    tell unique from shared bytes are too large to persist, so callers
+    measure environments on demand.
+    """
+
+    def __init__(self, max_workers=16):
+        """Create the scanner
+
+        Args:
+            max_workers (int): Number of threads stat'ing files; high values
+                help on network filesystems
+        """
+        self.max_workers = max_workers
+        self._lock = Lock()
+        self._records = {}
+        self._env_inodes = {}
+        self._owners = {}
+        self._generation = 0
+        self._usage = {}
+        self._executor = None
+
+    def scan(self, env_path):
+        """Measure an environment, re-reading only records that changed
+
+        Bytes the environment shares with environments scanned later are
+        reported as unique here; cached() reflects every scan so far.
+
+        Args:
+            env_path (str): Path to Conda environment
+
+        Returns:
+            EnvUsage: Usage of the environment and of each conda package
+        """
+        meta_dir = os.path.join(env_path, "conda-meta")
+        try:
+            entries = [entry for entry in os.scandir(meta_dir)
+                       if entry.name.endswith(".json") and entry.is_file()]
+        except OSError:
+            entries = []
+
+        with self._lock:
+            old_records = self._records.get(meta_dir, {})
+
+        records = {}
+        changed = []
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = old_records.get(entry.name)
+            if cached is not None and cached[0] == key:
+                records[entry.name] = cached
+            else:
+                changed.append((entry.name, entry.path, key))
+
+        if changed:
+            for name, key, record in self._get_executor().map(
+                    lambda item: self._measure_record(env_path, item), changed):
+                if record is not None:
+                    records[name] = (key, record)
+
+        inodes = {}
+        for _, (_, _, pkg_inodes) in records.values():
+            inodes.update(pkg_inodes)
+        with self._lock:
+            self._records[meta_dir] = records
+            if changed or len(records) != len(old_records):
+                self._usage.pop(env_path, None)
+            self._set_inodes(env_path, inodes)
+            return self._env_usage(env_path)
+
+    def cached(self, env_path):
+        """Return the usage of a scanned environment, or None if it was never scanned"""
+        with self._lock:
+            if env_path not in self._env_inodes:
+                return None
+            return self._env_usage(env_path)
+
+    def environments(self):
+        """Return the paths of the scanned environments"""
+        with self._lock:
+            return list(self._env_inodes)
+
+    def combined_bytes(self, env_paths=None):
+        """Return the space used by several environments together
+
+        Files hardlinked between the environments are counted once.
+
+        Args:
+            env_paths: Scanned environments to include, defaults to all of them
+
+        Returns:
+            int: Bytes on disk
+        """
+        with self._lock:
+            combined = {}
+            for env_path in env_paths or list(self._env_inodes):
+                combined.update(self._env_inodes.get(env_path, {}))
+        return sum(combined.values())
+
+    def invalidate(self, env_path=None):
+        """Forget cached results for one environment, or for all of them
+
+        Args:
+            env_path (str): Path to Conda environment, or None for all
+        """
+        with self._lock:
+            if env_path is None:
+                self._records.clear()
+                self._env_inodes.clear()
+                self._owners.clear()
+                self._usage.clear()
+                self._generation += 1
+            else:
+                self._records.pop(os.path.join(env_path, "conda-meta"), None)
+                self._set_inodes(env_path, None)
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _get_executor(self):
+        """Return the shared thread pool, creating it on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _measure_record(self, env_path, item):
+        """Read one conda-meta record and stat its files on a worker thread"""
+        name, path, key = item
+        try:
+            with open(path, "rb") as f:
+                pkg_name, files = record_files(f.read())
+        except Exception as e:
+            logger.warning("Failed to read conda package files: %s", e, extra={"path": path})
+            return name, key, None
+
+        inodes = {}
+        for file in files:
+            try:
+                st = os.lstat(os.path.join(env_path, file))
+            except OSError:
+                continue
+            inodes[(st.st_dev, st.st_ino)] = _disk_bytes(st)
+        return name, key, (pkg_name or name, len(files), inodes)
+
+    def _set_inodes(self, env_path, inodes):
+        """Replace an environment's inode set (None to drop it); the caller holds the lock"""
+        old = self._env_inodes.pop(env_path, None)
+        if inodes is None:
+            self._usage.pop(env_path, None)
+        if old == inodes:
+            if inodes is not None:
+                self._env_inodes[env_path] = old
+            return
+        owners = self._owners
+        for inode in old or ():
+            count = owners[inode] - 1
+            if count:
+                owners[inode] = count
+            else:
+                del owners[inode]
+        if inodes is not None:
+            self._env_inodes[env_path] = inodes
+            for inode in inodes:
+                owners[inode] = owners.get(inode, 0) + 1
+        self._generation += 1
+
+    def _env_usage(self, env_path):
+        """Return an environment's EnvUsage for the current scans; the caller holds the lock"""
+        cached = self._usage.get(env_path)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+        records = [record for _, record in self._records.get(os.path.join(env_path, "conda-meta"), {}).values()]
+        usage = EnvUsage(env_path, records, self._env_inodes[env_path], self._owners)
+        self._usage[env_path] = (self._generation, usage)
+        return usage
@@ -0,0 +1,215 @@
+import os
+import shutil
+
+_ENVS_DIRS_KEYS = ("envs_dirs", "envs_path")
+_PKGS_DIRS_KEYS = ("pkgs_dirs",)
+
+def is_conda_prefix(path):
+    """Return True if path looks like a conda environment prefix
+
+    Args:
+        path (str): Candidate directory
+
+    Returns:
+        bool: Whether path contains conda-meta/history
+    """
+    return os.path.isfile(os.path.join(path, "conda-meta", "history"))
+
+def _expand(path):
+    """Expand ~ and environment variables and normalize a path"""
+    return os.path.normpath(os.path.expandvars(os.path.expanduser(path.strip())))
+
+def _base_from_executable(conda_exe):
+    """Derive the base prefix from a conda executable path
+
+    Handles <base>/bin/conda, <base>/condabin/conda and <base>/Scripts/conda.exe.
+    """
+    if not conda_exe:
+        return None
+    return os.path.dirname(os.path.dirname(os.path.realpath(conda_exe)))
+
+def find_base_prefix():
+    """Locate the conda base (root) prefix without running conda
+
+    Checks CONDA_EXE, CONDA_ROOT, an activated base from CONDA_PREFIX and
+    finally the conda executable on PATH.
+
+    Returns:
+        str: The base prefix, or None if it cannot be found
+    """
+    candidates = [
+        _base_from_executable(os.environ.get("CONDA_EXE")),
+        os.environ.get("CONDA_ROOT"),
+    ]
+    prefix = os.environ.get("CONDA_PREFIX")
+    if prefix and os.path.isdir(os.path.join(prefix, "condabin")):
+        candidates.append(prefix)
+    candidates.append(_base_from_executable(shutil.which("conda")))
+
+    for candidate in candidates:
+        if candidate and is_conda_prefix(candidate):
+            return os.path.normpath(candidate)
+    return None
+
+def condarc_paths(base_prefix=None):
+    """Return the .condarc locations conda reads, in search order
+
+    Args:
+        base_prefix (str): Base prefix, whose .condarc is included if given
+
+    Returns:
+        list: Candidate condarc file paths (not necessarily existing)
+    """
+    paths = ["/etc/conda/.condarc", "/etc/conda/condarc"] if os.name != "nt" else []
+    if base_prefix:
+        paths.append(os.path.join(base_prefix, ".condarc"))
+        paths.append(os.path.join(base_prefix, "condarc"))
+    xdg_config = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    paths.extend([
+        os.path.join(xdg_config, "conda", ".condarc"),
+        os.path.join(xdg_config, "conda", "condarc"),
+        os.path.expanduser("~/.conda/.condarc"),
+        os.path.expanduser("~/.conda/condarc"),
+        os.path.expanduser("~/.condarc"),
+    ])
+    if os.environ.get("CONDARC"):
+        paths.append(os.environ["CONDARC"])
+    return paths
+
+def read_condarc_envs_dirs(path):
+    """Read the envs_dirs list from a .condarc file
+
+    Args:
+        path (str): Path to a condarc file
+
+    Returns:
+        list: Expanded envs_dirs entries, empty if the key is absent
+    """
+    return read_condarc_paths(path, _ENVS_DIRS_KEYS)
+
+def read_condarc_paths(path, keys):
+    """Read a list of paths from a .condarc file
+
+    Only the subset of YAML conda users write for path lists is understood:
+    a block list ("- path" lines) or a flow list ("[a, b]").
+
+    Args:
+        path (str): Path to a condarc file
+        keys (tuple): Top-level keys whose values are collected
+
+    Returns:
+        list: Expanded entries, empty if none of the keys is present
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    dirs = []
+    in_list = False
+    for line in lines:
+        stripped = line.split(" #", 1)[0].strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if in_list:
+            if stripped.startswith("- ") and line[:1] in (" ", "\t", "-"):
+                dirs.append(stripped[2:].strip().strip("'\""))
+                continue
+            in_list = False
+        key, sep, value = stripped.partition(":")
+        if sep and line[:1] not in (" ", "\t") and key.strip() in keys:
+            value = value.strip()
+            if value.startswith("["):
+                dirs.extend(item.strip().strip("'\"")
+                            for item in value.strip("[]").split(",") if item.strip())
+            elif value:
+                dirs.append(value.strip("'\""))
+            else:
+                in_list = True
+    return [_expand(d) for d in dirs]
+
+def envs_dirs(base_prefix=None):
+    """Return the directories conda creates named environments in
+
+    Args:
+        base_prefix (str): Base prefix, if known
+
+    Returns:
+        list: Expanded directories in conda's precedence order, deduplicated
+    """
+    dirs = []
+    for entry in os.environ.get("CONDA_ENVS_PATH", "").split(os.pathsep):
+        if entry.strip():
+            dirs.append(_expand(entry))
+    for path in condarc_paths(base_prefix):
+        dirs.extend(read_condarc_envs_dirs(path))
+    if base_prefix:
+        dirs.append(os.path.join(base_prefix, "envs"))
+    dirs.append(_expand("~/.conda/envs"))
+    return list(dict.fromkeys(dirs))
+
+def pkgs_dirs(base_prefix=None):
+    """Return the package cache directories conda extracts packages into
+
+    Args:
+        base_prefix (str): Base prefix, if known
+
+    Returns:
+        list: Expanded directories in conda's precedence order, deduplicated
+    """
+    dirs = []
+    for entry in os.environ.get("CONDA_PKGS_DIRS", "").split(","):
+        if entry.strip():
+            dirs.append(_expand(entry))
+    for path in condarc_paths(base_prefix):
+        dirs.extend(read_condarc_paths(path, _PKGS_DIRS_KEYS))
+    if base_prefix:
+        dirs.append(os.path.join(base_prefix, "pkgs"))
+    dirs.append(_expand("~/.conda/pkgs"))
+    return list(dict.fromkeys(dirs))
+
+def read_environments_txt(path=None):
+    """Read the prefixes conda has recorded in environments.txt
+
+    Args:
+        path (str): File to read, defaults to ~/.conda/environments.txt
+
+    Returns:
+        list: Expanded prefixes, in file order
+    """
+    path = path or os.path.expanduser("~/.conda/environments.txt")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [_expand(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+def discover_environments():
+    """Discover conda environments by reading conda's own files
+
+    Returns:
+        dict: {"envs": [...], "base_prefix": str or None}, in the shape the
+        GUI expects from CondaManager.get_environments. The base prefix is
+        not repeated in "envs".
+    """
+    base_prefix = find_base_prefix()
+
+    candidates = read_environments_txt()
+    for envs_dir in envs_dirs(base_prefix):
+        try:
+            candidates.extend(sorted(entry.path for entry in os.scandir(envs_dir) if entry.is_dir()))
+        except OSError:
+            continue
+
+    seen = set()
+    if base_prefix:
+        seen.add(os.path.realpath(base_prefix))
+    envs = []
+    for prefix in candidates:
+        real = os.path.realpath(prefix)
+        if real in seen or not is_conda_prefix(prefix):
+            continue
+        seen.add(real)
+        envs.append(prefix)
+    return {"envs": envs, "base_prefix": base_prefix}
@@ -0,0 +1,256 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from threading import Event, Lock, Thread
+from .site_packages import find_site_packages
+
+logger = logging.getLogger(__name__)
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_WATCH_MASK = (0x00000008 | 0x00000040 | 0x00000080 | 0x00000100  # close-write, moved, create
+                  | 0x00000200 | 0x00000400 | 0x00000800)              # delete, delete/move self
+_IN_ONLYDIR = 0x01000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+class _Inotify:
+    """Minimal ctypes binding for Linux inotify"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path):
+        """Watch a directory, returning the watch descriptor or None on failure"""
+        wd = self._add_watch(self.fd, os.fsencode(path), _IN_WATCH_MASK | _IN_ONLYDIR)
+        return wd if wd >= 0 else None
+
+    def rm_watch(self, wd):
+        """Remove a watch added with add_watch"""
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """Return (wd, name) for every queued event"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                events.append((wd, name))
+
+    def close(self):
+        """Close the inotify file descriptor"""
+        os.close(self.fd)
+
+def _mtime(path):
+    """Return a path's mtime_ns, or None if it does not exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+class EnvWatcher:
+    """Watches loaded environments and the environment list for changes
+
+    Each watched environment's conda-meta and site-packages directories are
+    monitored with inotify where available, otherwise by polling their
+    mtimes. ~/.conda/environments.txt is monitored the same way. Changes
+    are debounced, and callbacks run on the watcher's own thread.
+    """
+
+    def __init__(self, on_env_changed, on_envs_changed=None, poll_interval=2.0,
+                 debounce=0.5, use_inotify=True, environments_txt=None):
+        """Create the watcher (call start() to begin watching)
+
+        Args:
+            on_env_changed: Called with an environment path after its packages change
+            on_envs_changed: Called with no arguments after environments.txt changes
+            poll_interval (float): Seconds between mtime polls
+            debounce (float): Quiet period in seconds before a change is reported
+            use_inotify (bool): Use inotify on Linux instead of polling
+            environments_txt (str): File listing environments, defaults to
+                ~/.conda/environments.txt
+        """
+        self.on_env_changed = on_env_changed
+        self.on_envs_changed = on_envs_changed
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.environments_txt = environments_txt or os.path.expanduser("~/.conda/environments.txt")
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        self._watches = {}
+        self._wd_targets = {}
+        self._signatures = {}
+        self._pending = {}
+
+        self._inotify = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.info("inotify unavailable, polling for changes: %s", e)
+        self._envs_txt_wd = None
+        if self._inotify is not None:
+            self._envs_txt_wd = self._inotify.add_watch(os.path.dirname(self.environments_txt))
+            if self._envs_txt_wd is not None:
+                self._wd_targets[self._envs_txt_wd] = None
+        self._envs_txt_signature = _mtime(self.environments_txt)
+
+    def watch(self, env_path):
+        """Start (or refresh) watching an environment
+
+        Args:
+            env_path (str): Path to Conda environment
+        """
+        dirs = [os.path.join(env_path, "conda-meta")] + find_site_packages(env_path)
+        with self._lock:
+            self._unwatch(env_path)
+            wds = []
+            if self._inotify is not None:
+                for path in dirs:
+                    wd = self._inotify.add_watch(path)
+                    if wd is None:
+                        break
+                    wds.append(wd)
+                    self._wd_targets[wd] = env_path
+                else:
+                    self._watches[env_path] = (dirs, wds)
+                    return
+                for wd in wds:
+                    self._inotify.rm_watch(wd)
+                    self._wd_targets.pop(wd, None)
+            # No inotify, or the watch limit was reached: poll this one
+            self._watches[env_path] = (dirs, [])
+            self._signatures[env_path] = tuple(_mtime(path) for path in dirs)
+
+    def unwatch(self, env_path):
+        """Stop watching an environment
+
+        Args:
+            env_path (str): Path to Conda environment
+        """
+        with self._lock:
+            self._unwatch(env_path)
+
+    def start(self):
+        """Start the watcher thread"""
+        if self._thread is None:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread and release inotify resources
+
+        The inotify descriptor is closed by the watcher thread on its way
+        out, so it is never closed while the thread may still be reading it.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        else:
+            self._close_inotify()
+
+    def _close_inotify(self):
+        """Close the inotify descriptor once nothing reads it any more"""
+        with self._lock:
+            inotify, self._inotify = self._inotify, None
+        if inotify is not None:
+            inotify.close()
+
+    def _unwatch(self, env_path):
+        """Remove an environment's watches; the caller holds the lock"""
+        _, wds = self._watches.pop(env_path, ((), ()))
+        for wd in wds:
+            self._wd_targets.pop(wd, None)
+            if self._inotify is not None:
+                self._inotify.rm_watch(wd)
+        self._signatures.pop(env_path, None)
+        self._pending.pop(env_path, None)
+
+    def _run(self):
+        """Collect change notifications and report them once they settle"""
+        next_poll = time.monotonic() + self.poll_interval
+        wait = min(0.25, self.poll_interval)
+        try:
+            while not self._stop.is_set():
+                if self._inotify is not None:
+                    ready, _, _ = select.select([self._inotify.fd], [], [], wait)
+                    if ready:
+                        self._handle_events(self._inotify.read_events())
+                else:
+                    self._stop.wait(wait)
+
+                now = time.monotonic()
+                if now >= next_poll:
+                    self._poll(now)
+                    next_poll = now + self.poll_interval
+                self._fire_due(now)
+        finally:
+            self._close_inotify()
+
+    def _handle_events(self, events):
+        """Mark the targets of inotify events as changed"""
+        now = time.monotonic()
+        with self._lock:
+            for wd, name in events:
+                if wd not in self._wd_targets:
+                    continue
+                target = self._wd_targets[wd]
+                if target is None:
+                    if name == os.path.basename(self.environments_txt):
+                        self._pending[None] = now
+                else:
+                    self._pending[target] = now
+
+    def _poll(self, now):
+        """Compare mtimes of polled environments and environments.txt"""
+        with self._lock:
+            for env_path, (dirs, wds) in self._watches.items():
+                if wds:
+                    continue
+                signature = tuple(_mtime(path) for path in dirs)
+                if signature != self._signatures.get(env_path):
+                    self._signatures[env_path] = signature
+                    self._pending[env_path] = now
+            if self._envs_txt_wd is None:
+                signature = _mtime(self.environments_txt)
+                if signature != self._envs_txt_signature:
+                    self._envs_txt_signature = signature
+                    self._pending[None] = now
+
+    def _fire_due(self, now):
+        """Report targets that have been quiet for the debounce period"""
+        with self._lock:
+            due = [target for target, when in self._pending.items() if now - when >= self.debounce]
+            for target in due:
+                del self._pending[target]
+        for target in due:
+            try:
+                if target is None:
+                    if self.on_envs_changed:
+                        self.on_envs_changed()
+                else:
+                    # Pick up site-packages directories created by the change
+                    self.watch(target)
+                    self.on_env_changed(target)
+            except Exception as e:
+                logger.warning("Failed to handle environment change: %s", e, extra={"env_path": target})
@@ -0,0 +1,202 @@
+import heapq
+import itertools
+import logging
+from threading import Condition, Thread
+
+logger = logging.getLogger(__name__)
+
+# Lower values run first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_VISIBLE = 1
+PRIORITY_BACKGROUND = 2
+
+class _Waiter:
+    """A single consumer waiting on the result of a fetch job"""
+
+    __slots__ = ("token", "group", "deliver")
+
+    def __init__(self, token, group, deliver):
+        self.token = token
+        self.group = group
+        self.deliver = deliver
+
+class _Job:
+    """One pending or running fetch, shared by every waiter for the same key"""
+
+    __slots__ = ("key", "priority", "running", "waiters")
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.priority = priority
+        self.running = False
+        self.waiters = []
+
+class FetchScheduler:
+    """Bounded worker pool that runs keyed fetch jobs in priority order
+
+    Requests for a key that is already queued or running are attached to the
+    existing job instead of starting another fetch. Waiters can be tagged with
+    a token (e.g. a tree item id) to be reprioritized later, and with a group
+    (e.g. an environment path) to be cancelled together.
+    """
+
+    def __init__(self, fetch_func, max_workers=8):
+        """Create the scheduler
+
+        Args:
+            fetch_func: Callable taking a key and returning its result
+            max_workers (int): Maximum number of worker threads
+        """
+        self._fetch_func = fetch_func
+        self._max_workers = max_workers
+        self._cond = Condition()
+        self._heap = []
+        self._jobs = {}
+        self._seq = itertools.count()
+        self._workers = []
+        self._idle_workers = 0
+        self._closed = False
+
+    def submit(self, key, deliver, token=None, group=None, priority=PRIORITY_BACKGROUND):
+        """Queue a fetch for key, or join the one already in flight
+
+        Args:
+            key (str): Deduplication key passed to the fetch function
+            deliver: Callback invoked as deliver(result, error) from a worker thread
+            token: Optional identifier used by prioritize()
+            group: Optional identifier used by cancel_group()
+            priority (int): One of the PRIORITY_* constants
+
+        Returns:
+            bool: False if the scheduler is shut down and deliver will never be called
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            job = self._jobs.get(key)
+            if job is None:
+                job = _Job(key, priority)
+                self._jobs[key] = job
+                self._push(job)
+            elif not job.running and priority < job.priority:
+                job.priority = priority
+                self._push(job)
+            job.waiters.append(_Waiter(token, group, deliver))
+            self._ensure_worker()
+            return True
+
+    def prioritize(self, tokens, priority=PRIORITY_VISIBLE):
+        """Raise the priority of queued jobs that have a waiter with one of tokens
+
+        Args:
+            tokens: Collection of waiter tokens, e.g. the visible tree rows
+            priority (int): Priority to raise matching jobs to
+        """
+        tokens = set(tokens)
+        if not tokens:
+            return
+        with self._cond:
+            for job in self._jobs.values():
+                if job.running or job.priority <= priority:
+                    continue
+                if any(waiter.token in tokens for waiter in job.waiters):
+                    job.priority = priority
+                    self._push(job)
+
+    def cancel_group(self, group):
+        """Drop every waiter in group, and any queued job left without waiters
+
+        Jobs that are already running finish, but their result is no longer
+        delivered to the cancelled waiters.
+
+        Args:
+            group: Group identifier given to submit()
+        """
+        self._cancel_waiters(lambda waiter: waiter.group == group)
+
+    def cancel_tokens(self, tokens):
+        """Drop every waiter whose token is in tokens, like cancel_group()
+
+        Args:
+            tokens: Collection of waiter tokens
+        """
+        tokens = set(tokens)
+        if tokens:
+            self._cancel_waiters(lambda waiter: waiter.token in tokens)
+
+    def _cancel_waiters(self, predicate):
+        """Remove waiters matching predicate and queued jobs left without waiters"""
+        with self._cond:
+            for key, job in list(self._jobs.items()):
+                job.waiters = [waiter for waiter in job.waiters if not predicate(waiter)]
+                if not job.waiters and not job.running:
+                    del self._jobs[key]
+
+    def shutdown(self):
+        """Cancel all queued work and stop the workers once they are idle"""
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            for job in self._jobs.values():
+                job.waiters.clear()
+            self._jobs.clear()
+            self._cond.notify_all()
+
+    def pending_count(self):
+        """Return the number of queued or running jobs"""
+        with self._cond:
+            return len(self._jobs)
+
+    def _push(self, job):
+        """Push a heap entry for job; stale entries are skipped when popped"""
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+        self._cond.notify()
+
+    def _ensure_worker(self):
+        """Start another worker if queued jobs outnumber the idle workers"""
+        if len(self._heap) > self._idle_workers and len(self._workers) < self._max_workers:
+            worker = Thread(target=self._worker_loop, daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self):
+        """Block until a runnable job is available; return None on shutdown"""
+        with self._cond:
+            while True:
+                while self._heap:
+                    priority, _, job = heapq.heappop(self._heap)
+                    if (job.running or priority != job.priority
+                            or self._jobs.get(job.key) is not job):
+                        continue
+                    job.running = True
+                    return job
+                if self._closed:
+                    return None
+                self._idle_workers += 1
+                self._cond.wait()
+                self._idle_workers -= 1
+
+    def _worker_loop(self):
+        """Run jobs until the scheduler is shut down"""
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+
+            result, error = None, None
+            try:
+                result = self._fetch_func(job.key)
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+                waiters = job.waiters
+                job.waiters = []
+
+            for waiter in waiters:
+                try:
+                    waiter.deliver(result, error)
+                except Exception as e:
+                    logger.exception("Failed to deliver fetch result: %s", e, extra={"key": job.key})
@@ -0,0 +1,129 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from threading import BoundedSemaphore, Lock
+from .tracing import tracer
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+class HttpTransport:
+    """Shared HTTP client with connection pooling, retries and a concurrency cap
+
+    All requests go through one requests.Session so TCP/TLS connections to the
+    index are reused. Throttling (429) and transient server or connection
+    errors are retried with jittered exponential backoff, honoring
+    Retry-After. A 429 also pauses every other request on the transport until
+    the server's back-off window has passed. Requests in flight, request
+    latency, retries and throttling are reported to the process tracer.
+    """
+
+    def __init__(self, max_concurrency=8, max_retries=3, backoff_base=0.5,
+                 backoff_max=30.0, timeout=5):
+        """Create the transport
+
+        Args:
+            max_concurrency (int): Maximum number of requests in flight at once
+            max_retries (int): Retries after the first attempt
+            backoff_base (float): Base delay in seconds for exponential backoff
+            backoff_max (float): Upper bound for any single delay
+            timeout (float): Default per-request timeout in seconds
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._slots = BoundedSemaphore(max_concurrency)
+        self._lock = Lock()
+        self._paused_until = 0.0
+
+        # requests takes ~100 ms to import, so it is loaded with the first transport
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._retry_errors = (requests.ConnectionError, requests.Timeout)
+        # Base class of the errors get() raises, for callers that do not import requests
+        self.request_error = requests.RequestException
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = "conda-env-detector"
+
+    def get(self, url, headers=None, timeout=None):
+        """Perform a GET request with retries
+
+        Args:
+            url (str): URL to fetch
+            headers (dict): Extra request headers
+            timeout (float): Per-attempt timeout, defaults to the transport's
+
+        Returns:
+            requests.Response: The final response; may still be a retryable
+            status if all retries were used up
+
+        Raises:
+            requests.RequestException: If the last attempt failed to connect
+        """
+        timeout = self.timeout if timeout is None else timeout
+        attempt = 0
+        while True:
+            self._wait_if_paused()
+            try:
+                with self._slots:
+                    tracer.add("http.in_flight", 1)
+                    start = time.perf_counter()
+                    try:
+                        response = self.session.get(url, headers=headers, timeout=timeout)
+                    finally:
+                        tracer.add("http.in_flight", -1)
+                        tracer.observe("http.request", time.perf_counter() - start)
+            except self._retry_errors:
+                if attempt >= self.max_retries:
+                    raise
+                tracer.count("http.retries")
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                retry_after = self._retry_after(response)
+                delay = self._backoff(attempt) if retry_after is None else min(retry_after, self.backoff_max)
+                response.close()
+                tracer.count("http.retries")
+                if response.status_code == 429:
+                    tracer.count("http.throttled")
+                    self._pause(delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    def _backoff(self, attempt):
+        """Return a full-jitter exponential backoff delay for attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, response):
+        """Parse a Retry-After header as seconds, or return None"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def _pause(self, delay):
+        """Hold back all requests on this transport for delay seconds"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def _wait_if_paused(self):
+        """Sleep until any global pause set by a 429 response has passed"""
+        with self._lock:
+            remaining = self._paused_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
@@ -0,0 +1,76 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+def read_about_summary(pkg_dir):
+    """Read the summary from an extracted conda package's info/about.json
+
+    Args:
+        pkg_dir (str): Extracted package directory in a conda package cache
+
+    Returns:
+        str: The summary, or None if the file or field is missing
+    """
+    try:
+        with open(os.path.join(pkg_dir, "info", "about.json"), "r", encoding="utf-8") as f:
+            summary = json.load(f).get("summary")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return clean_summary(summary)
+
+def clean_summary(summary):
+    """Normalize a summary from package metadata, mapping placeholders to None
+
+    Args:
+        summary (str): Raw summary text
+
+    Returns:
+        str: Single-line summary, or None if it carries no information
+    """
+    if not isinstance(summary, str):
+        return None
+    summary = " ".join(summary.split())
+    if not summary or summary.upper() == "UNKNOWN":
+        return None
+    return summary
+
+def conda_summaries(headers, pkgs_dirs, max_workers=8, memo=None):
+    """Look up summaries for conda packages in the package caches
+
+    Each record's extracted_package_dir is tried first, then
+    <pkgs_dir>/<name>-<version>-<build> in every package cache.
+
+    Args:
+        headers (list): Header dicts from CondaMetaScanner.scan
+        pkgs_dirs (list): Package cache directories
+        max_workers (int): Number of threads reading about.json files
+        memo (dict): Results of earlier lookups with the same pkgs_dirs,
+            updated in place; extracted packages do not change, so each
+            package build is read only once
+
+    Returns:
+        dict: Package name -> summary, for packages whose summary was found
+    """
+    def key(header):
+        return header.get("extracted_package_dir"), header["name"], header["version"], header["build"]
+
+    def lookup(header):
+        candidates = []
+        if header.get("extracted_package_dir"):
+            candidates.append(header["extracted_package_dir"])
+        dist = f"{header['name']}-{header['version']}-{header['build']}"
+        candidates.extend(os.path.join(pkgs_dir, dist) for pkgs_dir in pkgs_dirs)
+        for pkg_dir in candidates:
+            summary = read_about_summary(pkg_dir)
+            if summary:
+                return summary
+        return None
+
+    memo = {} if memo is None else memo
+    headers = [header for header in headers if header.get("name")]
+    missing = list({key(header): header for header in headers if key(header) not in memo}.items())
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for (header_key, _), summary in zip(missing, executor.map(lookup, [h for _, h in missing])):
+                memo[header_key] = summary
+    return {header["name"]: memo[key(header)] for header in headers if memo.get(key(header))}
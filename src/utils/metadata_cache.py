@@ -0,0 +1,227 @@
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MEMORY_BYTES = 16 * 1024 * 1024
+
+def user_cache_dir():
+    """Return the per-user cache directory for this application
+
+    CONDA_ENV_DETECTOR_CACHE_DIR overrides the platform default.
+
+    Returns:
+        str: Path to the cache directory (not created)
+    """
+    override = os.environ.get("CONDA_ENV_DETECTOR_CACHE_DIR")
+    if override:
+        return override
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "conda-env-detector")
+
+class MetadataCache:
+    """Persistent SQLite cache of package index metadata
+
+    Entries are keyed by normalized package name, hold the summary,
+    description and latest released version (all empty, with not_found set,
+    for names the index does not know), and keep the HTTP validators
+    (ETag / Last-Modified) so stale entries can be revalidated with a
+    conditional request. Once the stored bytes exceed the budget, the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        """Open (or create) the cache database
+
+        Args:
+            path (str): Database file, defaults to metadata.sqlite3 in user_cache_dir()
+            ttl (float): Seconds an entry is served without revalidation
+            max_bytes (int): Byte budget for stored entries
+        """
+        if path is None:
+            path = os.path.join(user_cache_dir(), "metadata.sqlite3")
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                name TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                description TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                version TEXT,
+                not_found INTEGER NOT NULL DEFAULT 0
+            )""")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "version" not in columns:
+            # Databases created before latest versions were cached
+            self._conn.execute("ALTER TABLE entries ADD COLUMN version TEXT")
+        if "not_found" not in columns:
+            # Databases that stored a placeholder text for unknown packages
+            self._conn.execute("ALTER TABLE entries ADD COLUMN not_found INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE entries SET summary = '', description = '', not_found = 1 "
+                               "WHERE summary = 'No description available' "
+                               "AND description = 'No description available'")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+
+    def get(self, name):
+        """Look up an entry and mark it as recently used
+
+        Args:
+            name (str): Normalized package name
+
+        Returns:
+            dict: Entry with summary, description, version, not_found, etag,
+            last_modified and fetched_at keys, or None if the name is not
+            cached. version is "" for packages without releases and None for
+            entries stored before versions were cached.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, description, etag, last_modified, fetched_at, version, not_found "
+                "FROM entries WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE name = ?",
+                               (time.time(), name))
+        return {
+            "summary": row[0],
+            "description": row[1],
+            "etag": row[2],
+            "last_modified": row[3],
+            "fetched_at": row[4],
+            "version": row[5],
+            "not_found": bool(row[6]),
+        }
+
+    def is_fresh(self, entry):
+        """Return True if entry is younger than the TTL"""
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def put(self, name, summary, description, etag=None, last_modified=None, version="",
+            not_found=False):
+        """Store or replace an entry, evicting old entries if over budget
+
+        Args:
+            name (str): Normalized package name
+            summary (str): Package summary
+            description (str): Package description
+            etag (str): ETag response header, if any
+            last_modified (str): Last-Modified response header, if any
+            version (str): Latest released version, "" if there is none
+            not_found (bool): The index does not know the package
+        """
+        size = sum(len(value.encode("utf-8"))
+                   for value in (name, summary, description, etag or "", last_modified or "", version))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (name, summary, description, etag, last_modified, "
+                "fetched_at, accessed_at, size, version, not_found) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, summary, description, etag, last_modified, now, now, size, version, int(not_found)))
+            self._evict()
+
+    def touch(self, name):
+        """Mark an entry as freshly revalidated (e.g. after a 304 response)
+
+        Args:
+            name (str): Normalized package name
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE name = ?",
+                               (now, now, name))
+
+    def total_bytes(self):
+        """Return the number of bytes currently stored"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        """Drop least recently used entries until the byte budget is met"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for name, size in self._conn.execute("SELECT name, size FROM entries ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            victims.append((name,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE name = ?", victims)
+
+class InfoLRU:
+    """In-memory LRU of package information fetched during this session
+
+    Holds (summary, description, version) tuples keyed by normalized
+    package name, bounded by the total length of the text rather than the
+    number of entries, since descriptions range from a line to hundreds of
+    kilobytes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BYTES):
+        """Create the cache
+
+        Args:
+            max_bytes (int): Approximate budget for the stored text
+        """
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def get(self, name):
+        """Return the cached tuple for a package and mark it recently used, or None"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            self._entries.move_to_end(name)
+            return entry[0]
+
+    def put(self, name, info):
+        """Store a (summary, description, version) tuple, evicting old entries
+
+        Entries larger than the whole budget are not stored.
+        """
+        size = len(name) + sum(len(value or "") for value in info)
+        with self._lock:
+            old = self._entries.pop(name, None)
+            if old is not None:
+                self._size -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[name] = (info, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,41 @@
+# Fields of an outdated-package report, in OutdatedPackage.as_record order
+OUTDATED_FIELDS = ("env_path", "name", "version", "latest", "source")
+
+class OutdatedPackage:
+    """An installed package that is behind its latest release"""
+
+    __slots__ = ("env_path", "name", "version", "latest", "source")
+
+    def __init__(self, env_path, name, version, latest, source):
+        self.env_path = env_path
+        self.name = name
+        self.version = version
+        self.latest = latest
+        self.source = source
+
+    def as_record(self):
+        """Return the package as a tuple in OUTDATED_FIELDS order"""
+        return (self.env_path, self.name, self.version, self.latest, self.source)
+
+    def __repr__(self):
+        return f"OutdatedPackage({self.name!r}, {self.version!r} < {self.latest!r}, {self.env_path!r})"
+
+def report_outdated(report, env_names, writer):
+    """Write an outdated-package report, one record per package
+
+    Args:
+        report: OutdatedPackage entries, in output order
+        env_names (dict): Environment path -> name; the path is written for
+            environments without one
+        writer (RecordWriter): Destination for records, with the fields
+            "env" followed by OUTDATED_FIELDS
+
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    for outdated in report:
+        writer.write((env_names.get(outdated.env_path, outdated.env_path),) + outdated.as_record())
+        count += 1
+    writer.flush()
+    return count
@@ -0,0 +1,95 @@
+from .versions import parse_version
+
+def diff_records(old, new):
+    """Compare two EnvPackages views of one environment
+
+    Records are deduplicated by the PackageStore, so a package changed
+    exactly when its record differs.
+
+    Args:
+        old (EnvPackages): Previous scan
+        new (EnvPackages): Current scan
+
+    Returns:
+        tuple: (added, removed, changed) sets of package names
+    """
+    old_ids = {record.name: record.id for record in old}
+    new_ids = {record.name: record.id for record in new}
+    added = new_ids.keys() - old_ids.keys()
+    removed = old_ids.keys() - new_ids.keys()
+    changed = {name for name in old_ids.keys() & new_ids.keys() if old_ids[name] != new_ids[name]}
+    return set(added), set(removed), changed
+
+class SnapshotDiff:
+    """Differences between two snapshots of package sets
+
+    added and removed hold (name, version, source) rows; upgraded,
+    downgraded and changed hold (name, old_version, new_version) rows, where
+    changed covers a new source or versions that cannot be ordered.
+    """
+
+    __slots__ = ("added", "removed", "upgraded", "downgraded", "changed")
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.upgraded = []
+        self.downgraded = []
+        self.changed = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.upgraded or self.downgraded or self.changed)
+
+    def __repr__(self):
+        return (f"SnapshotDiff(+{len(self.added)} -{len(self.removed)} ^{len(self.upgraded)} "
+                f"v{len(self.downgraded)} ~{len(self.changed)})")
+
+def diff_snapshots(old, new):
+    """Compare two snapshots by merging their name-sorted package rows
+
+    Snapshots with equal content digests are reported as identical without
+    looking at their packages.
+
+    Args:
+        old (Snapshot): Earlier snapshot, or the environment compared against
+        new (Snapshot): Later snapshot, or the environment being compared
+
+    Returns:
+        SnapshotDiff: The differences (falsy if there are none)
+    """
+    result = SnapshotDiff()
+    if old.digest == new.digest:
+        return result
+
+    a, b = old.packages, new.packages
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i][0] == b[j][0]:
+            if a[i] != b[j]:
+                _classify_change(result, a[i], b[j])
+            i += 1
+            j += 1
+        elif a[i][0] < b[j][0]:
+            result.removed.append(a[i])
+            i += 1
+        else:
+            result.added.append(b[j])
+            j += 1
+    result.removed.extend(a[i:])
+    result.added.extend(b[j:])
+    return result
+
+def _classify_change(result, old_row, new_row):
+    """File a package present in both snapshots under the right kind of change"""
+    name, old_version, old_source = old_row
+    _, new_version, new_source = new_row
+    change = (name, old_version, new_version)
+    if old_source == new_source:
+        try:
+            old_order, new_order = parse_version(old_version), parse_version(new_version)
+        except Exception:
+            old_order = new_order = None
+        if old_order is not None and new_order is not None and old_order != new_order:
+            (result.upgraded if new_order > old_order else result.downgraded).append(change)
+            return
+    result.changed.append(change)
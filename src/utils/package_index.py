@@ -0,0 +1,263 @@
+import json
+import os
+import re
+from bisect import bisect_left
+from threading import Lock
+from .metadata_cache import user_cache_dir
+from .package_names import normalize_name
+from .versions import OPERATORS, compare_versions
+
+_QUERY_RE = re.compile(r"^\s*([^\s=!<>]+)\s*(" + "|".join(re.escape(op) for op in OPERATORS) + r")\s*(\S+)\s*$")
+
+def _trigrams(text):
+    """Return the set of 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class SearchResult:
+    """One package installation matched by a PackageIndex query"""
+
+    __slots__ = ("name", "env_path", "version", "source", "score")
+
+    def __init__(self, name, env_path, version, source, score):
+        self.name = name
+        self.env_path = env_path
+        self.version = version
+        self.source = source
+        self.score = score
+
+class PackageIndex:
+    """Inverted index from package name to the environments that install it
+
+    Each normalized name maps to its postings, {env_path: (name, version,
+    source)}. A sorted name list supports prefix queries, and a trigram
+    index over "$name$" supports substring and fuzzy queries. Environments
+    are replaced one at a time as they are rescanned.
+    """
+
+    FUZZY_THRESHOLD = 0.4
+
+    def __init__(self):
+        self._lock = Lock()
+        self._postings = {}
+        self._env_names = {}
+        self._trigram_index = {}
+        self._sorted_names = []
+        self._sorted_dirty = False
+
+    def update_env(self, env_path, packages):
+        """Replace the postings of one environment
+
+        Args:
+            env_path (str): Path to Conda environment
+            packages (dict): Package name -> info dict from PackageManager.get_all_packages
+        """
+        with self._lock:
+            self._remove_env(env_path)
+            names = set()
+            for pkg_name, pkg_info in packages.items():
+                key = normalize_name(pkg_name)
+                postings = self._postings.get(key)
+                if postings is None:
+                    postings = self._postings[key] = {}
+                    self._add_name(key)
+                postings[env_path] = (pkg_name, pkg_info.get("version", "Unknown"),
+                                      pkg_info.get("source", ""))
+                names.add(key)
+            self._env_names[env_path] = names
+
+    def remove_env(self, env_path):
+        """Drop every posting of one environment
+
+        Args:
+            env_path (str): Path to Conda environment
+        """
+        with self._lock:
+            self._remove_env(env_path)
+
+    def environments(self):
+        """Return the environment paths currently indexed"""
+        with self._lock:
+            return list(self._env_names)
+
+    def search(self, query, limit=500):
+        """Find package installations matching a query
+
+        The query is a package name or name fragment, optionally followed by
+        a version condition, e.g. "numpy", "torch", "numpy<1.24" or
+        "scipy >= 1.10". A name fragment matches exact names first, then
+        prefixes, then substrings, then similar names by trigram overlap.
+
+        Args:
+            query (str): Search text
+            limit (int): Maximum number of results
+
+        Returns:
+            list: SearchResult objects, best matches first
+        """
+        operator = wanted = None
+        match = _QUERY_RE.match(query)
+        if match:
+            query, operator, wanted = match.groups()
+        key = normalize_name(query.strip())
+        if not key:
+            return []
+
+        with self._lock:
+            ranked = self._match_names(key, exact_only=operator is not None)
+            results = []
+            for name, score in ranked:
+                for env_path, (pkg_name, version, source) in self._postings[name].items():
+                    if operator and not self._version_matches(version, operator, wanted):
+                        continue
+                    results.append(SearchResult(pkg_name, env_path, version, source, score))
+                    if len(results) >= limit:
+                        return results
+            return results
+
+    def save(self, path=None):
+        """Persist the postings to a JSON file
+
+        Args:
+            path (str): Target file, defaults to package_index.json in user_cache_dir()
+        """
+        path = path or self.default_path()
+        with self._lock:
+            data = {env_path: {self._postings[key][env_path][0]: list(self._postings[key][env_path][1:])
+                               for key in names}
+                    for env_path, names in self._env_names.items()}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "envs": data}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None):
+        """Load an index saved with save(), or return an empty index
+
+        Args:
+            path (str): Source file, defaults to package_index.json in user_cache_dir()
+
+        Returns:
+            PackageIndex: The loaded index
+        """
+        index = cls()
+        index.restore(path)
+        return index
+
+    def restore(self, path=None):
+        """Add environments from a saved index that are not indexed yet
+
+        Environments already indexed from a live scan are kept as they are.
+
+        Args:
+            path (str): Source file, defaults to package_index.json in user_cache_dir()
+        """
+        try:
+            with open(path or self.default_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for env_path, packages in data.get("envs", {}).items():
+            with self._lock:
+                if env_path in self._env_names:
+                    continue
+            self.update_env(env_path, {name: {"version": version, "source": source}
+                                       for name, (version, source) in packages.items()})
+
+    @staticmethod
+    def default_path():
+        """Return the default location of the persisted index"""
+        return os.path.join(user_cache_dir(), "package_index.json")
+
+    def _version_matches(self, version, operator, wanted):
+        """Compare versions, treating unparseable ones as non-matching"""
+        try:
+            return compare_versions(version, operator, wanted)
+        except Exception:
+            return False
+
+    def _remove_env(self, env_path):
+        """Remove an environment's postings; the caller holds the lock"""
+        for key in self._env_names.pop(env_path, ()):
+            postings = self._postings.get(key)
+            if postings is None:
+                continue
+            postings.pop(env_path, None)
+            if not postings:
+                del self._postings[key]
+                self._drop_name(key)
+
+    def _add_name(self, key):
+        """Register a new name in the prefix and trigram structures"""
+        for trigram in _trigrams(f"${key}$"):
+            self._trigram_index.setdefault(trigram, set()).add(key)
+        self._sorted_dirty = True
+
+    def _drop_name(self, key):
+        """Remove a name from the prefix and trigram structures"""
+        for trigram in _trigrams(f"${key}$"):
+            names = self._trigram_index.get(trigram)
+            if names is not None:
+                names.discard(key)
+                if not names:
+                    del self._trigram_index[trigram]
+        self._sorted_dirty = True
+
+    def _names_with_prefix(self, prefix):
+        """Return indexed names starting with prefix, in sorted order"""
+        if self._sorted_dirty:
+            self._sorted_names = sorted(self._postings)
+            self._sorted_dirty = False
+        names = []
+        for i in range(bisect_left(self._sorted_names, prefix), len(self._sorted_names)):
+            if not self._sorted_names[i].startswith(prefix):
+                break
+            names.append(self._sorted_names[i])
+        return names
+
+    def _match_names(self, key, exact_only=False):
+        """Rank indexed names against a normalized query
+
+        Returns:
+            list: (name, score) pairs; 3 exact, 2 prefix, 1 substring, <1 fuzzy
+        """
+        ranked = {}
+        if key in self._postings:
+            ranked[key] = 3.0
+        if exact_only:
+            return list(ranked.items())
+
+        for name in self._names_with_prefix(key):
+            ranked.setdefault(name, 2.0)
+
+        query_trigrams = _trigrams(key)
+        if query_trigrams:
+            candidates = None
+            for trigram in sorted(query_trigrams, key=lambda t: len(self._trigram_index.get(t, ()))):
+                names = self._trigram_index.get(trigram, set())
+                candidates = set(names) if candidates is None else candidates & names
+                if not candidates:
+                    break
+            for name in candidates or ():
+                if key in name:
+                    ranked.setdefault(name, 1.0)
+        else:
+            for name in self._postings:
+                if key in name:
+                    ranked.setdefault(name, 1.0)
+
+        if len(ranked) < 10:
+            padded = _trigrams(f"${key}$")
+            counts = {}
+            for trigram in padded:
+                for name in self._trigram_index.get(trigram, ()):
+                    counts[name] = counts.get(name, 0) + 1
+            for name, shared in counts.items():
+                if name in ranked:
+                    continue
+                similarity = 2.0 * shared / (len(padded) + len(f"${name}$") - 2)
+                if similarity >= self.FUZZY_THRESHOLD:
+                    ranked[name] = similarity
+
+        return sorted(ranked.items(), key=lambda item: (-item[1], item[0]))
@@ -1,14 +1,99 @@
 import json
-import glob
+import logging
 import os
 import subprocess
-import requests
-from threading import Thread
+from threading import Event, Lock
 from urllib.parse import quote
+from .http_transport import HttpTransport
+from .local_summaries import clean_summary, conda_summaries
+from .metadata_cache import InfoLRU, MetadataCache
+from .outdated import OutdatedPackage
+from .conda_meta import CondaMetaScanner
+from .dependency_graph import DependencyGraph, read_requested_specs
+from .env_discovery import find_base_prefix, pkgs_dirs
+from .fetch_scheduler import (FetchScheduler, PRIORITY_BACKGROUND,
+                              PRIORITY_INTERACTIVE, PRIORITY_VISIBLE)
+from .package_names import normalize_name
+from .package_store import PackageStore
+from .site_packages import distribution_names, env_signature, scan_site_packages
+from .snapshots import Snapshot
+from .tracing import traced, tracer
+from .versions import is_older
+
+logger = logging.getLogger(__name__)
+
+PYPI_URL = "https://pypi.org/pypi"
+
+def shorten_summary(summary, width=100):
+    """Truncate a summary to fit the tree's Summary column
+
+    Args:
+        summary (str): Summary text
+        width (int): Maximum length, including the ellipsis
+
+    Returns:
+        str: The summary, truncated with "..." if longer than width
+    """
+    if len(summary) > width:
+        summary = summary[:width - 3] + "..."
+    return summary
 
 class PackageManager:
     """Manager class for package operations"""
+
+    def __init__(self, max_fetch_workers=8, index_url=PYPI_URL, cache=True, transport=None,
+                 pip_subprocess=False, package_index=None, local_summaries=True,
+                 snapshot_store=None):
+        """Create the package manager
+
+        Args:
+            max_fetch_workers (int): Maximum number of concurrent PyPI fetches
+            index_url (str): Base URL of a PyPI-compatible JSON API
+            cache: A MetadataCache, True for the default on-disk cache, or
+                False to always query the index
+            transport (HttpTransport): Shared HTTP client, created on first fetch if omitted
+            pip_subprocess (bool): List pip packages by running the environment's
+                pip instead of reading site-packages metadata
+            package_index (PackageIndex): Index updated with every scanned environment
+            local_summaries (bool): Attach summaries found in installed metadata and
+                the conda package caches to package info as "summary"
+            snapshot_store (SnapshotStore): Store recording every scanned environment
+                whose package set changed
+        """
+        self.local_summaries = local_summaries
+        self._pkgs_dirs = None
+        self._conda_summaries = {}
+        self.package_index = package_index
+        self.snapshot_store = snapshot_store
+        self.store = PackageStore()
+        self.pip_subprocess = pip_subprocess
+        self.index_url = index_url.rstrip("/")
+        self.max_fetch_workers = max_fetch_workers
+        self._transport = transport
+        self._transport_lock = Lock()
+        self.cache = None
+        if cache is True:
+            try:
+                self.cache = MetadataCache()
+            except Exception as e:
+                logger.warning("Failed to open metadata cache: %s", e)
+        elif cache:
+            self.cache = cache
+        # Everything fetched this session, so the details dialog can reuse
+        # the description pulled in by the summary fetch
+        self.info_lru = InfoLRU()
+        self.conda_meta_scanner = CondaMetaScanner()
+        self._graphs = {}
+        self.scheduler = FetchScheduler(self._fetch_pypi_info, max_workers=max_fetch_workers)
     
+    @property
+    def transport(self):
+        """The shared HttpTransport, created (and requests imported) on first use"""
+        with self._transport_lock:
+            if self._transport is None:
+                self._transport = HttpTransport(max_concurrency=self.max_fetch_workers)
+            return self._transport
+
     def get_all_packages(self, env_path):
         """Get all packages (conda and pip) in the environment
         
@@ -18,20 +103,175 @@ class PackageManager:
         Returns:
             dict: Dictionary of package information
         """
-        packages = {}
-        
-        # Get conda packages
-        conda_packages = self._get_conda_packages(env_path)
-        packages.update(conda_packages)
-        
-        # Get pip packages
-        pip_packages = self._get_pip_packages(env_path)
-        for pkg_name, pkg_info in pip_packages.items():
-            if pkg_name not in packages:  # Avoid duplicates
-                packages[pkg_name] = pkg_info
-                
-        return packages
+        with tracer.span("PackageManager.get_all_packages", env_path=env_path):
+            packages = {}
+
+            # Get conda packages
+            conda_packages = self._get_conda_packages(env_path)
+            packages.update(conda_packages)
+
+            # Get pip packages
+            pip_packages = self._get_pip_packages(env_path)
+            for pkg_name, pkg_info in pip_packages.items():
+                if pkg_name not in packages:  # Avoid duplicates
+                    packages[pkg_name] = pkg_info
+
+            if self.package_index is not None:
+                self.package_index.update_env(env_path, packages)
+            if self.snapshot_store is not None:
+                try:
+                    self.snapshot_store.record(env_path, packages)
+                except Exception as e:
+                    logger.warning("Failed to record snapshot: %s", e, extra={"env_path": env_path})
+
+            return packages
     
+    def load_env(self, env_path):
+        """Scan an environment into the shared package store
+
+        Args:
+            env_path (str): Path to Conda environment
+
+        Returns:
+            EnvPackages: Name-sorted records of the environment's packages
+        """
+        signature = env_signature(env_path)
+        return self.store.set_env(env_path, self.get_all_packages(env_path), signature)
+
+    def latest_versions(self, pkg_names, timeout=None):
+        """Look up the latest released versions of many packages at once
+
+        Lookups go through the shared fetch scheduler, so each distinct name
+        is fetched once, concurrently with the others, and answered from the
+        metadata cache while it is fresh.
+
+        Args:
+            pkg_names: Package names
+            timeout (float): Seconds to wait for the index, None to wait for all
+
+        Returns:
+            dict: Package name -> latest version, or None if unknown
+        """
+        results = self._fetch_many(pkg_names, timeout)
+        return {pkg_name: (results[normalize_name(pkg_name)] or (None, None, None))[2] or None
+                for pkg_name in pkg_names}
+
+    def fetch_summaries(self, pkg_names, timeout=None):
+        """Look up the index summaries of many packages at once, like latest_versions()
+
+        Args:
+            pkg_names: Package names
+            timeout (float): Seconds to wait for the index, None to wait for all
+
+        Returns:
+            dict: Package name -> summary, or None if it could not be fetched
+        """
+        results = self._fetch_many(pkg_names, timeout)
+        return {pkg_name: (results[normalize_name(pkg_name)] or (None,))[0] for pkg_name in pkg_names}
+
+    def _fetch_many(self, pkg_names, timeout):
+        """Fetch index information for many packages and wait for the results
+
+        Returns:
+            dict: Normalized name -> (summary, description, latest version), or
+            None for names that failed, were not fetched in time or were
+            rejected by a shut down scheduler
+        """
+        keys = {normalize_name(pkg_name) for pkg_name in pkg_names}
+        results = dict.fromkeys(keys)
+        if keys:
+            lock = Lock()
+            finished = Event()
+            remaining = len(keys)
+            group = object()
+
+            def done(key, info):
+                nonlocal remaining
+                with lock:
+                    results[key] = info
+                    remaining -= 1
+                    if not remaining:
+                        finished.set()
+
+            def deliver_for(key):
+                def deliver(result, error):
+                    # A version of None marks an error message from _fetch_pypi_info
+                    done(key, result if error is None and result[2] is not None else None)
+                return deliver
+
+            for key in keys:
+                if not self.scheduler.submit(key, deliver_for(key), group=group):
+                    # Shut down: nothing will be delivered for this key
+                    done(key, None)
+            if not finished.wait(timeout):
+                self.scheduler.cancel_group(group)
+            with lock:
+                results = dict(results)
+        return results
+
+    def outdated(self, env_paths, timeout=None):
+        """Find installed packages that are behind their latest release
+
+        Pip packages, and conda packages that install a Python distribution,
+        are compared with the latest version on the package index; other
+        conda packages have no index entry to compare with and are skipped.
+        Environments not yet in the package store are scanned first.
+
+        Args:
+            env_paths: Paths to Conda environments
+            timeout (float): Seconds to wait for the index, None to wait for all
+
+        Returns:
+            list: OutdatedPackage objects, in environment and name order
+        """
+        installed = []
+        for env_path in env_paths:
+            records = self.store.env(env_path) or self.load_env(env_path)
+            distributions = {normalize_name(name) for name in distribution_names(env_path)}
+            installed.extend((env_path, record) for record in records
+                             if record.source == "pip" or normalize_name(record.name) in distributions)
+
+        latest = self.latest_versions({record.name for _, record in installed}, timeout)
+        results = []
+        for env_path, record in installed:
+            version = latest.get(record.name)
+            if version and record.version != "Unknown" and is_older(record.version, version):
+                results.append(OutdatedPackage(env_path, record.name, record.version, version, record.source))
+        return results
+
+    def snapshot(self, env_path):
+        """Capture the current package set of an environment
+
+        Args:
+            env_path (str): Path to Conda environment
+
+        Returns:
+            Snapshot: Live snapshot, comparable with stored ones via diff_snapshots
+        """
+        return Snapshot.from_packages(env_path, self.get_all_packages(env_path))
+
+    def dependency_graph(self, env_path):
+        """Return the dependency graph of an environment's conda packages
+
+        The graph is rebuilt only when the environment's conda-meta records
+        have changed since it was last built.
+
+        Args:
+            env_path (str): Path to Conda environment
+
+        Returns:
+            DependencyGraph: Graph with memoized queries
+        """
+        headers = self.conda_meta_scanner.scan(env_path)
+        generation = self.conda_meta_scanner.generation(env_path)
+        cached = self._graphs.get(env_path)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        graph = DependencyGraph(headers, read_requested_specs(env_path))
+        self._graphs[env_path] = (generation, graph)
+        return graph
+
+    @traced("PackageManager._get_conda_packages")
     def _get_conda_packages(self, env_path):
         """Get conda-installed packages
         
@@ -42,23 +282,65 @@ class PackageManager:
             dict: Dictionary of conda package information
         """
         packages = {}
-        meta_dir = os.path.join(env_path, "conda-meta")
+        headers = self.conda_meta_scanner.scan(env_path)
+        summaries = (conda_summaries(headers, self._get_pkgs_dirs(), memo=self._conda_summaries)
+                     if self.local_summaries else {})
         
-        if os.path.exists(meta_dir):
-            for json_file in glob.glob(os.path.join(meta_dir, "*.json")):
-                try:
-                    with open(json_file, "r", encoding='utf-8') as f:
-                        data = json.load(f)
-                        packages[data["name"]] = {
-                            "version": data.get("version", "Unknown")
-                        }
-                except Exception as e:
-                    print(f"Failed to load conda package: {str(e)}")
+        for header in headers:
+            if header["name"]:
+                packages[header["name"]] = {
+                    "version": header["version"] or "Unknown",
+                    "build": header["build"],
+                    "channel": header["channel"],
+                    "source": "conda"
+                }
+                if header["name"] in summaries:
+                    packages[header["name"]]["summary"] = summaries[header["name"]]
                     
         return packages
+
+    def _get_pkgs_dirs(self):
+        """Return the conda package cache directories, located on first use"""
+        if self._pkgs_dirs is None:
+            self._pkgs_dirs = pkgs_dirs(find_base_prefix())
+        return self._pkgs_dirs
     
+    @traced("PackageManager._get_pip_packages")
     def _get_pip_packages(self, env_path):
         """Get pip-installed packages
+
+        Reads dist-info/egg-info metadata from the environment's
+        site-packages, unless the manager was created with
+        pip_subprocess=True.
+        
+        Args:
+            env_path (str): Path to Conda environment
+            
+        Returns:
+            dict: Dictionary of pip package information
+        """
+        if self.pip_subprocess:
+            return self._get_pip_packages_subprocess(env_path)
+
+        packages = {}
+        
+        try:
+            fields = ("Name", "Version", "Summary") if self.local_summaries else ("Name", "Version")
+            for pkg_name, headers in scan_site_packages(env_path, fields).items():
+                packages[pkg_name] = {
+                    "version": headers.get("Version") or "Unknown",
+                    "source": "pip"
+                }
+                summary = clean_summary(headers.get("Summary"))
+                if summary:
+                    packages[pkg_name]["summary"] = summary
+        except Exception as e:
+            logger.warning("Failed to load pip packages: %s", e, extra={"env_path": env_path})
+            
+        return packages
+
+    def _get_pip_packages_subprocess(self, env_path):
+        """Get pip-installed packages by running pip list in the environment
         
         Args:
             env_path (str): Path to Conda environment
@@ -82,111 +364,230 @@ class PackageManager:
                 
                 for pkg in pip_packages:
                     packages[pkg["name"]] = {
-                        "version": pkg.get("version", "Unknown")
+                        "version": pkg.get("version", "Unknown"),
+                        "source": "pip"
                     }
         except Exception as e:
-            print(f"Failed to load pip packages: {str(e)}")
+            logger.warning("Failed to load pip packages: %s", e, extra={"env_path": env_path})
             
         return packages
     
-    def load_package_summary_async(self, pkg_name, item_id, callback):
+    def load_package_summary_async(self, pkg_name, item_id, callback,
+                                   group=None, priority=PRIORITY_BACKGROUND):
         """Asynchronously load package summary
-        
+
+        Requests are queued on a shared worker pool; concurrent requests for
+        the same package are served by a single fetch.
+
         Args:
             pkg_name (str): Package name
             item_id: ID for the tree item to update
-            callback: Callback function to update UI
+            callback: Callback function to update UI, called as
+                callback(item_id, summary, failed)
+            group: Optional group (e.g. environment path) for cancel_pending()
+            priority (int): Scheduling priority, lower runs first
         """
-        thread = Thread(target=self._fetch_summary_async,
-                       args=(pkg_name, item_id, callback))
-        thread.daemon = True
-        thread.start()
-    
-    def _fetch_summary_async(self, pkg_name, item_id, callback):
-        """Fetch package summary from PyPI
-        
+        def deliver(result, error):
+            self._deliver_summary(item_id, callback, result, error)
+
+        self.scheduler.submit(normalize_name(pkg_name), deliver,
+                              token=item_id, group=group, priority=priority)
+
+    def _deliver_summary(self, item_id, callback, result, error):
+        """Pass a fetched summary to the UI callback
+
+        failed is True when the summary is an error message rather than
+        the package's summary, so it can be shown without being kept.
+
         Args:
-            pkg_name (str): Package name
             item_id: ID for the tree item to update
             callback: Callback function to update UI
+            result (tuple): (summary, description, version) from _fetch_pypi_info
+            error (Exception): Exception raised by the fetch, if any
         """
-        try:
-            summary, _ = self._fetch_pypi_info(pkg_name)
-            if len(summary) > 100:
-                summary = summary[:97] + "..."
-            callback(item_id, summary)
-        except Exception as e:
-            print(f"Failed to fetch summary: {str(e)}")
-            callback(item_id, "Failed to fetch summary")
-    
+        if error is not None:
+            logger.warning("Failed to fetch summary: %s", error, extra={"item_id": item_id})
+            callback(item_id, "Failed to fetch summary", True)
+            return
+        summary, _, version = result
+        callback(item_id, shorten_summary(summary), version is None)
+
     def load_package_info_async(self, pkg_name, callback):
         """Asynchronously load package information
-        
+
+        Information already fetched this session, e.g. by a summary fetch,
+        is passed to the callback at once instead of being queued.
+
         Args:
             pkg_name (str): Package name
             callback: Callback function to update UI
         """
-        thread = Thread(target=self._fetch_info_async,
-                       args=(pkg_name, callback))
-        thread.daemon = True
-        thread.start()
-    
-    def _fetch_info_async(self, pkg_name, callback):
-        """Fetch package information from PyPI
-        
+        info = self.info_lru.get(normalize_name(pkg_name))
+        if info is not None:
+            # Kept apart from pypi.cache_hits, which counts MetadataCache lookups
+            tracer.count("info_lru.hits")
+            callback(info[0], info[1])
+            return
+
+        def deliver(result, error):
+            if error is not None:
+                logger.warning("Failed to fetch package info: %s", error, extra={"package": pkg_name})
+                callback("Error fetching information", str(error))
+                return
+            summary, description, _ = result
+            callback(summary, description)
+
+        self.scheduler.submit(normalize_name(pkg_name), deliver,
+                              priority=PRIORITY_INTERACTIVE)
+
+    def prioritize_items(self, item_ids):
+        """Move pending summary fetches for the given tree items to the front
+
         Args:
-            pkg_name (str): Package name
-            callback: Callback function to update UI
+            item_ids: Tree item IDs currently visible to the user
         """
-        try:
-            summary, description = self._fetch_pypi_info(pkg_name)
-            callback(summary, description)
-        except Exception as e:
-            print(f"Failed to fetch package info: {str(e)}")
-            callback("Error fetching information", str(e))
-    
+        self.scheduler.prioritize(item_ids, PRIORITY_VISIBLE)
+
+    def cancel_items(self, item_ids):
+        """Cancel pending summary fetches for specific tree items
+
+        Args:
+            item_ids: Tree item IDs passed to load_package_summary_async
+        """
+        self.scheduler.cancel_tokens(item_ids)
+
+    def cancel_pending(self, group):
+        """Cancel pending summary fetches submitted with the given group
+
+        Args:
+            group: Group passed to load_package_summary_async
+        """
+        self.scheduler.cancel_group(group)
+
+    def shutdown(self):
+        """Cancel all pending fetches, stop the worker pool and close connections"""
+        self.scheduler.shutdown()
+        if self._transport is not None:
+            self._transport.close()
+
+    @traced("PackageManager._fetch_pypi_info")
     def _fetch_pypi_info(self, pkg_name):
         """Get package information from PyPI
+
+        Fresh cache entries are returned without touching the network; stale
+        ones are revalidated with a conditional request and served as-is if
+        the index cannot be reached.
         
         Args:
             pkg_name (str): Package name
             
         Returns:
-            tuple: (summary, description)
+            tuple: (summary, description, latest version); the version is ""
+            if the index has no releases and None if it could not be fetched,
+            and all three are "" if the index does not know the package
         """
+        key = normalize_name(pkg_name)
+        entry = self._cache_get(key)
+        # Entries cached before latest versions were stored need a full fetch
+        complete = entry is not None and entry["version"] is not None
+        if complete and self.cache.is_fresh(entry):
+            tracer.count("pypi.cache_hits")
+            return self._remember_info(key, (entry["summary"], entry["description"], entry["version"]))
+
+        headers = {}
+        if complete:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
         try:
-            url = f"https://pypi.org/pypi/{quote(pkg_name)}/json"
-            response = requests.get(url, timeout=5)
+            url = f"{self.index_url}/{quote(key)}/json"
+            response = self.transport.get(url, headers=headers)
             
-            if response.status_code == 200:
+            if response.status_code == 304 and complete:
+                self._cache_call("touch", key)
+                tracer.count("pypi.revalidated")
+                return self._remember_info(key, (entry["summary"], entry["description"], entry["version"]))
+            elif response.status_code == 200:
                 data = response.json()
-                info = data.get("info", {})
-                
-                description = info.get("description", "")
-                summary = info.get("summary", "")
-                
-                # Build summary
-                summary_text = summary if summary else "No summary provided by PyPI"
-                
-                # Build detailed description
-                desc_parts = []
-                if description:
-                    desc_parts.append(description)
-                
-                # Add project links
-                project_url = info.get("project_url") or info.get("home_page")
-                if project_url:
-                    desc_parts.append(f"\nProject Homepage: {project_url}")
-                
-                desc_text = "\n\n".join(desc_parts) if desc_parts else "No detailed description provided by PyPI"
-                
-                return summary_text, desc_text
+                summary_text, desc_text = self._parse_pypi_info(data)
+                version = data.get("info", {}).get("version") or ""
+            elif response.status_code == 404:
+                # Remember misses too, conda-only packages are never on PyPI
+                summary_text = desc_text = version = ""
             else:
+                tracer.count("pypi.errors")
                 error_msg = "No description available"
-                return error_msg, error_msg
-        except requests.RequestException:
+                return error_msg, error_msg, None
+
+            tracer.count("pypi.downloads")
+            self._cache_call("put", key, summary_text, desc_text,
+                             response.headers.get("ETag"), response.headers.get("Last-Modified"), version,
+                             response.status_code == 404)
+            return self._remember_info(key, (summary_text, desc_text, version))
+        except self.transport.request_error:
+            tracer.count("pypi.errors")
+            if entry is not None:
+                return entry["summary"], entry["description"], entry["version"]
             error_msg = "Network error, unable to fetch information from PyPI"
-            return error_msg, error_msg
+            return error_msg, error_msg, None
         except Exception as e:
+            tracer.count("pypi.errors")
             error_msg = f"Error fetching PyPI information: {str(e)}"
-            return error_msg, error_msg
\ No newline at end of file
+            return error_msg, error_msg, None
+
+    def _remember_info(self, key, info):
+        """Keep fetched information in the in-memory LRU and return it"""
+        self.info_lru.put(key, info)
+        return info
+
+    def _parse_pypi_info(self, data):
+        """Build summary and description text from a PyPI JSON document
+
+        Args:
+            data (dict): Decoded /pypi/<name>/json response
+
+        Returns:
+            tuple: (summary, description)
+        """
+        info = data.get("info", {})
+        
+        description = info.get("description", "")
+        summary = info.get("summary", "")
+        
+        # Build summary
+        summary_text = summary if summary else "No summary provided by PyPI"
+        
+        # Build detailed description
+        desc_parts = []
+        if description:
+            desc_parts.append(description)
+        
+        # Add project links
+        project_url = info.get("project_url") or info.get("home_page")
+        if project_url:
+            desc_parts.append(f"\nProject Homepage: {project_url}")
+        
+        desc_text = "\n\n".join(desc_parts) if desc_parts else "No detailed description provided by PyPI"
+        
+        return summary_text, desc_text
+
+    def _cache_get(self, key):
+        """Read a cache entry, treating cache failures as a miss"""
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except Exception as e:
+            logger.warning("Failed to read metadata cache: %s", e, extra={"package": key})
+            return None
+
+    def _cache_call(self, method, *args):
+        """Call a cache write method, ignoring cache failures"""
+        if self.cache is None:
+            return
+        try:
+            getattr(self.cache, method)(*args)
+        except Exception as e:
+            logger.warning("Failed to update metadata cache: %s", e)
@@ -0,0 +1,17 @@
+import re
+
+_NORMALIZE_RE = re.compile(r"[-_.]+")
+
+def normalize_name(pkg_name):
+    """Normalize a package name so that equivalent spellings compare equal
+
+    Follows PEP 503: runs of "-", "_" and "." collapse to a single "-" and
+    the result is lower-cased, so "Foo_Bar" and "foo-bar" share one key.
+
+    Args:
+        pkg_name (str): Package name as reported by conda or pip
+
+    Returns:
+        str: Normalized package name
+    """
+    return _NORMALIZE_RE.sub("-", pkg_name).lower()
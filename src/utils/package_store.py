@@ -0,0 +1,224 @@
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import deque
+from threading import Lock
+
+class PackageRecord:
+    """One distinct (name, version, build, channel, source) combination
+
+    Records are shared by every environment that installs the same build,
+    and their strings are interned in the owning PackageStore.
+    """
+
+    __slots__ = ("id", "name", "version", "build", "channel", "source")
+
+    def __init__(self, record_id, name, version, build, channel, source):
+        self.id = record_id
+        self.name = name
+        self.version = version
+        self.build = build
+        self.channel = channel
+        self.source = source
+
+    def __repr__(self):
+        return f"PackageRecord({self.name!r}, {self.version!r}, source={self.source!r})"
+
+class EnvPackages:
+    """Read-only, name-sorted view of one environment's records
+
+    Backed by a compact array of record ids; a rescan produces a new view
+    rather than modifying an existing one. The records stay valid for as
+    long as the view is referenced.
+    """
+
+    __slots__ = ("store", "ids", "_keys", "__weakref__")
+
+    def __init__(self, store, ids):
+        self.store = store
+        self.ids = ids
+        self._keys = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.record(record_id) for record_id in self.ids[index]]
+        return self.store.record(self.ids[index])
+
+    def __iter__(self):
+        record = self.store.record
+        return (record(record_id) for record_id in self.ids)
+
+    def find(self, name):
+        """Return the record for a package name, or None"""
+        if self._keys is None:
+            self._keys = [_sort_key(record.name) for record in self]
+        index = bisect_left(self._keys, _sort_key(name))
+        if index < len(self.ids):
+            record = self[index]
+            if record.name == name:
+                return record
+        return None
+
+    def by_name(self):
+        """Return a dict of package name -> record"""
+        return {record.name: record for record in self}
+
+def _sort_key(name):
+    """Order package rows case-insensitively, ties broken by exact name"""
+    return (name.lower(), name)
+
+class PackageStore:
+    """Central, deduplicated store of the packages of every scanned environment
+
+    Names, versions, builds and channels are interned once; identical
+    package builds across environments share one PackageRecord; and each
+    environment is an array of record ids sorted by package name. Summaries
+    are kept per package name, so one fetched in any environment is visible
+    in all of them.
+
+    Records are reference counted by the views using them. When a view is
+    garbage collected its ids are queued, and on the next update records no
+    view uses any more are dropped and their slots reused, so rescanning an
+    environment does not grow the store.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._strings = {}
+        self._records = []
+        self._refcounts = []
+        self._free = []
+        self._released = deque()
+        self._record_ids = {}
+        self._envs = {}
+        self._signatures = {}
+        self._summaries = {}
+
+    def intern(self, value):
+        """Return the store's shared copy of a string"""
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def set_env(self, env_path, packages, signature=None):
+        """Store an environment's packages, replacing any previous scan
+
+        Args:
+            env_path (str): Path to Conda environment
+            packages (dict): Package name -> info dict from PackageManager.get_all_packages
+            signature (tuple): env_signature() taken before the scan, if known
+
+        Returns:
+            EnvPackages: View of the stored environment
+        """
+        with self._lock:
+            ids = []
+            for pkg_name, pkg_info in packages.items():
+                ids.append(self._add_record(pkg_name, pkg_info))
+                summary = pkg_info.get("summary")
+                if summary and pkg_name not in self._summaries:
+                    self._summaries[self.intern(pkg_name)] = summary
+            ids.sort(key=lambda record_id: _sort_key(self._records[record_id].name))
+            view = self._new_view(array("I", ids))
+            self._envs[self.intern(env_path)] = view
+            self._signatures[env_path] = signature
+            self._collect()
+            return view
+
+    def env(self, env_path):
+        """Return the stored view of an environment, or None if not scanned"""
+        return self._envs.get(env_path)
+
+    def signature(self, env_path):
+        """Return the env_signature() the stored scan was taken at, or None"""
+        return self._signatures.get(env_path)
+
+    def remove_env(self, env_path):
+        """Forget an environment"""
+        with self._lock:
+            self._envs.pop(env_path, None)
+            self._signatures.pop(env_path, None)
+            self._collect()
+
+    def environments(self):
+        """Return the stored environment paths"""
+        return list(self._envs)
+
+    def record(self, record_id):
+        """Return the PackageRecord with the given id"""
+        return self._records[record_id]
+
+    def summary(self, pkg_name):
+        """Return the known summary of a package, or None"""
+        return self._summaries.get(pkg_name)
+
+    def set_summary(self, pkg_name, summary):
+        """Remember a package's summary for every environment"""
+        self._summaries[self.intern(pkg_name)] = summary
+
+    def stats(self):
+        """Return counts describing the store's contents"""
+        with self._lock:
+            self._collect()
+            return {
+                "environments": len(self._envs),
+                "rows": sum(len(view) for view in self._envs.values()),
+                "records": len(self._records) - len(self._free),
+                "strings": len(self._strings),
+                "summaries": len(self._summaries),
+            }
+
+    def _add_record(self, pkg_name, pkg_info):
+        """Return the id of the record for a package, creating it if needed"""
+        key = (pkg_name, pkg_info.get("version", "Unknown"), pkg_info.get("build"),
+               pkg_info.get("channel"), pkg_info.get("source"))
+        record_id = self._record_ids.get(key)
+        if record_id is None:
+            interned = tuple(self.intern(value) for value in key)
+            if self._free:
+                record_id = self._free.pop()
+                self._records[record_id] = PackageRecord(record_id, *interned)
+            else:
+                record_id = len(self._records)
+                self._records.append(PackageRecord(record_id, *interned))
+                self._refcounts.append(0)
+            self._record_ids[interned] = record_id
+        return record_id
+
+    def _new_view(self, ids):
+        """Return a view of ids holding a reference to each of their records"""
+        for record_id in ids:
+            self._refcounts[record_id] += 1
+        view = EnvPackages(self, ids)
+        # Views may be collected while the lock is held, so the finalizer
+        # only queues the ids for the next _collect
+        weakref.finalize(view, self._released.append, ids)
+        return view
+
+    def _collect(self):
+        """Drop records no view uses any more; the caller holds the lock"""
+        freed = False
+        while self._released:
+            for record_id in self._released.popleft():
+                self._refcounts[record_id] -= 1
+                if self._refcounts[record_id] == 0:
+                    record = self._records[record_id]
+                    del self._record_ids[(record.name, record.version, record.build,
+                                          record.channel, record.source)]
+                    self._records[record_id] = None
+                    self._free.append(record_id)
+                    freed = True
+        if freed:
+            # Keep only the strings still used by records, paths and summaries
+            live = {}
+            for record in self._records:
+                if record is not None:
+                    for value in (record.name, record.version, record.build, record.channel, record.source):
+                        if value is not None:
+                            live[value] = value
+            live.update((value, value) for value in self._envs)
+            live.update((value, value) for value in self._summaries)
+            self._strings = live
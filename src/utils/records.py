@@ -0,0 +1,31 @@
+import csv
+import json
+
+class RecordWriter:
+    """Writes package records to a stream as NDJSON or CSV"""
+
+    def __init__(self, stream, fmt, fields):
+        """Create the writer
+
+        Args:
+            stream: Text stream to write to
+            fmt (str): "ndjson" or "csv"
+            fields (tuple): Field names, in record order
+        """
+        self.stream = stream
+        self.fmt = fmt
+        self.fields = fields
+        if fmt == "csv":
+            self._csv = csv.writer(stream)
+            self._csv.writerow(fields)
+
+    def write(self, record):
+        """Write one record, a tuple in field order"""
+        if self.fmt == "csv":
+            self._csv.writerow(record)
+        else:
+            self.stream.write(json.dumps(dict(zip(self.fields, record))) + "\n")
+
+    def flush(self):
+        """Flush the underlying stream so consumers see records immediately"""
+        self.stream.flush()
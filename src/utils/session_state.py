@@ -0,0 +1,101 @@
+import json
+import os
+import zlib
+from .metadata_cache import user_cache_dir
+
+# Version 1 files could hold fetch error messages in place of summaries
+STATE_VERSION = 2
+
+def default_session_path():
+    """Return the default location of the session state file"""
+    return os.path.join(user_cache_dir(), "session_state.json.z")
+
+def save_session(environments, store, path=None):
+    """Save the environment list and package tables for the next launch
+
+    Records shared between environments are written once, and each
+    environment's table is a list of indices into them. The JSON is
+    zlib-compressed and replaced atomically.
+
+    Args:
+        environments: (env_path, env_name) pairs in display order
+        store (PackageStore): Store holding the scanned package tables
+        path (str): Target file, defaults to default_session_path()
+    """
+    path = path or default_session_path()
+    records = []
+    record_index = {}
+    tables = {}
+    signatures = {}
+    for env_path, _ in environments:
+        view = store.env(env_path)
+        if view is None:
+            continue
+        signature = store.signature(env_path)
+        if signature is not None:
+            signatures[env_path] = list(signature)
+        table = []
+        for record_id in view.ids:
+            index = record_index.get(record_id)
+            if index is None:
+                record = store.record(record_id)
+                index = record_index[record_id] = len(records)
+                records.append([record.name, record.version, record.build, record.channel, record.source])
+            table.append(index)
+        tables[env_path] = table
+
+    summaries = {}
+    for name, _, _, _, _ in records:
+        summary = store.summary(name)
+        if summary is not None:
+            summaries[name] = summary
+
+    data = {
+        "version": STATE_VERSION,
+        "environments": [list(env) for env in environments],
+        "records": records,
+        "tables": tables,
+        "signatures": signatures,
+        "summaries": summaries,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8")))
+    os.replace(tmp_path, path)
+
+def load_session(path=None):
+    """Load a session saved with save_session()
+
+    Args:
+        path (str): Source file, defaults to default_session_path()
+
+    Returns:
+        dict: "environments" as (env_path, env_name) tuples, "packages" as
+        env_path -> {name: info dict} in PackageManager.get_all_packages
+        form, "signatures" as env_path -> env_signature() of the saved scan,
+        and "summaries" as name -> summary; None if there is no usable state
+    """
+    try:
+        with open(path or default_session_path(), "rb") as f:
+            data = json.loads(zlib.decompress(f.read()))
+    except (OSError, ValueError, zlib.error):
+        return None
+    try:
+        if data.get("version") != STATE_VERSION:
+            return None
+        infos = [{"version": version, "build": build, "channel": channel, "source": source}
+                 for _, version, build, channel, source in data["records"]]
+        names = [record[0] for record in data["records"]]
+        packages = {env_path: {names[index]: infos[index] for index in table}
+                    for env_path, table in data["tables"].items()}
+        return {
+            "environments": [(env_path, env_name) for env_path, env_name in data["environments"]],
+            "packages": packages,
+            "signatures": {env_path: tuple(signature)
+                           for env_path, signature in data.get("signatures", {}).items()},
+            "summaries": dict(data["summaries"]),
+        }
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        # Valid JSON in the wrong shape, e.g. written by another version
+        return None
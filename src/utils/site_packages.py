@@ -0,0 +1,139 @@
+import glob
+import os
+import re
+
+_PYTHON_DIR_RE = re.compile(r"python(\d+)\.(\d+)")
+
+def _python_version(site_dir):
+    """Return the (major, minor) of a lib/pythonX.Y/site-packages path, (0, 0) if unknown"""
+    match = _PYTHON_DIR_RE.match(os.path.basename(os.path.dirname(site_dir)))
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+def find_site_packages(env_path):
+    """Find the site-packages directories of an environment
+
+    Args:
+        env_path (str): Path to Conda environment
+
+    Returns:
+        list: Existing site-packages directories, newest Python first
+    """
+    if os.name == "nt":
+        candidates = [os.path.join(env_path, "Lib", "site-packages")]
+    else:
+        candidates = sorted(glob.glob(os.path.join(env_path, "lib", "python*", "site-packages")),
+                            key=lambda path: (_python_version(path), path), reverse=True)
+    return [path for path in candidates if os.path.isdir(path)]
+
+def env_signature(env_path):
+    """Return the mtimes of an environment's conda-meta and site-packages directories
+
+    Installing, upgrading or removing a conda or pip package adds or removes
+    entries in at least one of them, so an unchanged signature means the
+    environment does not need rescanning.
+
+    Args:
+        env_path (str): Path to Conda environment
+
+    Returns:
+        tuple: mtime_ns of each directory, None for ones that do not exist
+    """
+    signature = []
+    for path in [os.path.join(env_path, "conda-meta")] + find_site_packages(env_path):
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def read_metadata_headers(path, fields=("Name", "Version")):
+    """Read selected headers from a METADATA or PKG-INFO file
+
+    Only the header block is read; the long description that follows the
+    first blank line is never loaded.
+
+    Args:
+        path (str): Path to the metadata file
+        fields (tuple): Header names to collect (first occurrence wins)
+
+    Returns:
+        dict: Mapping of the requested header names that were present
+    """
+    wanted = {field.lower(): field for field in fields}
+    headers = {}
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.strip():
+                break
+            if line[0] in " \t":
+                continue  # Continuation of a folded header
+            key, sep, value = line.partition(":")
+            field = wanted.get(key.strip().lower())
+            if sep and field and field not in headers:
+                headers[field] = value.strip()
+                if len(headers) == len(wanted):
+                    break
+    return headers
+
+def iter_distributions(site_dir):
+    """Yield the metadata file of every distribution in a site-packages directory
+
+    Args:
+        site_dir (str): site-packages directory
+
+    Yields:
+        tuple: (metadata file path, fallback name derived from the directory name)
+    """
+    try:
+        entries = list(os.scandir(site_dir))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.endswith(".dist-info"):
+            metadata = os.path.join(entry.path, "METADATA")
+        elif entry.name.endswith(".egg-info"):
+            # egg-info is either a directory holding PKG-INFO or the file itself
+            metadata = os.path.join(entry.path, "PKG-INFO") if entry.is_dir() else entry.path
+        else:
+            continue
+        yield metadata, entry.name.rsplit(".", 1)[0].split("-", 1)[0]
+
+def scan_site_packages(env_path, fields=("Name", "Version")):
+    """Collect installed distributions from an environment's site-packages
+
+    This reads the same metadata pip uses, without starting the
+    environment's interpreter.
+
+    Args:
+        env_path (str): Path to Conda environment
+        fields (tuple): Metadata headers to return for each distribution
+
+    Returns:
+        dict: Mapping of distribution name to its requested headers
+    """
+    distributions = {}
+    for site_dir in find_site_packages(env_path):
+        for metadata, fallback_name in iter_distributions(site_dir):
+            try:
+                headers = read_metadata_headers(metadata, fields)
+            except OSError:
+                continue
+            name = headers.get("Name") or fallback_name
+            if name not in distributions:
+                distributions[name] = headers
+    return distributions
+
+def distribution_names(env_path):
+    """List the distributions installed in an environment's site-packages
+
+    Names come from the .dist-info/.egg-info directory names, so no
+    metadata file is opened; use scan_site_packages for exact names.
+
+    Args:
+        env_path (str): Path to Conda environment
+
+    Returns:
+        set: Distribution names as spelled in the directory names
+    """
+    return {fallback_name for site_dir in find_site_packages(env_path)
+            for _, fallback_name in iter_distributions(site_dir)}
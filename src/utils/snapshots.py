@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from threading import Lock
+from .metadata_cache import user_cache_dir
+
+class Snapshot:
+    """An environment's package set at one point in time
+
+    packages is a tuple of (name, version, source) sorted by name, and
+    digest is a SHA-256 over exactly that content, so two snapshots hold
+    the same packages if and only if their digests are equal.
+    """
+
+    __slots__ = ("env_path", "taken_at", "digest", "packages", "snapshot_id")
+
+    def __init__(self, env_path, taken_at, digest, packages, snapshot_id=None):
+        self.env_path = env_path
+        self.taken_at = taken_at
+        self.digest = digest
+        self.packages = packages
+        self.snapshot_id = snapshot_id
+
+    @classmethod
+    def from_packages(cls, env_path, packages, taken_at=None):
+        """Capture a snapshot from PackageManager.get_all_packages output
+
+        Args:
+            env_path (str): Path to Conda environment
+            packages (dict): Package name -> info dict
+            taken_at (float): Capture time, defaults to now
+
+        Returns:
+            Snapshot: The unsaved snapshot
+        """
+        rows = tuple(sorted((name, info.get("version", "Unknown"), info.get("source", ""))
+                            for name, info in packages.items()))
+        return cls(env_path, time.time() if taken_at is None else taken_at, content_digest(rows), rows)
+
+    def __len__(self):
+        return len(self.packages)
+
+    def __repr__(self):
+        return f"Snapshot({self.env_path!r}, {len(self.packages)} packages, {self.digest[:12]})"
+
+def content_digest(rows):
+    """Return the SHA-256 hex digest of sorted (name, version, source) rows"""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update("\0".join(row).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+class SnapshotStore:
+    """Persistent SQLite store of environment snapshots
+
+    Package sets are stored once per content digest as compressed JSON, and
+    each environment keeps a timeline of (time, digest) entries. Recording
+    an environment whose digest matches its latest entry adds nothing, so
+    an unchanged environment costs one indexed lookup.
+    """
+
+    def __init__(self, path=None, blob_cache_size=256):
+        """Open (or create) the snapshot database
+
+        Args:
+            path (str): Database file, defaults to snapshots.sqlite3 in user_cache_dir()
+            blob_cache_size (int): Number of decoded package sets kept in memory
+        """
+        if path is None:
+            path = os.path.join(user_cache_dir(), "snapshots.sqlite3")
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.blob_cache_size = blob_cache_size
+        self._lock = Lock()
+        self._blobs = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            )""")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                env_path TEXT NOT NULL,
+                taken_at REAL NOT NULL,
+                digest TEXT NOT NULL REFERENCES blobs(digest)
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS snapshots_env ON snapshots(env_path, taken_at)")
+
+    def record(self, env_path, packages, taken_at=None):
+        """Save an environment's package set if it changed since the latest snapshot
+
+        Args:
+            env_path (str): Path to Conda environment
+            packages (dict): Package name -> info dict from PackageManager.get_all_packages
+            taken_at (float): Capture time, defaults to now
+
+        Returns:
+            tuple: (Snapshot, changed) where changed is False if the latest
+            snapshot already had the same content
+        """
+        snapshot = Snapshot.from_packages(env_path, packages, taken_at)
+        with self._lock:
+            latest = self._latest_row(env_path)
+            if latest is not None and latest[2] == snapshot.digest:
+                snapshot.snapshot_id, snapshot.taken_at = latest[0], latest[1]
+                return snapshot, False
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("INSERT OR IGNORE INTO blobs (digest, data) VALUES (?, ?)",
+                                   (snapshot.digest, _encode(snapshot.packages)))
+                cursor = self._conn.execute(
+                    "INSERT INTO snapshots (env_path, taken_at, digest) VALUES (?, ?, ?)",
+                    (env_path, snapshot.taken_at, snapshot.digest))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            snapshot.snapshot_id = cursor.lastrowid
+            self._remember_blob(snapshot.digest, snapshot.packages)
+        return snapshot, True
+
+    def latest(self, env_path, before=None):
+        """Return the newest snapshot of an environment
+
+        Args:
+            env_path (str): Path to Conda environment
+            before (float): Only consider snapshots taken at or before this time
+
+        Returns:
+            Snapshot: The snapshot, or None if there is none
+        """
+        with self._lock:
+            row = self._latest_row(env_path, before)
+            return self._load_row(env_path, row) if row is not None else None
+
+    def history(self, env_path, limit=50):
+        """Return an environment's snapshots, newest first
+
+        Package sets are not loaded; pass an entry's snapshot_id to load().
+
+        Args:
+            env_path (str): Path to Conda environment
+            limit (int): Maximum number of entries
+
+        Returns:
+            list: (snapshot_id, taken_at, digest) tuples
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, taken_at, digest FROM snapshots WHERE env_path = ? "
+                "ORDER BY taken_at DESC LIMIT ?", (env_path, limit)).fetchall()
+
+    def load(self, snapshot_id):
+        """Return the snapshot with the given id, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT env_path, id, taken_at, digest FROM snapshots WHERE id = ?",
+                (snapshot_id,)).fetchone()
+            return self._load_row(row[0], row[1:]) if row is not None else None
+
+    def environments(self):
+        """Return the paths of all environments with snapshots"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT env_path FROM snapshots")]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _latest_row(self, env_path, before=None):
+        """Return (id, taken_at, digest) of the newest snapshot; the caller holds the lock"""
+        if before is None:
+            return self._conn.execute(
+                "SELECT id, taken_at, digest FROM snapshots WHERE env_path = ? "
+                "ORDER BY taken_at DESC LIMIT 1", (env_path,)).fetchone()
+        return self._conn.execute(
+            "SELECT id, taken_at, digest FROM snapshots WHERE env_path = ? AND taken_at <= ? "
+            "ORDER BY taken_at DESC LIMIT 1", (env_path, before)).fetchone()
+
+    def _load_row(self, env_path, row):
+        """Build a Snapshot from (id, taken_at, digest); the caller holds the lock"""
+        snapshot_id, taken_at, digest = row
+        packages = self._blobs.get(digest)
+        if packages is None:
+            data = self._conn.execute("SELECT data FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            packages = _decode(data[0])
+            self._remember_blob(digest, packages)
+        else:
+            self._blobs.move_to_end(digest)
+        return Snapshot(env_path, taken_at, digest, packages, snapshot_id)
+
+    def _remember_blob(self, digest, packages):
+        """Keep a decoded package set in the in-memory LRU"""
+        self._blobs[digest] = packages
+        self._blobs.move_to_end(digest)
+        while len(self._blobs) > self.blob_cache_size:
+            self._blobs.popitem(last=False)
+
+def _encode(rows):
+    """Serialize sorted package rows for the blobs table"""
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode("utf-8"))
+
+def _decode(data):
+    """Inverse of _encode"""
+    return tuple(tuple(row) for row in json.loads(zlib.decompress(data)))
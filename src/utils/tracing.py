@@ -0,0 +1,214 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+TRACE_ENV = "CONDA_ENV_DETECTOR_TRACE"
+LOG_LEVEL_ENV = "CONDA_ENV_DETECTOR_LOG_LEVEL"
+
+class _NullSpan:
+    """Context manager returned by Tracer.span while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """A timed span, recorded on exit"""
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._record(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+class Tracer:
+    """Timed spans plus always-on counters, gauges and latency samples
+
+    Spans are recorded only while the tracer is enabled; disabled, span()
+    and @traced cost one attribute check. Counters, gauges and latency
+    samples are always kept, since they sit on millisecond-scale paths
+    such as PyPI fetches and feed the status bar.
+    """
+
+    def __init__(self, max_events=200000, latency_window=1000):
+        """Create a disabled tracer
+
+        Args:
+            max_events (int): Spans kept while enabled; the oldest are dropped
+            latency_window (int): Recent samples kept per latency metric
+        """
+        self.enabled = False
+        self.latency_window = latency_window
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=max_events)
+        self._threads = {}
+        self._counters = {}
+        self._gauges = {}
+        self._latencies = {}
+        self._epoch = time.perf_counter_ns()
+
+    def enable(self):
+        """Start recording spans, discarding earlier ones"""
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+            self._epoch = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans; recorded spans stay available for export"""
+        self.enabled = False
+
+    def span(self, name, **args):
+        """Return a context manager timing a block as a span named name
+
+        Args:
+            name (str): Span name, e.g. "PackageManager._fetch_pypi_info"
+            **args: JSON-serializable details shown with the span
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def count(self, name, delta=1):
+        """Add delta to a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + delta
+
+    def add(self, name, delta):
+        """Add delta to a gauge, e.g. +1/-1 around work in flight"""
+        with self._lock:
+            self._gauges[name] = self._gauges.get(name, 0) + delta
+
+    def observe(self, name, seconds):
+        """Record a latency sample"""
+        with self._lock:
+            samples = self._latencies.get(name)
+            if samples is None:
+                samples = self._latencies[name] = deque(maxlen=self.latency_window)
+            samples.append(seconds)
+
+    def counter(self, name):
+        """Return the value of a counter"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def gauge(self, name):
+        """Return the value of a gauge"""
+        with self._lock:
+            return self._gauges.get(name, 0)
+
+    def percentile(self, name, fraction=0.95):
+        """Return a percentile of the recent samples of a latency metric in seconds, or None"""
+        with self._lock:
+            samples = sorted(self._latencies.get(name, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def stats(self):
+        """Return a snapshot of all counters, gauges and p95 latencies"""
+        with self._lock:
+            names = list(self._latencies)
+            stats = {"counters": dict(self._counters), "gauges": dict(self._gauges),
+                     "spans": len(self._events), "enabled": self.enabled}
+        stats["p95_ms"] = {name: self.percentile(name) * 1000 for name in names}
+        return stats
+
+    def export_chrome_trace(self, path):
+        """Write recorded spans as Chrome trace JSON (chrome://tracing, Perfetto)
+
+        Args:
+            path (str): Target file
+
+        Returns:
+            int: Number of spans written
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            counters = dict(self._counters)
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+                 for tid, thread_name in threads.items()]
+        for name, start, duration, tid, args in events:
+            event = {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                     "ts": (start - self._epoch) / 1000, "dur": duration / 1000}
+            if args:
+                event["args"] = args
+            trace.append(event)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms",
+                       "otherData": {"counters": counters}}, f)
+        return len(events)
+
+    def _record(self, name, start, duration, args):
+        """Store a finished span"""
+        thread = threading.current_thread()
+        with self._lock:
+            if thread.ident not in self._threads:
+                self._threads[thread.ident] = thread.name
+            self._events.append((name, start, duration, thread.ident, args))
+
+# Process-wide tracer used by the instrumented code paths
+tracer = Tracer()
+
+def traced(name):
+    """Decorator recording each call of a function as a span while tracing is on
+
+    Args:
+        name (str): Span name
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+class KeyValueFormatter(logging.Formatter):
+    """Log formatter appending the fields passed with extra= as key=value pairs"""
+
+    _STANDARD = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+
+    def format(self, record):
+        line = super().format(record)
+        fields = [f"{key}={value!r}" for key, value in sorted(record.__dict__.items())
+                  if key not in self._STANDARD]
+        return f"{line} {' '.join(fields)}" if fields else line
+
+def configure_logging(level=None):
+    """Send the application's log records to stderr as structured lines
+
+    Args:
+        level (str): Level name, defaults to CONDA_ENV_DETECTOR_LOG_LEVEL or WARNING
+    """
+    level = (level or os.environ.get(LOG_LEVEL_ENV) or "WARNING").upper()
+    handler = logging.StreamHandler()
+    handler.setFormatter(KeyValueFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger = logging.getLogger("src")
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
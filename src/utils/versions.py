@@ -0,0 +1,210 @@
+import re
+from functools import lru_cache, total_ordering
+
+_COMPONENT_RE = re.compile(r"\d+|[^\d]+")
+_SEGMENT_SPLIT_RE = re.compile(r"[._-]")
+
+# Ranks of the element kinds in a parsed version; strings sort before
+# numbers as in conda's VersionOrder, with "dev" lowest and "post" highest.
+_DEV, _STRING, _NUMBER, _POST = 0, 1, 2, 3
+_ZERO = (_NUMBER, 0)
+_ZERO_SEGMENT = (_ZERO,)
+
+def _cmp_padded(a, b, pad, cmp):
+    """Compare two sequences as if the shorter were padded with pad"""
+    for i in range(max(len(a), len(b))):
+        result = cmp(a[i] if i < len(a) else pad, b[i] if i < len(b) else pad)
+        if result:
+            return result
+    return 0
+
+def _cmp_elements(a, b):
+    """Compare two (kind, value) elements"""
+    return (a > b) - (a < b)
+
+def _cmp_segments(a, b):
+    """Compare two segments element by element, padding with zeros"""
+    return _cmp_padded(a, b, _ZERO, _cmp_elements)
+
+def _parse_part(text):
+    """Split a version part into segments of (kind, value) elements"""
+    segments = []
+    for segment in _SEGMENT_SPLIT_RE.split(text) if text else ():
+        if not segment:
+            continue
+        elements = []
+        for part in _COMPONENT_RE.findall(segment):
+            if part.isdigit():
+                elements.append((_NUMBER, int(part)))
+            elif part == "dev":
+                elements.append((_DEV, part))
+            elif part == "post":
+                elements.append((_POST, part))
+            else:
+                elements.append((_STRING, part))
+        if elements[0][0] != _NUMBER:
+            elements.insert(0, _ZERO)
+        while len(elements) > 1 and elements[-1] == _ZERO:
+            elements.pop()
+        segments.append(tuple(elements))
+    while segments and segments[-1] == _ZERO_SEGMENT:
+        segments.pop()
+    return tuple(segments)
+
+@total_ordering
+class VersionOrder:
+    """Parsed version string that orders like conda's VersionOrder
+
+    The version is split into an epoch ("N!"), a main part and a local part
+    ("+..."). Each is split into "."-separated segments, and each segment
+    into runs of digits and letters. Segments that start with letters get a
+    leading 0, so "1.0rc1" sorts before "1.0". Missing segments compare as
+    zero, so "1.0" and "1.0.0" are equal.
+    """
+
+    __slots__ = ("version", "_epoch", "_main", "_local")
+
+    def __init__(self, version):
+        """Parse a version string
+
+        Args:
+            version (str): Version string
+        """
+        self.version = version
+        text = version.strip().lower()
+        epoch = 0
+        if "!" in text:
+            epoch_text, text = text.split("!", 1)
+            epoch = int(epoch_text) if epoch_text.isdigit() else 0
+        main, _, local = text.partition("+")
+        self._epoch = epoch
+        self._main = _parse_part(main)
+        self._local = _parse_part(local)
+
+    def _cmp(self, other):
+        if self._epoch != other._epoch:
+            return -1 if self._epoch < other._epoch else 1
+        result = _cmp_padded(self._main, other._main, _ZERO_SEGMENT, _cmp_segments)
+        if result or self._local == other._local:
+            return result
+        # A local version label sorts after the same version without one
+        if not self._local or not other._local:
+            return -1 if not self._local else 1
+        return _cmp_padded(self._local, other._local, _ZERO_SEGMENT, _cmp_segments)
+
+    def __eq__(self, other):
+        if not isinstance(other, VersionOrder):
+            return NotImplemented
+        return self._cmp(other) == 0
+
+    def __lt__(self, other):
+        if not isinstance(other, VersionOrder):
+            return NotImplemented
+        return self._cmp(other) < 0
+
+    def __hash__(self):
+        return hash((self._epoch, self._main, self._local))
+
+    def __repr__(self):
+        return f"VersionOrder({self.version!r})"
+
+@lru_cache(maxsize=65536)
+def parse_version(version):
+    """Parse a version string once and reuse the result
+
+    Args:
+        version (str): Version string
+
+    Returns:
+        VersionOrder: Parsed, comparable version
+    """
+    return VersionOrder(version)
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+OPERATORS = tuple(sorted(_OPERATORS, key=len, reverse=True))
+
+_PEP440_RE = re.compile(r"""
+    ^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?:[-_.]?(?P<pre_label>a|b|c|rc|alpha|beta|pre|preview)[-_.]?(?P<pre_number>[0-9]+)?)?
+    (?:-(?P<post_implicit>[0-9]+)|[-_.]?(?:post|rev|r)[-_.]?(?P<post_number>[0-9]+)?(?P<post_marker>))?
+    (?:[-_.]?dev[-_.]?(?P<dev_number>[0-9]+)?(?P<dev_marker>))?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$""", re.VERBOSE | re.IGNORECASE)
+
+_PRE_RANKS = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+
+@lru_cache(maxsize=65536)
+def parse_pep440(version):
+    """Parse a PEP 440 version into a sort key, once per distinct string
+
+    Args:
+        version (str): Version string
+
+    Returns:
+        tuple: Key ordering versions as PEP 440 does, or None if the string
+            is not a valid PEP 440 version
+    """
+    match = _PEP440_RE.match(version)
+    if match is None:
+        return None
+    release = [int(part) for part in match.group("release").split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+
+    has_post = match.group("post_implicit") is not None or match.group("post_marker") is not None
+    has_dev = match.group("dev_marker") is not None
+    if match.group("pre_label"):
+        pre = (_PRE_RANKS[match.group("pre_label").lower()], int(match.group("pre_number") or 0))
+    elif has_dev and not has_post:
+        pre = (-1,)  # 1.0.dev0 sorts before 1.0a0
+    else:
+        pre = (3,)
+    post = (int(match.group("post_implicit") or match.group("post_number") or 0),) if has_post else (-1,)
+    dev = (0, int(match.group("dev_number") or 0)) if has_dev else (1,)
+    local = tuple((1, int(part)) if part.isdigit() else (0, part.lower())
+                  for part in re.split(r"[-_.]", match.group("local"))) if match.group("local") else ()
+    return (int(match.group("epoch") or 0), tuple(release), pre, post, dev, local)
+
+@lru_cache(maxsize=65536)
+def is_older(installed, latest):
+    """Return True if installed is an older version than latest
+
+    Results are cached per (installed, latest) pair. Versions are compared
+    by PEP 440 when both are valid PEP 440 versions and by conda's ordering
+    otherwise.
+
+    Args:
+        installed (str): Installed version
+        latest (str): Latest available version
+
+    Returns:
+        bool: Whether installed is behind latest
+    """
+    installed_key, latest_key = parse_pep440(installed), parse_pep440(latest)
+    if installed_key is not None and latest_key is not None:
+        return installed_key < latest_key
+    return parse_version(installed) < parse_version(latest)
+
+def compare_versions(installed, operator, wanted):
+    """Evaluate "installed <operator> wanted"
+
+    Args:
+        installed (str): Version to test
+        operator (str): One of ==, =, !=, <, <=, >, >=
+        wanted (str): Version to compare against
+
+    Returns:
+        bool: Result of the comparison
+    """
+    return _OPERATORS[operator](parse_version(installed), parse_version(wanted))
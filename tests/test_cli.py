@@ -0,0 +1,29 @@
+import os
+import pytest
+from src.cli import main, select_environments
+
+class FakeCondaManager:
+    def __init__(self, base_prefix, envs):
+        self.base_prefix = base_prefix
+        self.envs = envs
+
+    def get_environments(self):
+        return {"base_prefix": self.base_prefix, "envs": self.envs}
+
+    def get_env_name(self, env_path):
+        return os.path.basename(env_path)
+
+def test_select_environments_normalizes_paths(tmp_path, monkeypatch):
+    base = str(tmp_path / "conda")
+    foo = os.path.join(base, "envs", "foo")
+    manager = FakeCondaManager(base, [foo, os.path.join(base, "envs", "bar")])
+    os.makedirs(foo)
+    monkeypatch.chdir(base)
+    assert select_environments(manager, ["./envs/foo/"]) == [("foo", foo)]
+    assert select_environments(manager, [foo + os.sep, "base"]) == [("base", base), ("foo", foo)]
+
+def test_summaries_with_outdated_is_rejected(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--summaries", "--outdated"])
+    assert exit_info.value.code == 2
+    assert "--summaries cannot be combined with --outdated" in capsys.readouterr().err
@@ -0,0 +1,66 @@
+import json
+import os
+from src.utils import conda_meta
+from src.utils.conda_meta import CondaMetaScanner, parse_header
+
+def record(name, version, build, **extra):
+    data = {"name": name, "version": version, "build": build, "channel": "https://conda.anaconda.org/conda-forge",
+            "depends": ["python >=3.9", "libzlib >=1.2.13,<2.0a0"], "constrains": [],
+            "files": [f"lib/{name}/file{i}.py" for i in range(3)]}
+    data.update(extra)
+    return data
+
+def test_header_is_read_from_truncated_record():
+    data = json.dumps(record("zlib", "1.3.1", "hb9d3cd8_2")).encode()
+    truncated = data[:data.index(b'"files"') + 20]
+    header = parse_header(truncated, "zlib-1.3.1-hb9d3cd8_2.json")
+    assert (header["name"], header["version"], header["build"]) == ("zlib", "1.3.1", "hb9d3cd8_2")
+    assert header["depends"] == ["python >=3.9", "libzlib >=1.2.13,<2.0a0"]
+    assert header["constrains"] == []
+
+def test_nested_fields_fall_back_to_a_full_parse():
+    # A nested "name" and "version" come first, so the byte scan picks them up
+    data = {"files": ["bin/x"], "noarch": {"name": "wrong", "version": "0"}}
+    data.update(record("numpy", "2.0.0", "py312h_0"))
+    header = parse_header(json.dumps(data).encode(), "numpy-2.0.0-py312h_0.json")
+    assert (header["name"], header["version"], header["build"]) == ("numpy", "2.0.0", "py312h_0")
+    assert header["depends"] == ["python >=3.9", "libzlib >=1.2.13,<2.0a0"]
+
+def test_escaped_values_are_decoded():
+    data = json.dumps(record("odd", "1.0", "0", channel='C:\\channels\\"local"')).encode()
+    assert parse_header(data, "odd-1.0-0.json")["channel"] == 'C:\\channels\\"local"'
+
+def write_records(env_path, records):
+    meta_dir = os.path.join(env_path, "conda-meta")
+    os.makedirs(meta_dir, exist_ok=True)
+    for data in records:
+        path = os.path.join(meta_dir, f"{data['name']}-{data['version']}-{data['build']}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+def test_unchanged_records_are_not_reparsed(tmp_path, monkeypatch):
+    env_path = str(tmp_path)
+    write_records(env_path, [record("zlib", "1.3.1", "h_0"), record("numpy", "2.0.0", "py_0")])
+    parsed = []
+    real_parse = conda_meta.parse_header
+    monkeypatch.setattr(conda_meta, "parse_header", lambda data, name: parsed.append(name) or real_parse(data, name))
+
+    scanner = CondaMetaScanner(max_workers=1)
+    assert sorted(h["name"] for h in scanner.scan(env_path)) == ["numpy", "zlib"]
+    assert len(parsed) == 2 and scanner.generation(env_path) == 1
+
+    assert len(scanner.scan(env_path)) == 2
+    assert len(parsed) == 2 and scanner.generation(env_path) == 1
+
+    path = os.path.join(env_path, "conda-meta", "zlib-1.3.1-h_0.json")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert len(scanner.scan(env_path)) == 2
+    assert parsed[2:] == ["zlib-1.3.1-h_0.json"] and scanner.generation(env_path) == 2
+
+def test_unreadable_records_are_skipped(tmp_path):
+    env_path = str(tmp_path)
+    write_records(env_path, [record("zlib", "1.3.1", "h_0")])
+    with open(os.path.join(env_path, "conda-meta", "broken-1.0-0.json"), "w") as f:
+        f.write('{"files": ["a"], "name": "other"')
+    assert [h["name"] for h in CondaMetaScanner().scan(env_path)] == ["zlib"]
@@ -0,0 +1,48 @@
+from src.utils.dependency_graph import read_requested_specs
+
+HISTORY = """\
+==> 2024-03-02 10:14:51 <==
+# cmd: /opt/conda/bin/conda create -n ml python=3.11 numpy
+# conda version: 24.1.2
++conda-forge/linux-64::numpy-1.26.4-py311h64a7726_0
++conda-forge/linux-64::python-3.11.8-hab00c5b_0_cpython
++conda-forge/noarch::pip-24.0-pyhd8ed1ab_0
+# update specs: ['python=3.11', 'numpy']
+==> 2024-03-05 16:02:10 <==
+# cmd: /opt/conda/bin/conda install -n ml conda-forge::scipy pandas>=2
+# conda version: 24.1.2
++conda-forge/linux-64::pandas-2.2.1-py311h320fe9a_0
++conda-forge/linux-64::scipy-1.12.0-py311h64a7726_2
+# update specs: ['conda-forge::scipy', 'pandas[version=\\'>=2\\']']
+==> 2024-04-11 09:30:44 <==
+# cmd: /opt/conda/bin/conda update -n ml python
+# conda version: 24.3.0
+-conda-forge/linux-64::python-3.11.8-hab00c5b_0_cpython
++conda-forge/linux-64::python-3.12.2-hab00c5b_0_cpython
+# neutered specs: ['python']
+# update specs: ['python']
+==> 2024-04-20 12:00:03 <==
+# cmd: /opt/conda/bin/conda install -n ml numpy=1.26
+# conda version: 24.3.0
+# neutered specs: ['pandas']
+# update specs: ['numpy=1.26']
+==> 2024-05-01 08:45:17 <==
+# cmd: /opt/conda/bin/conda remove -n ml scipy
+# conda version: 24.3.0
+-conda-forge/linux-64::scipy-1.12.0-py311h64a7726_2
+# remove specs: ['scipy']
+"""
+
+def write_history(tmp_path, text):
+    conda_meta = tmp_path / "conda-meta"
+    conda_meta.mkdir()
+    (conda_meta / "history").write_text(text, encoding="utf-8")
+    return str(tmp_path)
+
+def test_requested_specs_replay_history(tmp_path):
+    env_path = write_history(tmp_path, HISTORY)
+    # pandas was neutered, not removed: it is still explicitly requested
+    assert read_requested_specs(env_path) == {"python", "numpy", "pandas"}
+
+def test_requested_specs_without_history(tmp_path):
+    assert read_requested_specs(str(tmp_path)) == set()
@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("tkinter")
+
+from src.gui.widgets import DESCRIPTION_CHUNK_SIZE, DESCRIPTION_PREVIEW_SIZE, break_at
+
+def chunks(text, end, size):
+    """Split text[:end] the way PackageInfoDialog streams it"""
+    shown, parts = 0, []
+    while shown < end:
+        stop = break_at(text, shown, min(end, shown + size))
+        assert shown < stop <= min(end, shown + size)
+        parts.append(text[shown:stop])
+        shown = stop
+    return parts
+
+def test_prefers_line_breaks_then_spaces():
+    assert break_at("one two\nthree four", 0, 14) == 8
+    assert break_at("one two three four", 0, 14) == 14
+    assert break_at("one two three four", 0, 13) == 8
+    assert break_at("one\ttwo", 0, 6) == 4
+
+def test_short_text_ends_at_its_length():
+    assert break_at("short", 0, 100) == 5
+    assert break_at("exact", 0, 5) == 5
+
+def test_separator_at_chunk_start_is_not_used():
+    # Breaking there would make an empty chunk
+    assert break_at("x\nabcdef", 1, 5) == 5
+    assert break_at("x abcdef", 1, 5) == 5
+
+def test_text_without_whitespace_is_cut_at_the_limit():
+    text = "a" * (3 * DESCRIPTION_CHUNK_SIZE + 5)
+    parts = chunks(text, len(text), DESCRIPTION_CHUNK_SIZE)
+    assert [len(part) for part in parts] == [DESCRIPTION_CHUNK_SIZE] * 3 + [5]
+
+def test_multibyte_text_reassembles_exactly():
+    text = ("数据分析库" * 3000 + "\n" + "🐍é" * 4000 + " ✓") * 3
+    parts = chunks(text, len(text), DESCRIPTION_CHUNK_SIZE)
+    assert "".join(parts) == text
+    assert all(len(part) <= DESCRIPTION_CHUNK_SIZE for part in parts)
+    # The CJK run has no whitespace, so it is cut at the limit; the next
+    # chunk ends at the line break after it
+    assert len(parts[0]) == DESCRIPTION_CHUNK_SIZE
+    assert parts[1].endswith("\n")
+
+def test_preview_stops_at_a_line_break_before_the_cut():
+    line = "x" * 99 + "\n"
+    text = line * (2 * DESCRIPTION_PREVIEW_SIZE // len(line))
+    preview = break_at(text, 0, DESCRIPTION_PREVIEW_SIZE)
+    assert DESCRIPTION_PREVIEW_SIZE - len(line) < preview <= DESCRIPTION_PREVIEW_SIZE
+    assert text[preview - 1] == "\n"
+    parts = chunks(text, preview, DESCRIPTION_CHUNK_SIZE)
+    assert "".join(parts) == text[:preview]
+    assert all(part.endswith("\n") for part in parts)
+
+def test_description_under_the_preview_size_is_shown_whole():
+    text = "word " * (DESCRIPTION_PREVIEW_SIZE // 5 - 1)
+    assert break_at(text, 0, DESCRIPTION_PREVIEW_SIZE) == len(text)
@@ -0,0 +1,80 @@
+import json
+import os
+from src.utils.disk_usage import DiskUsageScanner, _disk_bytes
+
+def make_env(root, name, files):
+    """Create an environment with one conda package owning files (path -> bytes)"""
+    env_path = os.path.join(root, name)
+    os.makedirs(os.path.join(env_path, "conda-meta"))
+    for path, data in files.items():
+        full = os.path.join(env_path, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        if isinstance(data, str):
+            os.link(data, full)
+        else:
+            with open(full, "wb") as f:
+                f.write(data)
+    record = {"name": "pkg", "version": "1.0", "build": "0", "files": list(files)}
+    with open(os.path.join(env_path, "conda-meta", "pkg-1.0-0.json"), "w") as f:
+        json.dump(record, f)
+    return env_path
+
+def disk_bytes(path):
+    return _disk_bytes(os.lstat(path))
+
+def test_hardlink_between_scanned_envs_is_shared(tmp_path):
+    root = str(tmp_path)
+    a = make_env(root, "a", {"lib/shared.so": b"s" * 10000, "lib/own_a.py": b"a" * 5000})
+    shared = os.path.join(a, "lib", "shared.so")
+    b = make_env(root, "b", {"lib/shared.so": shared, "lib/own_b.py": b"b" * 3000})
+    shared_bytes = disk_bytes(shared)
+    own_a = disk_bytes(os.path.join(a, "lib", "own_a.py"))
+    own_b = disk_bytes(os.path.join(b, "lib", "own_b.py"))
+
+    scanner = DiskUsageScanner(max_workers=2)
+    try:
+        # Until b is scanned, nothing else holds a's files
+        usage_a = scanner.scan(a)
+        assert (usage_a.unique_bytes, usage_a.shared_bytes) == (own_a + shared_bytes, 0)
+
+        usage_b = scanner.scan(b)
+        assert (usage_b.unique_bytes, usage_b.shared_bytes) == (own_b, shared_bytes)
+        usage_a = scanner.cached(a)
+        assert (usage_a.unique_bytes, usage_a.shared_bytes) == (own_a, shared_bytes)
+        assert usage_a.total_bytes == own_a + shared_bytes
+        assert usage_a.packages["pkg"].unique_bytes == own_a
+        assert usage_a.packages["pkg"].shared_bytes == shared_bytes
+        assert usage_a.packages["pkg"].files == 2
+        assert scanner.combined_bytes() == own_a + own_b + shared_bytes
+
+        scanner.invalidate(b)
+        assert scanner.cached(b) is None
+        assert scanner.cached(a).unique_bytes == own_a + shared_bytes
+    finally:
+        scanner.shutdown()
+
+def test_link_outside_scanned_envs_is_unique(tmp_path):
+    # A file also linked into the pkgs cache has st_nlink > 1 but no other
+    # scanned environment holds it
+    cache = tmp_path / "pkgs"
+    cache.mkdir()
+    cached_file = cache / "module.py"
+    cached_file.write_bytes(b"m" * 8000)
+    env_path = make_env(str(tmp_path), "env", {"lib/module.py": str(cached_file)})
+    scanner = DiskUsageScanner(max_workers=1)
+    try:
+        usage = scanner.scan(env_path)
+        assert usage.shared_bytes == 0
+        assert usage.unique_bytes == disk_bytes(str(cached_file))
+    finally:
+        scanner.shutdown()
+
+def test_unchanged_rescan_reuses_the_result(tmp_path):
+    env_path = make_env(str(tmp_path), "env", {"lib/a.py": b"a" * 100})
+    scanner = DiskUsageScanner(max_workers=1)
+    try:
+        first = scanner.scan(env_path)
+        assert scanner.scan(env_path) is first
+        assert scanner.environments() == [env_path]
+    finally:
+        scanner.shutdown()
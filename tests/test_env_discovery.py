@@ -0,0 +1,50 @@
+import os
+import pytest
+from src.utils.env_discovery import discover_environments, read_condarc_paths
+
+def make_prefix(path):
+    os.makedirs(os.path.join(path, "conda-meta"))
+    with open(os.path.join(path, "conda-meta", "history"), "w") as f:
+        f.write("==> 2024-01-01 00:00:00 <==\n")
+    return str(path)
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    for name in ("CONDA_EXE", "CONDA_ROOT", "CONDA_PREFIX", "CONDA_ENVS_PATH", "CONDARC", "XDG_CONFIG_HOME"):
+        monkeypatch.delenv(name, raising=False)
+    return home
+
+def test_environments_are_discovered_from_conda_files(home, tmp_path, monkeypatch):
+    base = make_prefix(tmp_path / "miniconda3")
+    os.makedirs(os.path.join(base, "condabin"))
+    open(os.path.join(base, "condabin", "conda"), "w").close()
+    monkeypatch.setenv("CONDA_EXE", os.path.join(base, "condabin", "conda"))
+
+    in_base = make_prefix(tmp_path / "miniconda3" / "envs" / "a")
+    os.makedirs(os.path.join(base, "envs", "not-an-env"))
+    block = make_prefix(home / "block-envs" / "b")
+    flow = make_prefix(home / "flow-envs" / "c")
+    elsewhere = make_prefix(tmp_path / "projects" / "d")
+
+    (home / ".condarc").write_text("channels:\n  - conda-forge\nenvs_dirs:  # custom\n  - ~/block-envs\n"
+                                   "pkgs_dirs:\n  - ~/pkgs\n")
+    os.makedirs(home / ".config" / "conda")
+    (home / ".config" / "conda" / "condarc").write_text('envs_dirs: ["$HOME/flow-envs"]\n')
+    os.makedirs(home / ".conda")
+    (home / ".conda" / "environments.txt").write_text(
+        "\n".join([elsewhere, in_base, base, str(tmp_path / "deleted"), in_base + "/"]) + "\n")
+
+    envs_data = discover_environments()
+    assert envs_data["base_prefix"] == base
+    assert envs_data["envs"] == [elsewhere, in_base, flow, block]
+
+def test_condarc_lists_are_read(tmp_path):
+    condarc = tmp_path / ".condarc"
+    condarc.write_text("# comment\nenvs_dirs:\n  - '/opt/envs'   # shared\n  - \"/srv/envs\"\n"
+                       "envs_path: [/a, '/b']\nchannels:\n  - defaults\n")
+    assert read_condarc_paths(str(condarc), ("envs_dirs", "envs_path")) == ["/opt/envs", "/srv/envs", "/a", "/b"]
+    assert read_condarc_paths(str(tmp_path / "missing"), ("envs_dirs",)) == []
@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+from threading import Lock
+
+import pytest
+
+from src.utils import env_watcher
+from src.utils.env_watcher import EnvWatcher
+
+class Recorder:
+    """Collects watcher callbacks from the watcher thread"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.envs = []
+        self.env_lists = 0
+
+    def env_changed(self, env_path):
+        with self.lock:
+            self.envs.append(env_path)
+
+    def envs_changed(self):
+        with self.lock:
+            self.env_lists += 1
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+def make_env(root, name):
+    env_path = os.path.join(root, name)
+    os.makedirs(os.path.join(env_path, "conda-meta"))
+    os.makedirs(os.path.join(env_path, "lib", "python3.11", "site-packages"))
+    return env_path
+
+def touch(path, contents="x"):
+    with open(path, "w") as f:
+        f.write(contents)
+
+def start_watcher(tmp_path, recorder, **kwargs):
+    envs_txt = tmp_path / "environments.txt"
+    envs_txt.write_text("")
+    watcher = EnvWatcher(recorder.env_changed, recorder.envs_changed, poll_interval=0.05,
+                         debounce=0.2, environments_txt=str(envs_txt), **kwargs)
+    return watcher, envs_txt
+
+def test_polling_debounces_a_burst_of_changes(tmp_path):
+    recorder = Recorder()
+    watcher, _ = start_watcher(tmp_path, recorder, use_inotify=False)
+    env_path = make_env(str(tmp_path), "env")
+    watcher.watch(env_path)
+    watcher.start()
+    try:
+        # Changes closer together than the debounce period are reported once
+        for i in range(6):
+            touch(os.path.join(env_path, "conda-meta", f"pkg{i}-1.0-0.json"))
+            time.sleep(0.06)
+        assert wait_for(lambda: recorder.envs)
+        time.sleep(0.4)
+        assert recorder.envs == [env_path]
+
+        touch(os.path.join(env_path, "lib", "python3.11", "site-packages", "extra.pth"))
+        assert wait_for(lambda: len(recorder.envs) == 2)
+        assert recorder.env_lists == 0
+    finally:
+        watcher.stop()
+
+def test_polling_reports_environments_txt_changes(tmp_path):
+    recorder = Recorder()
+    watcher, envs_txt = start_watcher(tmp_path, recorder, use_inotify=False)
+    watcher.start()
+    try:
+        envs_txt.write_text("/opt/envs/new\n")
+        assert wait_for(lambda: recorder.env_lists == 1)
+        envs_txt.unlink()
+        assert wait_for(lambda: recorder.env_lists == 2)
+        assert recorder.envs == []
+    finally:
+        watcher.stop()
+
+def test_unwatched_environment_is_not_reported(tmp_path):
+    recorder = Recorder()
+    watcher, _ = start_watcher(tmp_path, recorder, use_inotify=False)
+    env_path = make_env(str(tmp_path), "env")
+    watcher.watch(env_path)
+    watcher.unwatch(env_path)
+    watcher.start()
+    try:
+        touch(os.path.join(env_path, "conda-meta", "pkg-1.0-0.json"))
+        time.sleep(0.5)
+        assert recorder.envs == []
+    finally:
+        watcher.stop()
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_watch_limit_falls_back_to_polling(tmp_path, monkeypatch):
+    # inotify_add_watch fails with ENOSPC once max_user_watches is reached
+    monkeypatch.setattr(env_watcher._Inotify, "add_watch", lambda self, path: None)
+    recorder = Recorder()
+    watcher, envs_txt = start_watcher(tmp_path, recorder)
+    assert watcher._inotify is not None
+    env_path = make_env(str(tmp_path), "env")
+    watcher.watch(env_path)
+    watcher.start()
+    try:
+        touch(os.path.join(env_path, "conda-meta", "pkg-1.0-0.json"))
+        assert wait_for(lambda: recorder.envs == [env_path])
+        envs_txt.write_text("/opt/envs/new\n")
+        assert wait_for(lambda: recorder.env_lists == 1)
+    finally:
+        watcher.stop()
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_stop_closes_inotify_after_the_thread_exits(tmp_path):
+    recorder = Recorder()
+    watcher, _ = start_watcher(tmp_path, recorder)
+    assert watcher._inotify is not None
+    watcher.start()
+    watcher.stop()
+    assert not watcher._thread.is_alive()
+    assert watcher._inotify is None
+
+def test_stop_without_start_releases_inotify(tmp_path):
+    watcher, _ = start_watcher(tmp_path, Recorder())
+    watcher.stop()
+    assert watcher._inotify is None
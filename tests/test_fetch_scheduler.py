@@ -0,0 +1,79 @@
+import threading
+from src.utils.fetch_scheduler import FetchScheduler, PRIORITY_INTERACTIVE
+
+class RecordingFetch:
+    """Fetch function that records calls and can hold the "blocker" key"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def __call__(self, key):
+        self.calls.append(key)
+        if key == "blocker":
+            self.started.set()
+            assert self.release.wait(5)
+        return key.upper()
+
+def collect(results, done, expected):
+    def deliver(result, error):
+        results.append((result, error))
+        if len(results) == expected:
+            done.set()
+    return deliver
+
+def test_duplicate_submits_share_one_fetch():
+    fetch = RecordingFetch()
+    scheduler = FetchScheduler(fetch, max_workers=1)
+    scheduler.submit("blocker", lambda result, error: None)
+    assert fetch.started.wait(5)
+    results, done = [], threading.Event()
+    for _ in range(3):
+        scheduler.submit("numpy", collect(results, done, 3))
+    assert scheduler.pending_count() == 2
+    fetch.release.set()
+    assert done.wait(5)
+    assert fetch.calls.count("numpy") == 1
+    assert results == [("NUMPY", None)] * 3
+    scheduler.shutdown()
+
+def test_prioritized_jobs_run_first():
+    fetch = RecordingFetch()
+    scheduler = FetchScheduler(fetch, max_workers=1)
+    scheduler.submit("blocker", lambda result, error: None)
+    assert fetch.started.wait(5)
+    results, done = [], threading.Event()
+    for key in ("a", "b", "c", "d"):
+        scheduler.submit(key, collect(results, done, 4), token=f"row-{key}")
+    scheduler.prioritize(["row-c"])
+    # A duplicate interactive request moves its job ahead of everything else
+    scheduler.submit("d", lambda result, error: None, priority=PRIORITY_INTERACTIVE)
+    fetch.release.set()
+    assert done.wait(5)
+    assert fetch.calls == ["blocker", "d", "c", "a", "b"]
+    scheduler.shutdown()
+
+def test_cancelled_jobs_never_run():
+    fetch = RecordingFetch()
+    scheduler = FetchScheduler(fetch, max_workers=1)
+    scheduler.submit("blocker", lambda result, error: None)
+    assert fetch.started.wait(5)
+    delivered, done = [], threading.Event()
+    scheduler.submit("dropped", collect(delivered, done, 1), group="env-a")
+    scheduler.submit("by-token", collect(delivered, done, 1), token="row-1")
+    scheduler.submit("kept", collect(delivered, done, 1), group="env-b")
+    scheduler.cancel_group("env-a")
+    scheduler.cancel_tokens(["row-1"])
+    fetch.release.set()
+    assert done.wait(5)
+    assert fetch.calls == ["blocker", "kept"]
+    assert delivered == [("KEPT", None)]
+    assert scheduler.pending_count() == 0
+    scheduler.shutdown()
+
+def test_submit_after_shutdown_is_rejected():
+    scheduler = FetchScheduler(lambda key: key)
+    scheduler.shutdown()
+    assert scheduler.submit("numpy", lambda result, error: None) is False
+    assert scheduler.pending_count() == 0
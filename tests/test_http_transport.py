@@ -0,0 +1,94 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.utils.http_transport import HttpTransport
+
+class ScriptedServer:
+    """Answers each path with the next (status, headers) from its script, then 200
+
+    Every request is recorded as (path, monotonic arrival time).
+    """
+
+    def __init__(self, scripts):
+        self.scripts = {path: list(script) for path, script in scripts.items()}
+        self.requests = []
+        self.throttled = threading.Event()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests.append((self.path, time.monotonic()))
+                script = server.scripts.get(self.path)
+                status, headers = script.pop(0) if script else (200, {})
+                if status == 429:
+                    server.throttled.set()
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def hits(self, path):
+        return [when for hit, when in self.requests if hit == path]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(scripts):
+        servers.append(ScriptedServer(scripts))
+        return servers[-1]
+    yield start
+    for server in servers:
+        server.close()
+
+def test_server_errors_are_retried(serve):
+    server = serve({"/flaky": [(503, {}), (502, {})]})
+    transport = HttpTransport(backoff_base=0.01)
+    assert transport.get(server.url + "/flaky").status_code == 200
+    assert len(server.hits("/flaky")) == 3
+
+def test_retry_after_pauses_every_request(serve):
+    server = serve({"/throttled": [(429, {"Retry-After": "0.4"})]})
+    transport = HttpTransport(backoff_base=0.01)
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(response=transport.get(server.url + "/throttled")))
+    worker.start()
+    assert server.throttled.wait(5)
+    time.sleep(0.1)
+    assert transport.get(server.url + "/other").status_code == 200
+    worker.join(5)
+    assert result["response"].status_code == 200
+    throttled_at = server.hits("/throttled")[0]
+    # Both the retry and the unrelated request wait out the server's back-off
+    assert server.hits("/throttled")[1] - throttled_at >= 0.35
+    assert server.hits("/other")[0] - throttled_at >= 0.35
+
+def test_last_response_is_returned_when_retries_run_out(serve):
+    server = serve({"/down": [(503, {})] * 10})
+    transport = HttpTransport(max_retries=2, backoff_base=0.01)
+    assert transport.get(server.url + "/down").status_code == 503
+    assert len(server.hits("/down")) == 3
+
+def test_connection_errors_are_raised_when_retries_run_out():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    transport = HttpTransport(max_retries=1, backoff_base=0.01)
+    with pytest.raises(transport.request_error):
+        transport.get(f"http://127.0.0.1:{port}/", timeout=1)
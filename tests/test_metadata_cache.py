@@ -0,0 +1,157 @@
+import itertools
+import json
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.utils.metadata_cache import InfoLRU, MetadataCache
+from src.utils.package_manager import PackageManager
+from src.utils.tracing import tracer
+
+class StubIndex:
+    """Local stand-in for the PyPI JSON API that honors If-None-Match
+
+    packages maps a name to (summary, version, etag); names not in it are
+    answered with 404. Every request is recorded as (name, If-None-Match).
+    """
+
+    def __init__(self):
+        self.packages = {}
+        self.requests = []
+        index = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                name = self.path.strip("/").split("/")[1]
+                etag = self.headers.get("If-None-Match")
+                index.requests.append((name, etag))
+                if name not in index.packages:
+                    self._send(404)
+                    return
+                summary, version, current = index.packages[name]
+                if etag == current:
+                    self._send(304, headers={"ETag": current})
+                    return
+                self._send(200, {"info": {"name": name, "summary": summary, "version": version,
+                                          "description": f"About {name}"}}, {"ETag": current})
+
+            def _send(self, status, payload=None, headers=None):
+                body = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for header, value in (headers or {}).items():
+                    self.send_header(header, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/pypi"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def index():
+    index = StubIndex()
+    yield index
+    index.close()
+
+def fetch(index, cache, name):
+    """Fetch one package with a new manager, as after a restart"""
+    manager = PackageManager(index_url=index.url, cache=cache)
+    try:
+        return manager._fetch_pypi_info(name)[0]
+    finally:
+        manager.shutdown()
+
+def test_fresh_entry_is_served_from_cache(index, tmp_path):
+    index.packages["numpy"] = ("Array computing", "2.0.0", '"v1"')
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+    assert fetch(index, cache, "numpy") == "Array computing"
+    assert fetch(index, cache, "NumPy") == "Array computing"
+    assert index.requests == [("numpy", None)]
+
+def test_stale_entry_is_revalidated_with_304(index, tmp_path):
+    index.packages["numpy"] = ("Array computing", "2.0.0", '"v1"')
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"), ttl=0)
+    fetch(index, cache, "numpy")
+    fetched_at = cache.get("numpy")["fetched_at"]
+    assert fetch(index, cache, "numpy") == "Array computing"
+    assert index.requests == [("numpy", None), ("numpy", '"v1"')]
+    assert cache.get("numpy")["fetched_at"] >= fetched_at
+
+def test_changed_entry_is_replaced_by_200(index, tmp_path):
+    index.packages["numpy"] = ("Array computing", "2.0.0", '"v1"')
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"), ttl=0)
+    fetch(index, cache, "numpy")
+    index.packages["numpy"] = ("Fundamental array computing", "2.1.0", '"v2"')
+    assert fetch(index, cache, "numpy") == "Fundamental array computing"
+    assert index.requests == [("numpy", None), ("numpy", '"v1"')]
+    assert cache.get("numpy")["etag"] == '"v2"'
+
+def test_missing_package_is_remembered(index, tmp_path):
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"))
+    assert fetch(index, cache, "conda-only") == ""
+    assert fetch(index, cache, "conda-only") == ""
+    assert index.requests == [("conda-only", None)]
+    entry = cache.get("conda-only")
+    assert (entry["summary"], entry["version"], entry["not_found"]) == ("", "", True)
+
+def test_details_after_fetch_count_as_info_lru_hits(index, tmp_path):
+    index.packages["numpy"] = ("Array computing", "2.0.0", '"v1"')
+    manager = PackageManager(index_url=index.url, cache=MetadataCache(str(tmp_path / "metadata.sqlite3")))
+    try:
+        manager._fetch_pypi_info("numpy")
+        cache_hits, lru_hits = tracer.counter("pypi.cache_hits"), tracer.counter("info_lru.hits")
+        delivered = []
+        manager.load_package_info_async("NumPy", lambda summary, description: delivered.append(summary))
+        assert delivered == ["Array computing"]
+        assert tracer.counter("info_lru.hits") == lru_hits + 1
+        assert tracer.counter("pypi.cache_hits") == cache_hits
+    finally:
+        manager.shutdown()
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr("src.utils.metadata_cache.time.time", lambda: next(clock))
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite3"), max_bytes=300)
+    for name in ("a", "b", "c"):
+        cache.put(name, "summary", "x" * 80)
+    cache.get("a")
+    cache.put("d", "summary", "x" * 80)
+    assert cache.get("b") is None
+    assert all(cache.get(name) is not None for name in ("a", "c", "d"))
+    assert cache.total_bytes() <= 300
+
+def test_info_lru_evicts_past_byte_budget():
+    lru = InfoLRU(max_bytes=100)
+    lru.put("a", ("s", "x" * 40, "1"))
+    lru.put("b", ("s", "x" * 40, "1"))
+    lru.get("a")
+    lru.put("c", ("s", "x" * 40, "1"))
+    assert lru.get("b") is None
+    assert lru.get("a") is not None and lru.get("c") is not None
+    lru.put("huge", ("s", "x" * 200, "1"))
+    assert lru.get("huge") is None
+
+def test_placeholder_entries_are_migrated(tmp_path):
+    path = str(tmp_path / "metadata.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (name TEXT PRIMARY KEY, summary TEXT NOT NULL, "
+                 "description TEXT NOT NULL, etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, "
+                 "accessed_at REAL NOT NULL, size INTEGER NOT NULL, version TEXT)")
+    conn.executemany("INSERT INTO entries VALUES (?, ?, ?, NULL, NULL, 0, 0, 0, ?)", [
+        ("conda-only", "No description available", "No description available", ""),
+        ("numpy", "Array computing", "About numpy", "2.0.0"),
+    ])
+    conn.commit()
+    conn.close()
+    cache = MetadataCache(path)
+    assert cache.get("conda-only")["summary"] == "" and cache.get("conda-only")["not_found"]
+    assert cache.get("numpy")["summary"] == "Array computing" and not cache.get("numpy")["not_found"]
@@ -0,0 +1,58 @@
+from src.utils.package_diff import diff_records, diff_snapshots
+from src.utils.package_store import PackageStore
+from src.utils.snapshots import Snapshot, SnapshotStore
+
+def info(version, source="conda", build="0"):
+    return {"version": version, "build": build, "channel": "conda-forge", "source": source}
+
+OLD = {"numpy": info("1.26.4"), "pandas": info("2.2.0"), "six": info("1.16.0"),
+       "attrs": info("23.1.0"), "local": info("0.1"), "requests": info("2.31.0", "pip")}
+NEW = {"numpy": info("2.0.0"), "pandas": info("2.1.0"), "six": info("1.16.0"),
+       "attrs": info("23.1.0", "pip"), "local": info("0.1.0"), "rich": info("13.7.0", "pip")}
+
+def test_snapshot_diff_classifies_changes():
+    diff = diff_snapshots(Snapshot.from_packages("/envs/a", OLD, 1.0), Snapshot.from_packages("/envs/a", NEW, 2.0))
+    assert diff.added == [("rich", "13.7.0", "pip")]
+    assert diff.removed == [("requests", "2.31.0", "pip")]
+    assert diff.upgraded == [("numpy", "1.26.4", "2.0.0")]
+    assert diff.downgraded == [("pandas", "2.2.0", "2.1.0")]
+    # A new source, or versions that compare equal but are spelled differently
+    assert diff.changed == [("attrs", "23.1.0", "23.1.0"), ("local", "0.1", "0.1.0")]
+    assert diff
+
+def test_equal_digests_short_circuit():
+    old = Snapshot.from_packages("/envs/a", OLD, 1.0)
+    new = Snapshot.from_packages("/envs/a", dict(OLD), 2.0)
+    assert old.digest == new.digest
+    assert not diff_snapshots(old, new)
+    # Rows are not compared at all once the digests match
+    tampered = Snapshot("/envs/a", 3.0, old.digest, ())
+    assert not diff_snapshots(old, tampered)
+
+def test_snapshot_store_records_only_changes(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    try:
+        first, changed = store.record("/envs/a", OLD, taken_at=1.0)
+        assert changed
+        again, changed = store.record("/envs/a", dict(OLD), taken_at=2.0)
+        assert not changed
+        assert (again.snapshot_id, again.taken_at) == (first.snapshot_id, 1.0)
+        second, changed = store.record("/envs/a", NEW, taken_at=3.0)
+        assert changed
+        assert [row[0] for row in store.history("/envs/a")] == [second.snapshot_id, first.snapshot_id]
+        assert store.latest("/envs/a", before=2.0).digest == first.digest
+
+        diff = diff_snapshots(store.load(first.snapshot_id), store.latest("/envs/a"))
+        assert [row[0] for row in diff.upgraded] == ["numpy"]
+    finally:
+        store.close()
+
+def test_record_diff_uses_shared_records():
+    store = PackageStore()
+    old = store.set_env("/envs/a", OLD)
+    new = store.set_env("/envs/a", NEW)
+    added, removed, changed = diff_records(old, new)
+    assert added == {"rich"}
+    assert removed == {"requests"}
+    assert changed == {"numpy", "pandas", "attrs", "local"}
+    assert diff_records(new, store.set_env("/envs/b", NEW)) == (set(), set(), set())
@@ -0,0 +1,61 @@
+import pytest
+from src.utils.package_index import PackageIndex
+
+@pytest.fixture
+def index():
+    index = PackageIndex()
+    index.update_env("/envs/ml", {
+        "numpy": {"version": "1.26.4", "source": "conda"},
+        "numpydoc": {"version": "1.7.0", "source": "pip"},
+        "numba": {"version": "0.59.1", "source": "conda"},
+        "scipy": {"version": "1.12.0", "source": "conda"},
+        "typing_extensions": {"version": "4.10.0", "source": "pip"},
+    })
+    index.update_env("/envs/web", {
+        "numpy": {"version": "2.0.0", "source": "pip"},
+        "requests": {"version": "2.31.0", "source": "pip"},
+    })
+    return index
+
+def found(results, min_score=0):
+    return [(result.name, result.env_path) for result in results if result.score >= min_score]
+
+def test_exact_then_prefix_then_substring(index):
+    results = index.search("numpy")
+    assert [result.score for result in results[:3]] == [3.0, 3.0, 2.0]
+    assert found(results) == [("numpy", "/envs/ml"), ("numpy", "/envs/web"), ("numpydoc", "/envs/ml"),
+                              ("numba", "/envs/ml")]
+    assert found(index.search("extens")) == [("typing_extensions", "/envs/ml")]
+    assert index.search("extens")[0].score == 1.0
+
+def test_names_are_normalized(index):
+    assert found(index.search("Typing-Extensions")) == [("typing_extensions", "/envs/ml")]
+
+def test_misspellings_match_by_trigrams(index):
+    results = index.search("reqeusts")
+    assert found(results)[0] == ("requests", "/envs/web")
+    assert 0 < results[0].score < 1
+    assert index.search("zzzzzz") == []
+
+def test_version_conditions(index):
+    assert found(index.search("numpy<2")) == [("numpy", "/envs/ml")]
+    assert found(index.search("numpy >= 2.0")) == [("numpy", "/envs/web")]
+    assert found(index.search("numpy==1.26.4")) == [("numpy", "/envs/ml")]
+    # Conditions only apply to exact names
+    assert index.search("num<2") == []
+
+def test_environments_are_replaced_and_removed(index):
+    index.update_env("/envs/web", {"flask": {"version": "3.0.0", "source": "pip"}})
+    assert found(index.search("numpy"), 1) == [("numpy", "/envs/ml"), ("numpydoc", "/envs/ml")]
+    index.remove_env("/envs/ml")
+    assert index.search("numpy") == []
+    assert index.environments() == ["/envs/web"]
+
+def test_saved_index_restores_missing_environments(index, tmp_path):
+    path = str(tmp_path / "package_index.json")
+    index.save(path)
+    restored = PackageIndex()
+    restored.update_env("/envs/web", {"flask": {"version": "3.0.0", "source": "pip"}})
+    restored.restore(path)
+    assert sorted(restored.environments()) == ["/envs/ml", "/envs/web"]
+    assert found(restored.search("numpy"), 1) == [("numpy", "/envs/ml"), ("numpydoc", "/envs/ml")]
@@ -0,0 +1,6 @@
+from src.utils.package_manager import PackageManager
+
+def test_latest_versions_after_shutdown_returns_unknown():
+    manager = PackageManager(cache=False, local_summaries=False)
+    manager.shutdown()
+    assert manager.latest_versions(["numpy", "Requests"]) == {"numpy": None, "Requests": None}
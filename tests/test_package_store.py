@@ -0,0 +1,65 @@
+import json
+import os
+from src.utils.package_diff import diff_records
+from src.utils.package_manager import PackageManager
+from src.utils.package_store import PackageStore
+
+def packages(version):
+    return {
+        "numpy": {"version": version, "build": "py312_0", "channel": "conda-forge", "source": "conda"},
+        "pip": {"version": "24.0", "build": "pyhd8ed1ab_0", "channel": "conda-forge", "source": "conda"},
+    }
+
+def write_record(env_path, name, version, build="0"):
+    meta_dir = os.path.join(env_path, "conda-meta")
+    os.makedirs(meta_dir, exist_ok=True)
+    for existing in os.listdir(meta_dir):
+        if existing.startswith(f"{name}-"):
+            os.remove(os.path.join(meta_dir, existing))
+    with open(os.path.join(meta_dir, f"{name}-{version}-{build}.json"), "w") as f:
+        json.dump({"name": name, "version": version, "build": build, "channel": "conda-forge"}, f)
+
+def test_store_size_is_stable_across_rescans(tmp_path):
+    env_path = str(tmp_path / "env")
+    write_record(env_path, "python", "3.12.0")
+    manager = PackageManager(cache=False, local_summaries=False)
+    try:
+        manager.load_env(env_path)
+        stats = manager.store.stats()
+        for i in range(50):
+            write_record(env_path, "numpy", f"1.{i}.0")
+            manager.load_env(env_path)
+        manager.load_env(env_path)
+        assert manager.store.stats()["records"] == stats["records"] + 1
+        assert manager.store.stats()["strings"] == stats["strings"] + 2
+        assert len(manager.store._records) <= stats["records"] + 2
+    finally:
+        manager.shutdown()
+
+def test_replaced_view_stays_readable_while_referenced():
+    store = PackageStore()
+    old = store.set_env("/envs/a", packages("1.0"))
+    new = store.set_env("/envs/a", packages("2.0"))
+    assert diff_records(old, new) == (set(), set(), {"numpy"})
+    assert old.find("numpy").version == "1.0"
+    assert store.stats()["records"] == 3
+
+    del old
+    assert store.stats()["records"] == 2
+    newer = store.set_env("/envs/a", packages("3.0"))
+    # The slot of the dropped record is reused
+    assert len(store._records) == 3
+    assert newer.find("numpy").version == "3.0"
+    assert new.find("numpy").version == "2.0"
+
+def test_records_shared_between_environments_survive_removal():
+    store = PackageStore()
+    store.set_env("/envs/a", packages("1.0"))
+    b = store.set_env("/envs/b", packages("1.0"))
+    store.remove_env("/envs/a")
+    assert store.stats()["records"] == 2
+    assert [record.name for record in b] == ["numpy", "pip"]
+
+    del b
+    store.remove_env("/envs/b")
+    assert store.stats() == {"environments": 0, "rows": 0, "records": 0, "strings": 0, "summaries": 0}
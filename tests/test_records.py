@@ -0,0 +1,27 @@
+import io
+import json
+from src.utils.outdated import OUTDATED_FIELDS, OutdatedPackage, report_outdated
+from src.utils.records import RecordWriter
+
+REPORT = [
+    OutdatedPackage("/envs/a", "numpy", "1.26.4", "2.0.0", "conda"),
+    OutdatedPackage("/envs/gone", "rich", "13.0.0", "13.7.0", "pip"),
+]
+
+def test_outdated_report_as_csv():
+    stream = io.StringIO()
+    count = report_outdated(REPORT, {"/envs/a": "a"}, RecordWriter(stream, "csv", ("env",) + OUTDATED_FIELDS))
+    assert count == 2
+    assert stream.getvalue().splitlines() == [
+        "env,env_path,name,version,latest,source",
+        "a,/envs/a,numpy,1.26.4,2.0.0,conda",
+        "/envs/gone,/envs/gone,rich,13.0.0,13.7.0,pip",
+    ]
+
+def test_outdated_report_as_ndjson():
+    stream = io.StringIO()
+    report_outdated(REPORT[:1], {"/envs/a": "a"}, RecordWriter(stream, "ndjson", ("env",) + OUTDATED_FIELDS))
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {"env": "a", "env_path": "/envs/a", "name": "numpy", "version": "1.26.4", "latest": "2.0.0",
+         "source": "conda"},
+    ]
@@ -0,0 +1,52 @@
+import json
+import zlib
+import pytest
+from src.utils.package_store import PackageStore
+from src.utils.session_state import STATE_VERSION, load_session, save_session
+
+def write_state(path, data):
+    path.write_bytes(zlib.compress(json.dumps(data).encode("utf-8")))
+
+def test_session_round_trip(tmp_path):
+    store = PackageStore()
+    store.set_env("/envs/a", {"numpy": {"version": "2.0", "build": "0", "channel": "conda-forge",
+                                        "source": "conda"}}, (123, None))
+    store.set_summary("numpy", "Array computing")
+    path = str(tmp_path / "state.json.z")
+    save_session([("/envs/a", "a"), ("/envs/b", "b")], store, path)
+    session = load_session(path)
+    assert session["environments"] == [("/envs/a", "a"), ("/envs/b", "b")]
+    assert session["packages"] == {"/envs/a": {"numpy": {"version": "2.0", "build": "0",
+                                                         "channel": "conda-forge", "source": "conda"}}}
+    assert session["summaries"] == {"numpy": "Array computing"}
+    assert session["signatures"] == {"/envs/a": (123, None)}
+
+def valid_state():
+    return {"version": STATE_VERSION, "environments": [["/envs/a", "a"]],
+            "records": [["numpy", "2.0", "0", "conda-forge", "conda"]],
+            "tables": {"/envs/a": [0]}, "summaries": {}}
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: [data],
+    lambda data: data.pop("tables"),
+    lambda data: data.update(records=[["numpy", "2.0"]]),
+    lambda data: data.update(records=None),
+    lambda data: data.update(tables={"/envs/a": [3]}),
+    lambda data: data.update(tables=[]),
+    lambda data: data.update(environments=[["/envs/a"]]),
+    lambda data: data.update(summaries=7),
+])
+def test_malformed_state_falls_back_to_no_session(tmp_path, corrupt):
+    data = valid_state()
+    data = corrupt(data) or data
+    path = tmp_path / "state.json.z"
+    write_state(path, data)
+    assert load_session(str(path)) is None
+
+def test_unreadable_state_falls_back_to_no_session(tmp_path):
+    path = tmp_path / "state.json.z"
+    assert load_session(str(path)) is None
+    path.write_bytes(b"not zlib")
+    assert load_session(str(path)) is None
+    write_state(path, dict(valid_state(), version=1))
+    assert load_session(str(path)) is None
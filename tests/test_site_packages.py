@@ -0,0 +1,25 @@
+import os
+import pytest
+from src.utils.site_packages import env_signature, find_site_packages
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows environments have a single Lib/site-packages")
+def test_newest_python_comes_first(tmp_path):
+    for version in ("python3.9", "python3.12", "python3.10"):
+        os.makedirs(tmp_path / "lib" / version / "site-packages")
+    (tmp_path / "lib" / "python3.11").mkdir()  # no site-packages
+    found = [os.path.basename(os.path.dirname(path)) for path in find_site_packages(str(tmp_path))]
+    assert found == ["python3.12", "python3.10", "python3.9"]
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows environments have a single Lib/site-packages")
+def test_signature_changes_when_packages_are_installed(tmp_path):
+    assert env_signature(str(tmp_path)) == (None,)
+    site_dir = tmp_path / "lib" / "python3.12" / "site-packages"
+    os.makedirs(site_dir)
+    (tmp_path / "conda-meta").mkdir()
+    signature = env_signature(str(tmp_path))
+    assert len(signature) == 2 and None not in signature
+    assert env_signature(str(tmp_path)) == signature
+
+    (site_dir / "rich-13.7.0.dist-info").mkdir()
+    os.utime(site_dir, ns=(0, signature[1] + 1))
+    assert env_signature(str(tmp_path)) != signature
@@ -0,0 +1,72 @@
+import os
+import time
+import pytest
+from src.utils.package_manager import PackageManager
+from src.utils.package_store import PackageStore
+from src.utils.session_state import save_session
+from src.utils.site_packages import env_signature
+
+tk = pytest.importorskip("tkinter")
+
+# Startup budgets in seconds; benchmarks/bench_startup.py measures the
+# same path in fresh interpreters for profiling
+PACKAGE_MANAGER_BUDGET = 0.1
+WINDOW_BUDGET = 1.0
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setenv("CONDA_ENV_DETECTOR_CACHE_DIR", str(path))
+    return path
+
+@pytest.fixture
+def display():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    root.destroy()
+
+def write_session(env_paths, package_count):
+    """Save a session whose environments all match their current signatures"""
+    store = PackageStore()
+    for env_path in env_paths:
+        packages = {f"package-{i}": {"version": f"1.{i}", "source": "conda"} for i in range(package_count)}
+        store.set_env(env_path, packages, env_signature(env_path))
+    save_session([(env_path, os.path.basename(env_path)) for env_path in env_paths], store)
+
+def test_package_manager_construction_is_cheap(cache_dir):
+    start = time.perf_counter()
+    manager = PackageManager()
+    elapsed = time.perf_counter() - start
+    manager.shutdown()
+    assert elapsed < PACKAGE_MANAGER_BUDGET
+
+def test_window_starts_from_saved_session(tmp_path, cache_dir, display, monkeypatch):
+    from src.gui import main_window
+
+    env_paths = [str(tmp_path / "envs" / f"env{i}") for i in range(50)]
+    write_session(env_paths, 200)
+    scanned = []
+    monkeypatch.setattr(main_window.CondaManager, "get_environments",
+                        lambda self: {"envs": env_paths, "base_prefix": None})
+    monkeypatch.setattr(main_window.PackageManager, "get_all_packages",
+                        lambda self, env_path: scanned.append(env_path) or {})
+
+    start = time.perf_counter()
+    app = main_window.CondaEnvViewer(fast_start=True)
+    try:
+        app.update()
+        elapsed = time.perf_counter() - start
+        assert elapsed < WINDOW_BUDGET
+        assert list(app.tree.get_children()) == env_paths
+
+        # Unchanged environments are indexed from the session, not rescanned
+        deadline = time.monotonic() + 10
+        while len(app.package_index.environments()) < len(env_paths) and time.monotonic() < deadline:
+            app.update()
+            time.sleep(0.02)
+        assert sorted(app.package_index.environments()) == sorted(env_paths)
+        assert scanned == []
+    finally:
+        app.on_close()
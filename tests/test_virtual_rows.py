@@ -0,0 +1,97 @@
+from src.gui.virtual_rows import VirtualRows
+from src.utils.package_store import PackageStore
+
+COLUMNS = ("Version", "Latest", "Size", "Unique", "Summary")
+
+class FakeTree:
+    """The part of ttk.Treeview used by VirtualRows, without a display"""
+
+    def __init__(self):
+        self.children = {"": []}
+        self.items = {}
+
+    def insert(self, parent, index, iid, text, values, tags=()):
+        siblings = self.children.setdefault(parent, [])
+        siblings.insert(len(siblings) if index == "end" else index, iid)
+        self.items[iid] = {"parent": parent, "text": text, "values": dict(zip(COLUMNS, values)), "tags": tags}
+
+    def exists(self, item):
+        return item in self.items
+
+    def delete(self, *items):
+        for item in items:
+            self.children[self.items.pop(item)["parent"]].remove(item)
+
+    def get_children(self, item):
+        return tuple(self.children.get(item, ()))
+
+    def set(self, item, column, value=None):
+        if value is None:
+            return self.items[item]["values"][column]
+        self.items[item]["values"][column] = value
+
+    def item(self, item, tags=None):
+        self.items[item]["tags"] = tags
+
+    def texts(self, parent):
+        return [self.items[item]["text"] for item in self.children[parent]]
+
+def make_rows(names, window_size=4):
+    store = PackageStore()
+    packages = store.set_env("/env", {name: {"version": "1.0"} for name in names})
+    tree = FakeTree()
+    tree.children["/env"] = []
+    added, removed = [], []
+    rows = VirtualRows(tree, "/env", packages, window_size=window_size,
+                       on_rows_added=added.extend, on_rows_removed=removed.extend)
+    return store, tree, rows, added, removed
+
+NAMES = [f"pkg{i:02}" for i in range(10)]
+
+def test_window_slides_by_half_its_size():
+    _, tree, rows, added, removed = make_rows(NAMES)
+    rows.show(0)
+    assert tree.texts("/env") == NAMES[:4] + ["▼ 6 more packages"]
+    assert [name for _, name in added] == NAMES[:4]
+
+    added.clear()
+    rows.page_forward()
+    assert tree.texts("/env") == ["▲ 2 earlier packages"] + NAMES[2:6] + ["▼ 4 more packages"]
+    assert [name for _, name in added] == NAMES[4:6]
+    assert removed == [rows.row_id(name) for name in NAMES[:2]]
+
+    rows.show(100)
+    assert (rows.start, rows.end) == (6, 10)
+    assert tree.texts("/env") == ["▲ 6 earlier packages"] + NAMES[6:]
+
+    rows.page_backward()
+    assert (rows.start, rows.end) == (4, 8)
+    assert tree.texts("/env") == ["▲ 4 earlier packages"] + NAMES[4:8] + ["▼ 2 more packages"]
+
+def test_short_lists_have_no_markers():
+    _, tree, rows, _, _ = make_rows(NAMES[:3])
+    rows.show(5)
+    assert (rows.start, rows.end) == (0, 3)
+    assert tree.texts("/env") == NAMES[:3]
+
+def test_rows_with_known_summaries_are_not_fetched():
+    store, tree, rows, added, _ = make_rows(NAMES)
+    store.set_summary("pkg01", "Known")
+    store.set_summary("pkg02", "")
+    rows.show(0)
+    assert [name for _, name in added] == ["pkg00", "pkg03"]
+    assert tree.set(rows.row_id("pkg01"), "Summary") == "Known"
+    assert tree.set(rows.row_id("pkg02"), "Summary") == "No description available"
+    assert tree.set(rows.row_id("pkg00"), "Summary") == "Loading..."
+
+def test_refresh_keeps_the_window_position():
+    store, tree, rows, added, removed = make_rows(NAMES)
+    rows.show(4)
+    added.clear()
+    names = [name for name in NAMES if name != "pkg05"] + ["pkg05a"]
+    rows.refresh(store.set_env("/env", {name: {"version": "2.0" if name == "pkg06" else "1.0"}
+                                        for name in names}), changed={"pkg06"})
+    assert tree.texts("/env") == ["▲ 4 earlier packages", "pkg04", "pkg05a", "pkg06", "pkg07",
+                                  "▼ 2 more packages"]
+    assert [name for _, name in added] == ["pkg05a"]
+    assert tree.set(rows.row_id("pkg06"), "Version") == "2.0"